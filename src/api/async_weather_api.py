@@ -0,0 +1,187 @@
+"""
+Asynchronous weather API module for running many fetches on one event loop.
+"""
+
+import asyncio
+from urllib.parse import urlsplit
+
+from api.location_cache import get_network_fingerprint
+from api.upstream_guard import is_healthy_status
+from api.weather_api import (
+    FORECAST_URL,
+    GEOCODE_URL,
+    IP_LOCATION_URL,
+    USER_AGENT,
+    WeatherAPI,
+)
+
+# aiohttp is optional; without it requests run on the pooled sync sessions
+# in the default executor
+try:
+    import aiohttp
+
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+
+class AsyncWeatherAPI:
+    """Async counterpart of WeatherAPI sharing one connection pool"""
+
+    def __init__(self, weather_api=None, limit=20, limit_per_host=4, timeout=10):
+        # The sync client provides caches, response parsing and the fallback transport
+        self.weather_api = weather_api or WeatherAPI()
+        self.timeout = timeout
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _get_session(self):
+        """Return the shared aiohttp session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=30,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector, headers={"User-Agent": USER_AGENT}
+            )
+        return self._session
+
+    async def _get_json(self, url, params=None, timeout=None):
+        """
+        GET url and return (status_code, json_body).
+        Raises asyncio.TimeoutError when the deadline passes; cancelling the
+        calling task abandons the request.
+        """
+        deadline = self.timeout if timeout is None else timeout
+
+        if AIOHTTP_AVAILABLE:
+            session = await self._get_session()
+            # Same per-host rate limits and circuit breakers as the sync transport
+            guard = self.weather_api.upstream_guard
+            host = urlsplit(url).netloc
+            wait = guard.admit(host)
+
+            async def fetch():
+                async with session.get(url, params=params) as response:
+                    return response.status, await response.json(content_type=None)
+
+            try:
+                await asyncio.sleep(wait)
+                status, data = await asyncio.wait_for(fetch(), deadline)
+            except Exception:
+                guard.record_result(host, False)
+                raise
+            except BaseException:
+                # Cancelled (CancelledError is not an Exception): no verdict on
+                # the host, but a half-open trial must not stay taken
+                guard.release(host)
+                raise
+            guard.record_result(host, is_healthy_status(status))
+            return status, data
+
+        def fetch_blocking():
+            response = self.weather_api._get(url, params=params, timeout=deadline)
+            return response.status_code, response.json()
+
+        loop = asyncio.get_running_loop()
+        return await asyncio.wait_for(
+            loop.run_in_executor(None, fetch_blocking), deadline
+        )
+
+    async def get_location_from_ip(self, use_cache=True, timeout=None):
+        """Get user's location based on IP address"""
+        api = self.weather_api
+        try:
+            fingerprint = get_network_fingerprint()
+            if use_cache:
+                cached = api.location_cache.get(fingerprint)
+                if cached is not None:
+                    return cached
+
+            _, data = await self._get_json(IP_LOCATION_URL, timeout=timeout)
+            location = api.parse_ip_location(data)
+
+            if location is not None:
+                api.location_cache.put(fingerprint, location)
+                return location
+            return {"success": False, "error": "Location detection failed"}
+        except asyncio.TimeoutError:
+            return {"success": False, "error": "Request timed out"}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    async def geocode_location(self, location_query, use_cache=True, timeout=None):
+        """Geocode a location string to coordinates"""
+        api = self.weather_api
+        try:
+            if use_cache:
+                result = api.lookup_cached_location(location_query)
+                if result is not None:
+                    return result
+
+            status, data = await self._get_json(
+                GEOCODE_URL, params=api.geocode_params(location_query), timeout=timeout
+            )
+
+            if status == 200:
+                result = api.parse_geocode_results(data)
+                if result is not None:
+                    api.geocode_cache.put(location_query, result)
+                    return result
+            return {"success": False, "error": "Location not found"}
+        except asyncio.TimeoutError:
+            return {"success": False, "error": "Request timed out"}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    async def get_weather_data(self, lat, lon, use_cache=True, timeout=None):
+        """Fetch weather data from Open-Meteo API"""
+        api = self.weather_api
+        try:
+            cache_key = api.weather_cache_key(lat, lon)
+
+            if use_cache:
+                api_data = api.forecast_cache.get(cache_key)
+                if api_data is not None:
+                    return api.parse_weather_data(api_data)
+
+            status, api_data = await self._get_json(
+                FORECAST_URL, params=api.weather_params(lat, lon), timeout=timeout
+            )
+
+            if status == 200:
+                api.forecast_cache.put(cache_key, api_data)
+                return api.parse_weather_data(api_data)
+
+            return {"success": False, "error": f"API error: {status}"}
+        except asyncio.TimeoutError:
+            return {"success": False, "error": "Request timed out"}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    async def get_weather_for_locations(self, locations, timeout=None):
+        """
+        Fetch weather for many (lat, lon) pairs concurrently.
+        Returns results in the same order as locations.
+        """
+        return await asyncio.gather(
+            *(
+                self.get_weather_data(lat, lon, timeout=timeout)
+                for lat, lon in locations
+            )
+        )
+
+    async def close(self):
+        """Close the shared connection pool"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
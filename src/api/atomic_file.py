@@ -0,0 +1,87 @@
+"""
+Atomic file module: replace JSON cache files without exposing partial writes.
+"""
+
+import json
+import os
+import tempfile
+import threading
+
+
+def write_json_atomic(path, data, fsync=False, **json_kwargs):
+    """
+    Write data as JSON to a uniquely named temp file next to path, then rename
+    it over path. Concurrent writers (threads or processes) never share a temp
+    file, so readers see either the old or the new content.
+    With fsync the data and the rename are flushed to disk as well, so a crash
+    or power loss leaves either the old or the new file, never a truncated one.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, **json_kwargs)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+    if fsync:
+        _fsync_directory(directory)
+
+
+def _fsync_directory(directory):
+    """Persist a rename in directory (not supported on Windows)"""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    except OSError:
+        pass
+
+
+class JsonCacheFile:
+    """A JSON cache file that is read leniently and written atomically"""
+
+    def __init__(self, path, label, **json_kwargs):
+        self.path = path
+        self.label = label  # Used in error messages, e.g. "forecast cache"
+        self.json_kwargs = json_kwargs
+        # Serialized so an older snapshot never lands after a newer one
+        self._save_lock = threading.Lock()
+
+    def load(self, expected_type=dict):
+        """Return the stored value, or None if missing, unreadable or the wrong type"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return data if isinstance(data, expected_type) else None
+
+    def save(self, take_snapshot):
+        """
+        Write take_snapshot() to disk. The snapshot is taken under the save
+        lock, so concurrent saves land in the order their data was captured.
+        Returns False (after printing why) if the write failed.
+        """
+        with self._save_lock:
+            data = take_snapshot()
+            try:
+                write_json_atomic(self.path, data, **self.json_kwargs)
+                return True
+            except OSError as e:
+                print(f"Error saving {self.label}: {e}")
+                return False
@@ -0,0 +1,114 @@
+"""
+Forecast cache module for keeping Open-Meteo responses between refreshes.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from api.atomic_file import JsonCacheFile
+
+# Open-Meteo recomputes "current" conditions every 15 minutes
+MODEL_UPDATE_INTERVAL = 900
+
+
+class ForecastCache:
+    """LRU cache of raw forecast responses with TTL and optional JSON persistence"""
+
+    def __init__(
+        self,
+        cache_file=None,
+        max_entries=32,
+        update_interval=MODEL_UPDATE_INTERVAL,
+        precision=2,
+    ):
+        self.cache_file = cache_file
+        self.max_entries = max_entries
+        self.update_interval = update_interval
+        self.precision = precision  # 2 decimals is roughly 1 km
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._file = JsonCacheFile(cache_file, "forecast cache")
+        self.hits = 0
+        self.misses = 0
+
+        if self.cache_file:
+            self.load()
+
+    def make_key(self, lat, lon, variables=""):
+        """Build a cache key from rounded coordinates and requested variables"""
+        return f"{lat:.{self.precision}f},{lon:.{self.precision}f}|{variables}"
+
+    def expiry_for(self, fetched_at):
+        """Entries expire at the next model update boundary after fetching"""
+        return (int(fetched_at // self.update_interval) + 1) * self.update_interval
+
+    def get(self, key, now=None):
+        """Return cached data for key, or None if missing or expired"""
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry["expires_at"] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry["data"]
+
+    def put(self, key, data, now=None):
+        """Store data under key, evicting the least recently used entries"""
+        self.put_many([(key, data)], now)
+
+    def put_many(self, items, now=None):
+        """Store several (key, data) pairs with a single write to disk"""
+        now = time.time() if now is None else now
+        with self._lock:
+            for key, data in items:
+                self._entries[key] = {
+                    "fetched_at": now,
+                    "expires_at": self.expiry_for(now),
+                    "data": data,
+                }
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        if self.cache_file:
+            self.save()
+
+    def clear(self):
+        """Drop all cached entries"""
+        with self._lock:
+            self._entries.clear()
+        if self.cache_file:
+            self.save()
+
+    def load(self):
+        """Load unexpired entries from the cache file"""
+        stored = self._file.load()
+        if stored is None:
+            return
+
+        now = time.time()
+        with self._lock:
+            for key, entry in stored.items():
+                if isinstance(entry, dict) and entry.get("expires_at", 0) > now:
+                    self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def save(self):
+        """Write the cache to disk (entries are kept in LRU order)"""
+        self._file.save(self._snapshot)
+
+    def _snapshot(self):
+        with self._lock:
+            return dict(self._entries)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
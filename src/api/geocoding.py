@@ -0,0 +1,199 @@
+"""
+Geocoding helpers: query normalization, a persistent result cache and an
+offline gazetteer of common cities.
+"""
+
+import csv
+import os
+import re
+import threading
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+
+from api.atomic_file import JsonCacheFile
+
+DEFAULT_GAZETTEER_FILE = os.path.join(os.path.dirname(__file__), "data", "cities.csv")
+
+# Common ways people write country names that differ from the CSV columns
+COUNTRY_ALIASES = {
+    "GB": ("uk", "united kingdom", "great britain", "britain"),
+    "US": ("usa", "us", "united states", "united states of america", "america"),
+    "AE": ("uae",),
+    "KR": ("korea",),
+    "CZ": ("czech republic",),
+    "NL": ("holland",),
+}
+
+
+def normalize_query(query):
+    """
+    Normalize a location query so equivalent spellings share one key.
+    "  São Paulo ,Brazil " -> "sao paulo, brazil"
+    """
+    text = unicodedata.normalize("NFKD", query or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = text.casefold()
+    text = re.sub(r"[^\w,]+", " ", text)
+
+    parts = [" ".join(part.split()) for part in text.split(",")]
+    return ", ".join(part for part in parts if part)
+
+
+class GeocodeCache:
+    """LRU memo of successful geocoding results keyed by normalized query"""
+
+    def __init__(self, cache_file=None, max_entries=256):
+        self.cache_file = cache_file
+        self.max_entries = max_entries
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._file = JsonCacheFile(cache_file, "geocode cache", ensure_ascii=False)
+
+        if self.cache_file:
+            self.load()
+
+    def get(self, query):
+        """Return a copy of the cached result for query, or None"""
+        key = normalize_query(query)
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                return None
+            self._entries.move_to_end(key)
+            return dict(result)
+
+    def put(self, query, result):
+        """Remember a successful geocoding result"""
+        key = normalize_query(query)
+        if not key:
+            return
+
+        with self._lock:
+            self._entries[key] = dict(result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        if self.cache_file:
+            self.save()
+
+    def load(self):
+        """Load cached results from the cache file"""
+        stored = self._file.load()
+        if stored is None:
+            return
+
+        with self._lock:
+            self._entries.update(stored)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def save(self):
+        """Write cached results to disk"""
+        self._file.save(self._snapshot)
+
+    def _snapshot(self):
+        with self._lock:
+            return dict(self._entries)
+
+
+class Gazetteer:
+    """
+    Offline city index loaded from a CSV file.
+    Normalized lookup keys ("london", "london, uk", "portland, oregon") are kept
+    in one sorted list so exact and prefix lookups are binary searches.
+    """
+
+    def __init__(self, csv_file=DEFAULT_GAZETTEER_FILE):
+        self.csv_file = csv_file
+
+        # Sorted lookup keys and the row each key resolves to
+        self._keys = []
+        self._key_rows = array("i")
+
+        # Row columns
+        self._display_names = []
+        self._lats = array("d")
+        self._lons = array("d")
+
+        self._load()
+
+    def _load(self):
+        """Read the CSV and build the sorted key index"""
+        best = {}  # key -> (population, row); the largest city wins a shared name
+
+        with open(self.csv_file, "r", encoding="utf-8", newline="") as f:
+            for record in csv.DictReader(f):
+                row = len(self._display_names)
+                name = record["name"]
+                region = record["region"]
+                country = record["country"]
+                code = record["country_code"]
+                population = int(record.get("population") or 0)
+
+                display_parts = [name]
+                if region and region != name:
+                    display_parts.append(region)
+                if country and country != name:
+                    display_parts.append(country)
+
+                self._display_names.append(", ".join(display_parts))
+                self._lats.append(float(record["lat"]))
+                self._lons.append(float(record["lon"]))
+
+                qualifiers = {region, country, code}
+                qualifiers.update(COUNTRY_ALIASES.get(code, ()))
+                keys = {normalize_query(name)}
+                keys.update(
+                    normalize_query(f"{name}, {qualifier}")
+                    for qualifier in qualifiers
+                    if qualifier
+                )
+
+                for key in keys:
+                    if key not in best or population > best[key][0]:
+                        best[key] = (population, row)
+
+        for key in sorted(best):
+            self._keys.append(key)
+            self._key_rows.append(best[key][1])
+
+    def _result(self, row):
+        return {
+            "lat": self._lats[row],
+            "lon": self._lons[row],
+            "display_name": self._display_names[row],
+            "success": True,
+        }
+
+    def lookup(self, query):
+        """Resolve a query to a geocoding result, or None when not indexed"""
+        key = normalize_query(query)
+        index = bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            return self._result(self._key_rows[index])
+        return None
+
+    def complete(self, prefix, limit=5):
+        """Return up to limit distinct results whose key starts with prefix"""
+        key = normalize_query(prefix)
+        results = []
+        seen_rows = set()
+
+        index = bisect_left(self._keys, key)
+        while index < len(self._keys) and self._keys[index].startswith(key):
+            row = self._key_rows[index]
+            if row not in seen_rows:
+                seen_rows.add(row)
+                results.append(self._result(row))
+                if len(results) >= limit:
+                    break
+            index += 1
+
+        return results
+
+    def __len__(self):
+        return len(self._display_names)
@@ -0,0 +1,64 @@
+"""
+Hourly forecast module: a compact, array-backed copy of Open-Meteo hourly data.
+"""
+
+from array import array
+
+# Column name (as returned by Open-Meteo) -> array typecode
+HOURLY_COLUMNS = {
+    "time": "q",  # Unix timestamps
+    "temperature_2m": "d",  # °C
+    "relative_humidity_2m": "d",  # %
+    "precipitation": "d",  # mm over the preceding hour
+    "weather_code": "h",  # WMO code
+    "wind_speed_10m": "d",  # km/h
+}
+
+
+class HourlyForecast:
+    """
+    Hourly forecast columns stored as typed arrays (one per variable).
+    Columns keep Open-Meteo's names and units and can be read like a dict:
+    hourly["temperature_2m"][i].
+    """
+
+    __slots__ = ("_columns",)
+
+    def __init__(self, columns):
+        self._columns = columns
+
+    @classmethod
+    def from_open_meteo(cls, hourly):
+        """Build from the "hourly" block of an Open-Meteo response"""
+        columns = {}
+        for name, typecode in HOURLY_COLUMNS.items():
+            missing = 0 if typecode in "qh" else float("nan")
+            values = hourly.get(name) or []
+            columns[name] = array(
+                typecode, (missing if value is None else value for value in values)
+            )
+        return cls(columns)
+
+    def __getitem__(self, name):
+        return self._columns[name]
+
+    def __contains__(self, name):
+        return name in self._columns
+
+    def get(self, name, default=None):
+        return self._columns.get(name, default)
+
+    def __len__(self):
+        return len(self._columns["time"])
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __eq__(self, other):
+        if not isinstance(other, HourlyForecast):
+            return NotImplemented
+        return self._columns == other._columns
+
+    def as_dict(self):
+        """Plain lists per column, in the Open-Meteo layout (e.g. for JSON)"""
+        return {name: list(values) for name, values in self._columns.items()}
@@ -0,0 +1,49 @@
+"""
+Last-known weather module for showing the previous snapshot at startup.
+"""
+
+import json
+
+from api.atomic_file import write_json_atomic
+from api.hourly_forecast import HourlyForecast
+from core.weather_snapshot import WeatherSnapshot
+
+
+def snapshot_to_json(snapshot):
+    """Convert a WeatherSnapshot into a JSON-serializable dict"""
+    record = {name: getattr(snapshot, name) for name in WeatherSnapshot.__slots__}
+    if snapshot.hourly is not None:
+        record["hourly"] = snapshot.hourly.as_dict()
+    return record
+
+
+def snapshot_from_json(record):
+    """Rebuild a WeatherSnapshot from snapshot_to_json output"""
+    record = dict(record)
+    if record.get("hourly"):
+        record["hourly"] = HourlyForecast.from_open_meteo(record["hourly"])
+    return WeatherSnapshot(**record)
+
+
+class LastKnownWeather:
+    """Persist the most recent real weather snapshot as JSON"""
+
+    def __init__(self, cache_file):
+        self.cache_file = cache_file
+
+    def save(self, snapshot):
+        """Store the snapshot, replacing the previous one"""
+        try:
+            write_json_atomic(self.cache_file, snapshot_to_json(snapshot))
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Error saving last-known weather: {e}")
+
+    def load(self):
+        """Return the stored snapshot, or None if there is none (or it is unreadable)"""
+        try:
+            with open(self.cache_file, "r") as f:
+                return snapshot_from_json(json.load(f))
+        except (OSError, TypeError, ValueError) as e:
+            if not isinstance(e, FileNotFoundError):
+                print(f"Error loading last-known weather: {e}")
+            return None
@@ -0,0 +1,188 @@
+"""
+Location cache module for remembering the IP-detected location per network.
+"""
+
+import hashlib
+import os
+import socket
+import struct
+import subprocess
+import sys
+import threading
+import time
+
+from api.atomic_file import JsonCacheFile
+
+# IP-based location rarely changes while the machine stays on one network
+LOCATION_TTL = 24 * 60 * 60
+
+# Without a gateway the fingerprint is only the NAT-local address, which many
+# networks share (192.168.1.x), so such entries are trusted for much less time
+IP_ONLY_PREFIX = "ip-"
+IP_ONLY_TTL = 30 * 60
+
+ROUTE_PROBE_ADDRESS = "192.0.2.1"  # TEST-NET-1, never routed anywhere
+
+
+def get_local_ip():
+    """
+    Return the local address used for outbound traffic, or None.
+    Connecting a UDP socket only selects a route; no packet is sent.
+    """
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.connect((ROUTE_PROBE_ADDRESS, 80))
+            return sock.getsockname()[0]
+    except OSError:
+        return None
+
+
+def get_default_gateway():
+    """Return the default gateway address, or None if it cannot be determined"""
+    if sys.platform.startswith("linux"):
+        return _get_linux_gateway()
+    if sys.platform == "win32":
+        return _get_windows_gateway()
+    if sys.platform == "darwin":
+        return _get_macos_gateway()
+    return None
+
+
+def _get_linux_gateway():
+    try:
+        with open("/proc/net/route", "r") as f:
+            next(f)  # Skip header
+            for line in f:
+                fields = line.split()
+                if len(fields) > 2 and fields[1] == "00000000":
+                    gateway = bytes.fromhex(fields[2])[::-1]
+                    return socket.inet_ntoa(gateway)
+    except (OSError, ValueError, StopIteration):
+        pass
+    return None
+
+
+def _get_windows_gateway():
+    """Next hop of the best route to the probe address (GetBestRoute, no subprocess)"""
+    try:
+        import ctypes
+
+        # MIB_IPFORWARDROW: 14 DWORDs, the next hop is the fourth
+        row = (ctypes.c_uint32 * 14)()
+        destination = struct.unpack("<I", socket.inet_aton(ROUTE_PROBE_ADDRESS))[0]
+        if ctypes.windll.iphlpapi.GetBestRoute(destination, 0, ctypes.byref(row)):
+            return None
+        next_hop = socket.inet_ntoa(struct.pack("<I", row[3]))
+        return None if next_hop == "0.0.0.0" else next_hop
+    except Exception:
+        return None
+
+
+def _get_macos_gateway():
+    try:
+        output = subprocess.run(
+            ["route", "-n", "get", "default"],
+            capture_output=True,
+            text=True,
+            timeout=2,
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return parse_route_get_gateway(output)
+
+
+def parse_route_get_gateway(output):
+    """Gateway address from `route -n get default` output, or None"""
+    for line in output.splitlines():
+        key, _, value = line.strip().partition(":")
+        if key == "gateway" and value.strip():
+            return value.strip()
+    return None
+
+
+def get_network_fingerprint():
+    """
+    Return a short hash identifying the current network, or None if unknown.
+    Built from the outbound local address and default gateway (local lookups;
+    macOS runs `route`). Fingerprints without a gateway start with
+    IP_ONLY_PREFIX and are cached for IP_ONLY_TTL only.
+    """
+    local_ip = get_local_ip()
+    gateway = get_default_gateway()
+    if local_ip is None and gateway is None:
+        return None
+
+    identity = f"{local_ip}|{gateway}"
+    digest = hashlib.sha1(identity.encode("utf-8")).hexdigest()[:16]
+    return digest if gateway is not None else IP_ONLY_PREFIX + digest
+
+
+class LocationCache:
+    """Remember the detected location until the network changes or TTL expires"""
+
+    def __init__(self, cache_file=None, ttl=LOCATION_TTL, ip_only_ttl=IP_ONLY_TTL):
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self.ip_only_ttl = ip_only_ttl  # For fingerprints without a gateway
+
+        self._entry = None
+        self._lock = threading.Lock()
+        self._file = JsonCacheFile(cache_file, "location cache", ensure_ascii=False)
+
+        if self.cache_file:
+            self.load()
+
+    def get(self, fingerprint, now=None):
+        """Return the cached location for this network fingerprint, or None"""
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entry
+            if entry is None:
+                return None
+            if entry["fingerprint"] != fingerprint:
+                return None
+            ttl = self.ttl
+            if fingerprint and fingerprint.startswith(IP_ONLY_PREFIX):
+                ttl = min(ttl, self.ip_only_ttl)
+            if now - entry["fetched_at"] >= ttl:
+                return None
+            return dict(entry["location"])
+
+    def put(self, fingerprint, location, now=None):
+        """Store the location detected on the given network"""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._entry = {
+                "fingerprint": fingerprint,
+                "fetched_at": now,
+                "location": dict(location),
+            }
+
+        if self.cache_file:
+            self.save()
+
+    def clear(self):
+        """Forget the cached location"""
+        with self._lock:
+            self._entry = None
+        if self.cache_file and os.path.exists(self.cache_file):
+            try:
+                os.remove(self.cache_file)
+            except OSError:
+                pass
+
+    def load(self):
+        """Load the cached location from disk"""
+        entry = self._file.load()
+        if entry is not None and {"fingerprint", "fetched_at", "location"} <= set(
+            entry
+        ):
+            self._entry = entry
+
+    def save(self):
+        """Write the cached location to disk"""
+        self._file.save(self._snapshot)
+
+    def _snapshot(self):
+        with self._lock:
+            return self._entry
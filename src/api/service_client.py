@@ -0,0 +1,43 @@
+"""
+Service client module for reading weather from a local weather daemon.
+"""
+
+import json
+import urllib.error
+import urllib.request
+
+from api.last_known_weather import snapshot_from_json
+
+DEFAULT_SERVICE_URL = "http://127.0.0.1:8765"
+
+
+class WeatherServiceClient:
+    """Thin client for the JSON endpoint served by `--serve`"""
+
+    def __init__(self, base_url=DEFAULT_SERVICE_URL, timeout=5):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def get_status(self):
+        """Return the daemon's status dict (success False on any failure)"""
+        try:
+            with urllib.request.urlopen(
+                f"{self.base_url}/weather", timeout=self.timeout
+            ) as response:
+                return json.load(response)
+        except urllib.error.HTTPError as e:
+            # The daemon answers 503 with a JSON error until it has data
+            try:
+                return json.load(e)
+            except ValueError:
+                return {"success": False, "error": f"Service error: {e.code}"}
+        except (OSError, ValueError) as e:
+            return {"success": False, "error": str(e)}
+
+    def get_weather(self):
+        """Return the daemon's current WeatherSnapshot, or None"""
+        status = self.get_status()
+        if not status.get("success"):
+            print(f"Weather service error: {status.get('error')}")
+            return None
+        return snapshot_from_json(status["weather"])
@@ -0,0 +1,209 @@
+"""
+Upstream guard module: client-side rate limiting and circuit breaking per host.
+"""
+
+import threading
+import time
+
+# Published limits of the free upstream services: host -> (requests/second, burst)
+RATE_LIMITS = {
+    "nominatim.openstreetmap.org": (1.0, 1),  # Nominatim usage policy: 1 req/s
+    "ip-api.com": (45 / 60, 45),  # ip-api free tier: 45 req/min
+}
+
+
+class UpstreamUnavailable(Exception):
+    """Raised instead of sending a request to a host that is failing or rate limited"""
+
+
+def is_healthy_status(status_code):
+    """True unless the status means the host itself is failing or throttling us"""
+    return status_code < 500 and status_code != 429
+
+
+class TokenBucket:
+    """Token bucket allowing `rate` requests per second with bursts of `capacity`"""
+
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = max(0.0, now - self._updated)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def reserve(self, max_wait):
+        """
+        Take a token, returning how long the caller must wait before using it,
+        or None (taking nothing) if that would be longer than max_wait.
+        """
+        with self._lock:
+            self._refill(self.clock())
+            wait = max(0.0, (1 - self._tokens) / self.rate)
+            if wait > max_wait:
+                return None
+            self._tokens -= 1
+            return wait
+
+
+class CircuitBreaker:
+    """
+    Stop calling a host after repeated failures.
+    closed: requests flow; open: fail fast until the cool-down ends;
+    half_open: one trial request decides whether to close or reopen.
+    """
+
+    def __init__(self, failure_threshold=3, cooldown=60, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.clock = clock
+
+        self.failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state(self.clock())
+
+    def _state(self, now):
+        if self._opened_at is None:
+            return "closed"
+        if now - self._opened_at >= self.cooldown:
+            return "half_open"
+        return "open"
+
+    def retry_in(self):
+        """Seconds until requests are tried again (0 when not open)"""
+        with self._lock:
+            if self._opened_at is None:
+                return 0.0
+            return max(0.0, self._opened_at + self.cooldown - self.clock())
+
+    def allow(self):
+        """True if a request may be sent now"""
+        with self._lock:
+            state = self._state(self.clock())
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def release_trial(self):
+        """Give back a half-open trial that was never sent"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial_in_flight or self.failures >= self.failure_threshold:
+                self._opened_at = self.clock()
+            self._trial_in_flight = False
+
+
+class UpstreamGuard:
+    """Per-host rate limiters and circuit breakers, created on first use"""
+
+    def __init__(self, rate_limits=None, failure_threshold=3, cooldown=60, max_wait=10):
+        self.rate_limits = RATE_LIMITS if rate_limits is None else rate_limits
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_wait = max_wait  # Longest we queue behind a rate limit
+
+        self._buckets = {}
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def _breaker_for(self, host):
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(
+                    self.failure_threshold, self.cooldown
+                )
+            return breaker
+
+    def _bucket_for(self, host):
+        if host not in self.rate_limits:
+            return None
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate, capacity = self.rate_limits[host]
+                bucket = self._buckets[host] = TokenBucket(rate, capacity)
+            return bucket
+
+    def admit(self, host):
+        """
+        Check the host's circuit and take a rate-limit token without blocking.
+        Returns the seconds to wait before sending; raises UpstreamUnavailable
+        to fail fast. Every admitted request must end in record_result() or
+        release().
+        """
+        breaker = self._breaker_for(host)
+        if not breaker.allow():
+            raise UpstreamUnavailable(
+                f"{host} is unavailable, retrying in {breaker.retry_in():.0f}s"
+            )
+
+        bucket = self._bucket_for(host)
+        if bucket is None:
+            return 0.0
+        wait = bucket.reserve(self.max_wait)
+        if wait is None:
+            # Not the host's fault: give back a half-open trial without judging it
+            breaker.release_trial()
+            raise UpstreamUnavailable(f"{host} rate limit reached")
+        return wait
+
+    def before_request(self, host):
+        """Blocking admit(): sleep until the host's rate limit allows sending"""
+        wait = self.admit(host)
+        if wait > 0:
+            try:
+                time.sleep(wait)
+            except BaseException:
+                self.release(host)
+                raise
+
+    def release(self, host):
+        """An admitted request was abandoned (e.g. cancelled) before an outcome"""
+        self._breaker_for(host).release_trial()
+
+    def record_result(self, host, success):
+        """Feed the outcome of a request to the host's circuit breaker"""
+        breaker = self._breaker_for(host)
+        if success:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+
+    def get_status(self):
+        """{host: {"state", "failures", "retry_in"}} for every host seen so far"""
+        with self._lock:
+            breakers = list(self._breakers.items())
+        return {
+            host: {
+                "state": breaker.state,
+                "failures": breaker.failures,
+                "retry_in": round(breaker.retry_in()),
+            }
+            for host, breaker in breakers
+        }
@@ -3,110 +3,433 @@ Weather API module for fetching weather data from various sources.
 """
 
 import json
+import os
 import random
+import threading
 import time
+from urllib.parse import urlsplit
 
-import requests
+from api.forecast_cache import ForecastCache
+from api.geocoding import Gazetteer, GeocodeCache, normalize_query
+from api.hourly_forecast import HourlyForecast
+from api.location_cache import LocationCache, get_network_fingerprint
+from api.single_flight import SingleFlight
+from api.upstream_guard import UpstreamGuard, is_healthy_status
+from core.weather_snapshot import WeatherSnapshot
+
+USER_AGENT = "HoodieWeatherWidget/1.0"
+
+# Status codes worth retrying: transient upstream failures. A 429 is not
+# re-sent; it counts against the host's circuit breaker instead.
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+
+IP_LOCATION_URL = "http://ip-api.com/json/"
+GEOCODE_URL = "https://nominatim.openstreetmap.org/search"
+FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+CURRENT_VARIABLES = (
+    "temperature_2m,relative_humidity_2m,precipitation,weather_code,wind_speed_10m"
+)
+HOURLY_VARIABLES = CURRENT_VARIABLES
+FORECAST_DAYS = 2  # Keeps at least 24 hours of forecast ahead of "now"
 
 
 class WeatherAPI:
     """Handle weather data fetching from different APIs"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        pool_connections=1,
+        pool_maxsize=4,
+        max_retries=2,
+        backoff_factor=0.5,
+        cache_dir=None,
+        use_gazetteer=True,
+        forecast_cache_size=32,
+    ):
         self.timeout = 10
 
-    def get_location_from_ip(self):
-        """Get user's location based on IP address"""
+        # Forecast responses are cached in memory, and on disk when cache_dir is set
+        self.cache_dir = cache_dir
+        self.forecast_cache = ForecastCache(
+            self._cache_path("forecast_cache.json"), max_entries=forecast_cache_size
+        )
+        self.geocode_cache = GeocodeCache(self._cache_path("geocode_cache.json"))
+        self.location_cache = LocationCache(self._cache_path("location_cache.json"))
+
+        # Offline city index, loaded on the first geocoding request
+        self.use_gazetteer = use_gazetteer
+        self._gazetteer = None
+
+        # Connection pool settings, applied to every per-host session
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+
+        # One keep-alive session per upstream host, created on first use
+        self._sessions = {}
+        self._sessions_lock = threading.Lock()
+
+        # Identical requests already in flight are joined instead of repeated
+        self.in_flight = SingleFlight()
+
+        # Per-host rate limits and circuit breakers, so a failing upstream fails fast
+        self.upstream_guard = UpstreamGuard(max_wait=self.timeout)
+
+    def _cache_path(self, filename):
+        """Return the path of a cache file, or None for memory-only caching"""
+        if not self.cache_dir:
+            return None
+        os.makedirs(self.cache_dir, exist_ok=True)
+        return os.path.join(self.cache_dir, filename)
+
+    @property
+    def gazetteer(self):
+        """The offline gazetteer, or None when disabled or unavailable"""
+        if self.use_gazetteer and self._gazetteer is None:
+            try:
+                self._gazetteer = Gazetteer()
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Gazetteer unavailable: {e}")
+                self.use_gazetteer = False
+        return self._gazetteer
+
+    def _create_session(self, retry_status=True):
+        """
+        Create a pooled session with retry/backoff for a single host.
+        Only failed connection attempts are retried, never a request that timed
+        out waiting for a response; status codes only when retry_status is set.
+        """
+        # Imported on first request so they stay off the widget's startup path
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        retry = Retry(
+            total=self.max_retries,
+            read=0,  # A hung host would otherwise cost a full timeout per attempt
+            status=self.max_retries if retry_status else 0,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset(["GET"]),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=retry,
+        )
+
+        session = requests.Session()
+        session.headers.update({"User-Agent": USER_AGENT})
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _session_for(self, url):
+        """Return the shared session for the host of the given URL"""
+        host = urlsplit(url).netloc
+        with self._sessions_lock:
+            session = self._sessions.get(host)
+            if session is None:
+                # Re-sending would bypass the rate limit of throttled hosts
+                retry_status = host not in self.upstream_guard.rate_limits
+                session = self._create_session(retry_status)
+                self._sessions[host] = session
+            return session
+
+    def _get(self, url, **kwargs):
+        """
+        Issue a GET request through the pooled session for the URL's host.
+        Raises UpstreamUnavailable without sending anything while the host's
+        circuit is open or its rate limit cannot be met within the timeout.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        host = urlsplit(url).netloc
+        self.upstream_guard.before_request(host)
         try:
-            response = requests.get("http://ip-api.com/json/", timeout=self.timeout)
-            data = response.json()
-
-            if data["status"] == "success":
-                return {
-                    "lat": data["lat"],
-                    "lon": data["lon"],
-                    "city": data["city"],
-                    "region": data.get("regionName", ""),
-                    "country": data.get("country", ""),
-                    "success": True,
-                }
+            response = self._session_for(url).get(url, **kwargs)
+        except Exception:
+            self.upstream_guard.record_result(host, False)
+            raise
+        except BaseException:
+            self.upstream_guard.release(host)  # Interrupted: says nothing of the host
+            raise
+        self.upstream_guard.record_result(host, is_healthy_status(response.status_code))
+        return response
+
+    def get_upstream_status(self):
+        """
+        Get circuit breaker state per upstream host.
+        Returns dict: {host: {"state", "failures", "retry_in"}}
+        """
+        return self.upstream_guard.get_status()
+
+    def get_connection_stats(self):
+        """
+        Get connection reuse counters per host.
+        Returns dict: {host: {"requests", "new_connections", "reused_connections"}}
+        """
+        with self._sessions_lock:
+            sessions = list(self._sessions.items())
+
+        stats = {}
+        for host, session in sessions:
+            requests_made = 0
+            new_connections = 0
+            for adapter in set(session.adapters.values()):
+                pools = adapter.poolmanager.pools
+                for key in pools.keys():
+                    pool = pools.get(key)
+                    if pool is None:
+                        continue
+                    requests_made += pool.num_requests
+                    new_connections += pool.num_connections
+
+            stats[host] = {
+                "requests": requests_made,
+                "new_connections": new_connections,
+                "reused_connections": max(0, requests_made - new_connections),
+            }
+        return stats
+
+    def close(self):
+        """Close all pooled sessions and their open connections"""
+        with self._sessions_lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+
+        for session in sessions:
+            session.close()
+
+    def get_location_from_ip(self, use_cache=True):
+        """
+        Get user's location based on IP address.
+        The result is reused until the local network changes or it expires.
+        """
+        try:
+            fingerprint = get_network_fingerprint()
+            if use_cache:
+                cached = self.location_cache.get(fingerprint)
+                if cached is not None:
+                    return cached
+
+            location = self.in_flight.do(
+                ("ip_location", fingerprint), self._fetch_ip_location, fingerprint
+            )
+            if location is not None:
+                return location
             return {"success": False, "error": "Location detection failed"}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
-    def geocode_location(self, location_query):
-        """Geocode a location string to coordinates using OpenStreetMap"""
+    def geocode_location(self, location_query, use_cache=True):
+        """
+        Geocode a location string to coordinates.
+        Tries the offline gazetteer and the result cache before OpenStreetMap.
+        """
         try:
-            url = f"https://nominatim.openstreetmap.org/search?q={location_query}&format=json&limit=1"
-            response = requests.get(
-                url,
-                timeout=self.timeout,
-                headers={"User-Agent": "HoodieWeatherWidget/1.0"},
-            )
+            if use_cache:
+                result = self.lookup_cached_location(location_query)
+                if result is not None:
+                    return result
 
-            if response.status_code == 200:
-                data = response.json()
-                if data:
-                    location = data[0]
-                    return {
-                        "lat": float(location["lat"]),
-                        "lon": float(location["lon"]),
-                        "display_name": location["display_name"],
-                        "success": True,
-                    }
+            result = self.in_flight.do(
+                ("geocode", normalize_query(location_query)),
+                self._fetch_geocode,
+                location_query,
+            )
+            if result is not None:
+                return result
             return {"success": False, "error": "Location not found"}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
-    def get_weather_data(self, lat, lon):
-        """Fetch weather data from Open-Meteo API"""
+    def get_weather_data(self, lat, lon, use_cache=True):
+        """Fetch weather data from Open-Meteo API (served from cache when fresh)"""
         try:
-            url = (
-                f"https://api.open-meteo.com/v1/forecast?"
-                f"latitude={lat}&longitude={lon}&"
-                f"current=temperature_2m,relative_humidity_2m,precipitation,weather_code,wind_speed_10m&"
-                f"hourly=precipitation&timezone=auto&forecast_days=1"
+            cache_key = self.weather_cache_key(lat, lon)
+
+            if use_cache:
+                api_data = self.forecast_cache.get(cache_key)
+                if api_data is not None:
+                    return self.parse_weather_data(api_data)
+
+            # Concurrent callers for the same (rounded) coordinates share one request
+            status_code, api_data = self.in_flight.do(
+                ("weather", cache_key), self._fetch_weather, lat, lon, cache_key
             )
 
-            response = requests.get(url, timeout=self.timeout)
-
-            if response.status_code == 200:
-                api_data = response.json()
-                current = api_data["current"]
-
-                weather_data = {
-                    "main": {
-                        "temp": current["temperature_2m"],
-                        "humidity": current["relative_humidity_2m"],
-                    },
-                    "wind": {
-                        "speed": round(
-                            current["wind_speed_10m"] / 3.6, 1
-                        )  # Convert km/h to m/s
-                    },
-                    "weather": [
-                        {
-                            "main": self.get_weather_description(
-                                current["weather_code"]
-                            ),
-                            "description": self.get_weather_description(
-                                current["weather_code"]
-                            ).lower(),
-                        }
-                    ],
-                    "success": True,
-                }
-
-                # Add precipitation if present
-                if current["precipitation"] > 0:
-                    weather_data["rain"] = {"1h": current["precipitation"]}
-
-                return weather_data
-
-            return {"success": False, "error": f"API error: {response.status_code}"}
+            if status_code == 200:
+                return self.parse_weather_data(api_data)
+
+            return {"success": False, "error": f"API error: {status_code}"}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    def _fetch_ip_location(self, fingerprint):
+        """Network half of get_location_from_ip; returns the location or None"""
+        response = self._get(IP_LOCATION_URL)
+        location = self.parse_ip_location(response.json())
+        if location is not None:
+            self.location_cache.put(fingerprint, location)
+        return location
+
+    def _fetch_geocode(self, location_query):
+        """Network half of geocode_location; returns the result or None"""
+        response = self._get(GEOCODE_URL, params=self.geocode_params(location_query))
+        if response.status_code != 200:
+            return None
+
+        result = self.parse_geocode_results(response.json())
+        if result is not None:
+            self.geocode_cache.put(location_query, result)
+        return result
+
+    def _fetch_weather(self, lat, lon, cache_key):
+        """Network half of get_weather_data; returns (status_code, api_data)"""
+        response = self._get(FORECAST_URL, params=self.weather_params(lat, lon))
+        if response.status_code != 200:
+            return response.status_code, None
+
+        api_data = response.json()
+        self.forecast_cache.put(cache_key, api_data)
+        return response.status_code, api_data
+
+    def get_weather_data_batch(self, locations, chunk_size=50, use_cache=True):
+        """
+        Fetch weather for many (lat, lon) pairs using Open-Meteo's multi-location
+        requests: one request per chunk of uncached locations.
+        Returns one weather dict per location, in the same order.
+        """
+        results = [None] * len(locations)
+        pending = []  # (index, lat, lon, cache_key) still needing a fetch
+
+        for index, (lat, lon) in enumerate(locations):
+            cache_key = self.weather_cache_key(lat, lon)
+            api_data = self.forecast_cache.get(cache_key) if use_cache else None
+            if api_data is not None:
+                results[index] = self.parse_weather_data(api_data)
+            else:
+                pending.append((index, lat, lon, cache_key))
+
+        for start in range(0, len(pending), chunk_size):
+            chunk = pending[start : start + chunk_size]
+            params = self.weather_params(
+                ",".join(str(lat) for _, lat, _, _ in chunk),
+                ",".join(str(lon) for _, _, lon, _ in chunk),
+            )
+
+            try:
+                response = self._get(FORECAST_URL, params=params)
+                if response.status_code != 200:
+                    raise ValueError(f"API error: {response.status_code}")
+
+                payload = response.json()
+                # A single location comes back as an object rather than a list
+                if isinstance(payload, dict):
+                    payload = [payload]
+                if len(payload) != len(chunk):
+                    raise ValueError("API returned an unexpected number of locations")
+
+                self.forecast_cache.put_many(
+                    (cache_key, api_data)
+                    for (_, _, _, cache_key), api_data in zip(chunk, payload)
+                )
+                for (index, _, _, _), api_data in zip(chunk, payload):
+                    results[index] = self.parse_weather_data(api_data)
+            except Exception as e:
+                for index, _, _, _ in chunk:
+                    results[index] = {"success": False, "error": str(e)}
+
+        return results
+
+    def lookup_cached_location(self, location_query):
+        """Resolve a query from the gazetteer or geocode cache, or None"""
+        gazetteer = self.gazetteer
+        result = gazetteer.lookup(location_query) if gazetteer else None
+        if result is None:
+            result = self.geocode_cache.get(location_query)
+        return result
+
+    def weather_cache_key(self, lat, lon):
+        """Forecast cache key for a location and the variables we request"""
+        variables = (
+            f"current={CURRENT_VARIABLES}&hourly={HOURLY_VARIABLES}"
+            f"&days={FORECAST_DAYS}&unixtime"
+        )
+        return self.forecast_cache.make_key(lat, lon, variables)
+
+    def weather_params(self, lat, lon):
+        """Open-Meteo query parameters for a single location"""
+        return {
+            "latitude": lat,
+            "longitude": lon,
+            "current": CURRENT_VARIABLES,
+            "hourly": HOURLY_VARIABLES,
+            "timezone": "auto",
+            "timeformat": "unixtime",
+            "forecast_days": FORECAST_DAYS,
+        }
+
+    def geocode_params(self, location_query):
+        """Nominatim query parameters for a location search"""
+        return {"q": location_query, "format": "json", "limit": 1}
+
+    def parse_ip_location(self, data):
+        """Convert an ip-api.com response into a location dict, or None"""
+        if data.get("status") != "success":
+            return None
+        return {
+            "lat": data["lat"],
+            "lon": data["lon"],
+            "city": data["city"],
+            "region": data.get("regionName", ""),
+            "country": data.get("country", ""),
+            "success": True,
+        }
+
+    def parse_geocode_results(self, data):
+        """Convert a Nominatim search response into a geocoding result, or None"""
+        if not data:
+            return None
+        location = data[0]
+        return {
+            "lat": float(location["lat"]),
+            "lon": float(location["lon"]),
+            "display_name": location["display_name"],
+            "success": True,
+        }
+
+    def parse_weather_data(self, api_data):
+        """
+        Convert a raw Open-Meteo response into a WeatherSnapshot (which reads
+        like the widget's weather dict)
+        """
+        current = api_data["current"]
+        description = self.get_weather_description(current["weather_code"])
+
+        # Keep the forecast so later refreshes can be served without the network
+        hourly = api_data.get("hourly")
+        if not isinstance(hourly, HourlyForecast):
+            hourly = (
+                HourlyForecast.from_open_meteo(hourly)
+                if hourly and "time" in hourly
+                else None
+            )
+
+        return WeatherSnapshot(
+            temp=current["temperature_2m"],
+            humidity=current["relative_humidity_2m"],
+            wind_speed=round(current["wind_speed_10m"] / 3.6, 1),  # km/h to m/s
+            condition=description,
+            description=description.lower(),
+            rain=max(current["precipitation"], 0),  # Listed as "rain" when > 0
+            weather_code=current["weather_code"],
+            observed_at=current.get("time"),
+            hourly=hourly,
+        )
+
     def get_weather_description(self, weather_code):
         """Convert Open-Meteo weather codes to descriptions"""
         weather_codes = {
@@ -145,19 +468,17 @@ class WeatherAPI:
         """Generate demo weather data when API is not available"""
         base_temp = 15 + (time.time() % 86400) / 86400 * 10
 
-        demo_data = {
-            "main": {
-                "temp": round(base_temp + random.uniform(-2, 2), 1),
-                "humidity": random.randint(45, 85),
-            },
-            "wind": {"speed": round(random.uniform(1, 8), 1)},
-            "weather": [{"main": "Demo", "description": "demo weather data"}],
-            "success": True,
-            "is_demo": True,
-        }
+        demo_data = WeatherSnapshot(
+            temp=round(base_temp + random.uniform(-2, 2), 1),
+            humidity=random.randint(45, 85),
+            wind_speed=round(random.uniform(1, 8), 1),
+            condition="Demo",
+            description="demo weather data",
+            is_demo=True,
+        )
 
         # Simulate precipitation occasionally
         if random.random() < 0.3:
-            demo_data["rain"] = {"1h": round(random.uniform(0.1, 2.0), 1)}
+            demo_data = demo_data.replace(rain=round(random.uniform(0.1, 2.0), 1))
 
         return demo_data
@@ -0,0 +1,198 @@
+"""
+Comfort lookup module.
+Precomputes hoodie comfort for every combination of quantized inputs so that
+scores and recommendations can be answered by a single table index.
+"""
+
+from core.hoodie_calculator import (
+    HUMIDITY_BOUNDS,
+    NUMPY_AVAILABLE,
+    TEMP_BOUNDS,
+    WIND_BOUNDS,
+    HoodieComfortCalculator,
+    count_bounds_above,
+    count_bounds_not_below,
+)
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+# Scoring thresholds plus the -10/0/20 °C cut-offs used for recommendations
+TEMP_EDGES = tuple(sorted(set(TEMP_BOUNDS) | {-10, 0, 20}))
+
+# Precipitation states; snow takes precedence over rain in the calculator
+PRECIP_NONE, PRECIP_RAIN, PRECIP_SNOW = 0, 1, 2
+PRECIP_STATES = 3
+
+
+# Bins count the calculator's own comparisons, so equal values and NaN (null
+# forecast hours: below no bound, above no bound) land where it puts them
+
+
+def _temp_bin(temp):
+    """Calculator checks "temp < bound": NaN goes to the top bin"""
+    return sum(not temp < bound for bound in TEMP_EDGES)
+
+
+def _wind_bin(wind_speed):
+    """Calculator checks "wind > bound": NaN goes to the bottom bin"""
+    return sum(wind_speed > bound for bound in WIND_BOUNDS)
+
+
+def _humidity_bin(humidity):
+    """Calculator checks "humidity > bound": NaN goes to the bottom bin"""
+    return sum(humidity > bound for bound in HUMIDITY_BOUNDS)
+
+
+def _precip_state(has_rain, has_snow):
+    if has_snow:
+        return PRECIP_SNOW
+    return PRECIP_RAIN if has_rain else PRECIP_NONE
+
+
+class ComfortLookupEngine:
+    """Table-driven drop-in for HoodieComfortCalculator scoring"""
+
+    def __init__(self, calculator=None, validate=False):
+        self.calculator = calculator or HoodieComfortCalculator()
+        self.validate = validate  # Cross-check every answer against the calculator
+
+        self._wind_bins = len(WIND_BOUNDS) + 1
+        self._humidity_bins = len(HUMIDITY_BOUNDS) + 1
+        self.scores = []
+        self.codes = []
+        self._build_table()
+
+        if NUMPY_AVAILABLE:
+            self._score_array = np.asarray(self.scores, dtype=np.float64)
+            self._code_array = np.asarray(self.codes, dtype=np.int8)
+
+    def _build_table(self):
+        """Score one representative input per bin with the branching code"""
+        # Any value inside a bin scores the same; use the bin's lower edge
+        temps = [TEMP_EDGES[0] - 1] + list(TEMP_EDGES)
+        winds = list(WIND_BOUNDS) + [WIND_BOUNDS[-1] + 1]
+        humidities = list(HUMIDITY_BOUNDS) + [HUMIDITY_BOUNDS[-1] + 1]
+        precipitation = [(False, False), (True, False), (False, True)]
+
+        calculator = self.calculator
+        for temp in temps:
+            for wind_speed in winds:
+                for humidity in humidities:
+                    for has_rain, has_snow in precipitation:
+                        score = calculator._calculate_temperature_score(temp)
+                        score = calculator._apply_wind_factor(score, wind_speed)
+                        score = calculator._apply_precipitation_factor(
+                            score, has_rain, has_snow
+                        )
+                        score = calculator._apply_humidity_factor(score, humidity)
+                        score = max(0.0, min(1.0, score))
+
+                        self.scores.append(score)
+                        self.codes.append(
+                            calculator._recommendation_code(
+                                temp, score, has_rain, has_snow
+                            )
+                        )
+
+    def index(self, temp, humidity, wind_speed, has_rain=False, has_snow=False):
+        """Position of the quantized inputs in the table"""
+        index = _temp_bin(temp)
+        index = index * self._wind_bins + _wind_bin(wind_speed)
+        index = index * self._humidity_bins + _humidity_bin(humidity)
+        return index * PRECIP_STATES + _precip_state(has_rain, has_snow)
+
+    def lookup(self, temp, humidity, wind_speed, has_rain=False, has_snow=False):
+        """Return (comfort_score, recommendation_code) for one observation"""
+        index = self.index(temp, humidity, wind_speed, has_rain, has_snow)
+        return self.scores[index], self.codes[index]
+
+    def calculate_comfort_level(self, weather_data):
+        """Same result as HoodieComfortCalculator.calculate_comfort_level"""
+        if not weather_data:
+            return 0.5, "Checking conditions..."
+
+        has_rain = bool("rain" in weather_data and weather_data["rain"])
+        has_snow = bool("snow" in weather_data and weather_data["snow"])
+        score, code = self.lookup(
+            weather_data["main"]["temp"],
+            weather_data["main"]["humidity"],
+            weather_data["wind"]["speed"],
+            has_rain,
+            has_snow,
+        )
+        result = (score, self.calculator.recommendation_text(code))
+
+        if self.validate:
+            expected = self.calculator.calculate_comfort_level(weather_data)
+            if result != expected:
+                raise ValueError(
+                    f"Comfort lookup mismatch for {weather_data}: "
+                    f"{result} != {expected}"
+                )
+        return result
+
+    def generate_recommendation(
+        self, temp, humidity, wind_speed, has_rain=False, has_snow=False
+    ):
+        """Recommendation text for one observation"""
+        _, code = self.lookup(temp, humidity, wind_speed, has_rain, has_snow)
+        return self.calculator.recommendation_text(code)
+
+    def calculate_comfort_batch(self, temp, humidity, wind_speed, rain=None, snow=None):
+        """
+        Same inputs and results as HoodieComfortCalculator.calculate_comfort_batch,
+        answered by table lookups.
+        """
+        if NUMPY_AVAILABLE:
+            scores, codes = self._lookup_batch_numpy(
+                temp, humidity, wind_speed, rain, snow
+            )
+        else:
+            rain = rain if rain is not None else [0] * len(temp)
+            snow = snow if snow is not None else [0] * len(temp)
+            scores = []
+            codes = []
+            for row in zip(temp, humidity, wind_speed, rain, snow):
+                row_temp, row_humidity, row_wind, row_rain, row_snow = row
+                score, code = self.lookup(
+                    row_temp, row_humidity, row_wind, row_rain > 0, row_snow > 0
+                )
+                scores.append(score)
+                codes.append(code)
+
+        if self.validate:
+            # Check against the branching implementation: the calculator's NumPy
+            # path shares the *_BOUNDS constants with this table
+            expected_scores, expected_codes = (
+                self.calculator._calculate_comfort_batch_scalar(
+                    temp, humidity, wind_speed, rain, snow
+                )
+            )
+            if list(scores) != list(expected_scores) or list(codes) != list(
+                expected_codes
+            ):
+                raise ValueError("Comfort lookup mismatch in batch scoring")
+
+        return scores, codes
+
+    def _lookup_batch_numpy(self, temp, humidity, wind_speed, rain, snow):
+        """Quantize whole columns and gather from the table"""
+        temp = np.asarray(temp, dtype=np.float64)
+        no_precipitation = np.zeros(temp.shape)
+        has_rain = np.asarray(no_precipitation if rain is None else rain) > 0
+        has_snow = np.asarray(no_precipitation if snow is None else snow) > 0
+
+        index = count_bounds_not_below(temp, TEMP_EDGES)
+        index = index * self._wind_bins + count_bounds_above(
+            np.asarray(wind_speed, dtype=np.float64), WIND_BOUNDS
+        )
+        index = index * self._humidity_bins + count_bounds_above(
+            np.asarray(humidity, dtype=np.float64), HUMIDITY_BOUNDS
+        )
+        precip_state = np.where(
+            has_snow, PRECIP_SNOW, np.where(has_rain, PRECIP_RAIN, PRECIP_NONE)
+        )
+        index = index * PRECIP_STATES + precip_state
+
+        return self._score_array[index], self._code_array[index]
@@ -0,0 +1,100 @@
+"""
+Forecast interpolator module.
+Serves current conditions from a retained hourly forecast and decides when the
+forecast is too old or too volatile to keep using without a network refresh.
+"""
+
+from bisect import bisect_right
+
+# Hourly columns interpolated linearly between forecast hours
+LINEAR_VARIABLES = ("temperature_2m", "relative_humidity_2m", "wind_speed_10m")
+
+
+class ForecastInterpolator:
+    """Answer "what is it like now?" from hourly forecast data"""
+
+    def __init__(
+        self,
+        min_remaining=3 * 3600,
+        max_age=3 * 3600,
+        volatile_max_age=15 * 60,
+        max_temp_rate=2.0,
+        max_precip_change=0.5,
+    ):
+        self.min_remaining = min_remaining  # Seconds of forecast that must remain
+        self.max_age = max_age  # Refetch at least this often to pick up revisions
+        self.volatile_max_age = volatile_max_age  # Refetch sooner when volatile
+        self.max_temp_rate = max_temp_rate  # °C per hour counted as "changing fast"
+        self.max_precip_change = max_precip_change  # mm per hour
+
+    def _bracket(self, hourly, when):
+        """Return index i with time[i] <= when < time[i + 1], or None"""
+        times = hourly.get("time") if hourly else None
+        if not times or len(times) < 2:
+            return None
+
+        index = bisect_right(times, when) - 1
+        if index < 0 or index >= len(times) - 1:
+            return None
+        return index
+
+    def conditions_at(self, hourly, when):
+        """
+        Interpolate current conditions at epoch time `when`.
+        Returns a dict shaped like Open-Meteo's "current" block, or None when
+        `when` falls outside the forecast window.
+        """
+        index = self._bracket(hourly, when)
+        if index is None:
+            return None
+
+        times = hourly["time"]
+        fraction = (when - times[index]) / (times[index + 1] - times[index])
+
+        current = {"time": int(when)}
+        for name in LINEAR_VARIABLES:
+            before = hourly[name][index]
+            after = hourly[name][index + 1]
+            current[name] = round(before + (after - before) * fraction, 1)
+
+        # Precipitation and weather code describe the hour ending at time[i + 1]
+        current["precipitation"] = hourly["precipitation"][index + 1]
+        current["weather_code"] = hourly["weather_code"][index + 1]
+        return current
+
+    def is_volatile(self, hourly, when):
+        """True when temperature or precipitation is changing quickly around `when`"""
+        index = self._bracket(hourly, when)
+        if index is None:
+            return False
+
+        hours = (hourly["time"][index + 1] - hourly["time"][index]) / 3600
+        temps = hourly["temperature_2m"]
+        precip = hourly["precipitation"]
+
+        temp_rate = abs(temps[index + 1] - temps[index]) / hours
+        precip_change = abs(precip[index + 1] - precip[index])
+        rain_starting_or_stopping = (precip[index] > 0) != (precip[index + 1] > 0)
+
+        return (
+            temp_rate > self.max_temp_rate
+            or precip_change > self.max_precip_change
+            or rain_starting_or_stopping
+        )
+
+    def needs_refresh(self, hourly, observed_at, now):
+        """Decide whether the retained forecast must be refetched"""
+        if not hourly or observed_at is None:
+            return True
+
+        times = hourly.get("time") or []
+        if not times or times[-1] - now < self.min_remaining:
+            return True  # Forecast window is running out
+
+        age = now - observed_at
+        if age >= self.max_age:
+            return True
+        if age >= self.volatile_max_age and self.is_volatile(hourly, now):
+            return True
+
+        return self._bracket(hourly, now) is None
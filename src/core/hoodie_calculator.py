@@ -3,6 +3,58 @@ Hoodie comfort calculator module.
 Contains logic for determining hoodie comfort levels based on weather conditions.
 """
 
+import importlib.util
+from bisect import bisect_right
+
+from core.weather_snapshot import WeatherSnapshot
+
+# NumPy is optional; batch scoring falls back to the scalar path without it.
+# It is only imported when batch scoring first runs.
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+# Batches smaller than this (e.g. a day of hourly forecast) are scored row by
+# row: quicker than importing NumPy, which would otherwise delay the first paint
+NUMPY_MIN_BATCH = 256
+
+# Recommendation codes used by batch scoring, as indexes into this tuple
+RECOMMENDATION_KEYS = (
+    "freezing",
+    "cold",
+    "snow",
+    "rain",
+    "perfect",
+    "great",
+    "good",
+    "warm",
+    "hot",
+)
+
+# The thresholds of the scalar scoring methods below, as lookup tables for
+# vectorized scoring. Keep both in sync.
+TEMP_BOUNDS = (-5, 0, 10, 15, 22, 28, 35)  # score changes when temp < bound
+TEMP_SCORES = (0.0, 0.1, 0.15, 0.2, 0.3, 0.7, 0.85, 0.95)
+WIND_BOUNDS = (5, 10)  # adjustment changes when wind > bound
+WIND_ADJUSTMENTS = (0.0, 0.1, 0.2)
+HUMIDITY_BOUNDS = (75, 85)  # adjustment changes when humidity > bound
+HUMIDITY_ADJUSTMENTS = (0.0, 0.1, 0.15)
+SCORE_BOUNDS = (0.25, 0.4, 0.6, 0.8)  # perfect/great/good/warm/hot
+
+# Recommendation codes from this one up mean "too warm for a hoodie"
+TOO_WARM_CODE = RECOMMENDATION_KEYS.index("warm")
+
+
+def count_bounds_above(values, bounds):
+    """NumPy bin index of a `value > bound` chain (NaN exceeds no bound, like the scalar path)"""
+    import numpy as np
+
+    return (np.asarray(values)[..., np.newaxis] > np.asarray(bounds)).sum(axis=-1)
+
+
+def count_bounds_not_below(values, bounds):
+    """NumPy bin index of a `value < bound` chain (NaN is below no bound, like the scalar path)"""
+    import numpy as np
+
+    return (~(np.asarray(values)[..., np.newaxis] < np.asarray(bounds))).sum(axis=-1)
+
 
 class HoodieComfortCalculator:
     """Calculate hoodie comfort levels based on weather data"""
@@ -26,6 +78,8 @@ class HoodieComfortCalculator:
             "hot": "Too hot for a hoodie ☀️",
             "cold": "Perfect for a thick hoodie! 🧥",
             "freezing": "Bundle up! Extra layers needed! ❄️",
+            "snow": "Perfect hoodie weather for snow! ❄️🧥",
+            "rain": "Great hoodie weather for rain! 🌧️👍",
         }
 
     def calculate_comfort_level(self, weather_data):
@@ -37,13 +91,21 @@ class HoodieComfortCalculator:
         if not weather_data:
             return 0.5, "Checking conditions..."
 
-        temp = weather_data["main"]["temp"]
-        humidity = weather_data["main"]["humidity"]
-        wind_speed = weather_data["wind"]["speed"]
+        if isinstance(weather_data, WeatherSnapshot):
+            # Fast path: flat attributes, no nested dicts to build
+            temp = weather_data.temp
+            humidity = weather_data.humidity
+            wind_speed = weather_data.wind_speed
+            has_rain = bool(weather_data.rain)
+            has_snow = bool(weather_data.snow)
+        else:
+            temp = weather_data["main"]["temp"]
+            humidity = weather_data["main"]["humidity"]
+            wind_speed = weather_data["wind"]["speed"]
 
-        # Check for precipitation
-        has_rain = "rain" in weather_data and weather_data["rain"]
-        has_snow = "snow" in weather_data and weather_data["snow"]
+            # Check for precipitation
+            has_rain = "rain" in weather_data and weather_data["rain"]
+            has_snow = "snow" in weather_data and weather_data["snow"]
 
         # Calculate base comfort score based on temperature
         comfort_score = self._calculate_temperature_score(temp)
@@ -114,27 +176,163 @@ class HoodieComfortCalculator:
 
     def _generate_recommendation(self, temp, comfort_score, has_rain, has_snow):
         """Generate human-readable recommendation text"""
+        code = self._recommendation_code(temp, comfort_score, has_rain, has_snow)
+        return self.recommendation_text(code)
+
+    def _recommendation_code(self, temp, comfort_score, has_rain, has_snow):
+        """Pick the recommendation, as an index into RECOMMENDATION_KEYS"""
         # Special cases for extreme weather
         if temp < -10:
-            return self.messages["freezing"]
+            return 0  # freezing
         elif temp < 0:
-            return self.messages["cold"]
+            return 1  # cold
         elif has_snow:
-            return "Perfect hoodie weather for snow! ❄️🧥"
+            return 2  # snow
         elif has_rain and temp < 20:
-            return "Great hoodie weather for rain! 🌧️👍"
+            return 3  # rain
 
         # Standard recommendations based on comfort score
         if comfort_score < 0.25:
-            return self.messages["perfect"]
+            return 4  # perfect
         elif comfort_score < 0.4:
-            return self.messages["great"]
+            return 5  # great
         elif comfort_score < 0.6:
-            return self.messages["good"]
+            return 6  # good
         elif comfort_score < 0.8:
-            return self.messages["warm"]
+            return 7  # warm
         else:
-            return self.messages["hot"]
+            return 8  # hot
+
+    def recommendation_text(self, code):
+        """Convert a recommendation code from batch scoring into its text"""
+        return self.messages[RECOMMENDATION_KEYS[code]]
+
+    def calculate_comfort_batch(self, temp, humidity, wind_speed, rain=None, snow=None):
+        """
+        Score many observations at once from columnar inputs.
+        rain/snow are precipitation amounts (a row counts as rainy/snowy when > 0).
+        Returns (comfort_scores, recommendation_codes); the values are identical
+        to calculate_comfort_level row by row. Uses NumPy arrays for large batches
+        when available, otherwise plain lists computed with the scalar methods.
+        """
+        if not NUMPY_AVAILABLE or len(temp) < NUMPY_MIN_BATCH:
+            return self._calculate_comfort_batch_scalar(
+                temp, humidity, wind_speed, rain, snow
+            )
+
+        import numpy as np
+
+        temp = np.asarray(temp, dtype=np.float64)
+        humidity = np.asarray(humidity, dtype=np.float64)
+        wind_speed = np.asarray(wind_speed, dtype=np.float64)
+        no_precipitation = np.zeros(temp.shape)
+        has_rain = np.asarray(no_precipitation if rain is None else rain) > 0
+        has_snow = np.asarray(no_precipitation if snow is None else snow) > 0
+
+        # Count bounds with the scalar comparisons so NaN lands in the same bin
+        base_scores = np.asarray(TEMP_SCORES)[count_bounds_not_below(temp, TEMP_BOUNDS)]
+        wind_adjustment = np.asarray(WIND_ADJUSTMENTS)[
+            count_bounds_above(wind_speed, WIND_BOUNDS)
+        ]
+        precipitation_adjustment = np.where(
+            has_snow, 0.15, np.where(has_rain, 0.1, 0.0)
+        )
+        humidity_adjustment = np.asarray(HUMIDITY_ADJUSTMENTS)[
+            count_bounds_above(humidity, HUMIDITY_BOUNDS)
+        ]
+
+        # Same float operations, in the same order, as the scalar path
+        # (subtracting or adding 0.0 leaves a score unchanged)
+        scores = base_scores - wind_adjustment
+        scores = scores - precipitation_adjustment
+        scores = scores + humidity_adjustment
+        scores = np.clip(scores, 0.0, 1.0)
+
+        score_codes = 4 + np.searchsorted(SCORE_BOUNDS, scores, side="right")
+        codes = np.select(
+            [temp < -10, temp < 0, has_snow, has_rain & (temp < 20)],
+            [0, 1, 2, 3],
+            default=score_codes,
+        ).astype(np.int8)
+
+        return scores, codes
+
+    def _calculate_comfort_batch_scalar(self, temp, humidity, wind_speed, rain, snow):
+        """Batch scoring without NumPy: run the scalar methods row by row"""
+        rain = rain if rain is not None else [0] * len(temp)
+        snow = snow if snow is not None else [0] * len(temp)
+
+        scores = []
+        codes = []
+        for row_temp, row_humidity, row_wind, row_rain, row_snow in zip(
+            temp, humidity, wind_speed, rain, snow
+        ):
+            has_rain = row_rain > 0
+            has_snow = row_snow > 0
+            score = self._calculate_temperature_score(row_temp)
+            score = self._apply_wind_factor(score, row_wind)
+            score = self._apply_precipitation_factor(score, has_rain, has_snow)
+            score = self._apply_humidity_factor(score, row_humidity)
+            score = max(0.0, min(1.0, score))
+
+            scores.append(score)
+            codes.append(self._recommendation_code(row_temp, score, has_rain, has_snow))
+        return scores, codes
+
+    def calculate_hoodie_timeline(self, hourly, now, hours=24, best_count=3):
+        """
+        Score every forecast hour from `now` to `now + hours` in one batch.
+        hourly is an HourlyForecast (or a dict of Open-Meteo hourly columns).
+        Returns a dict with the hourly "times", "scores" and "codes", the
+        "best_hours" for a hoodie, and "take_off_at"/"put_on_at" times for when
+        it gets too warm and when it is hoodie weather again (None if never).
+        Returns None when the forecast does not cover `now`.
+        """
+        times = hourly.get("time") if hourly else None
+        if not times:
+            return None
+
+        # Start at the hour containing `now`
+        start = max(0, bisect_right(times, now) - 1)
+        end = bisect_right(times, now + hours * 3600)
+        if start >= end or times[-1] < now:
+            return None
+
+        wind_speed = [
+            round(speed / 3.6, 1)  # Convert km/h to m/s, as for current weather
+            for speed in hourly["wind_speed_10m"][start:end]
+        ]
+        scores, codes = self.calculate_comfort_batch(
+            hourly["temperature_2m"][start:end],
+            hourly["relative_humidity_2m"][start:end],
+            wind_speed,
+            rain=hourly["precipitation"][start:end],
+        )
+        times = list(times[start:end])
+        scores = [float(score) for score in scores]
+        codes = [int(code) for code in codes]
+
+        take_off_at = None
+        put_on_at = None
+        for when, code in zip(times, codes):
+            if take_off_at is None:
+                if code >= TOO_WARM_CODE:
+                    take_off_at = when
+            elif code < TOO_WARM_CODE:
+                put_on_at = when
+                break
+
+        # Lowest scores first; ties keep the earlier hour
+        best = sorted(range(len(times)), key=lambda i: scores[i])[:best_count]
+
+        return {
+            "times": times,
+            "scores": scores,
+            "codes": codes,
+            "best_hours": [times[i] for i in sorted(best)],
+            "take_off_at": take_off_at,
+            "put_on_at": put_on_at,
+        }
 
     def get_comfort_category(self, comfort_score):
         """Get comfort category from score"""
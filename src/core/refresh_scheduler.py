@@ -0,0 +1,95 @@
+"""
+Refresh scheduler module.
+Decides how long to wait before the next weather update based on the configured
+interval, recent failures, how fast conditions are changing and user idleness.
+"""
+
+import sys
+import time
+
+
+def get_idle_seconds():
+    """
+    Return seconds since the last keyboard/mouse input, or None if unknown.
+    Only Windows exposes this cheaply; other platforms report None.
+    """
+    if sys.platform != "win32":
+        return None
+
+    try:
+        import ctypes
+
+        class LASTINPUTINFO(ctypes.Structure):
+            _fields_ = [("cbSize", ctypes.c_uint), ("dwTime", ctypes.c_uint)]
+
+        info = LASTINPUTINFO()
+        info.cbSize = ctypes.sizeof(LASTINPUTINFO)
+        if not ctypes.windll.user32.GetLastInputInfo(ctypes.byref(info)):
+            return None
+        millis = ctypes.windll.kernel32.GetTickCount() - info.dwTime
+        return max(0, millis) / 1000.0
+    except Exception:
+        return None
+
+
+class RefreshScheduler:
+    """Adaptive refresh interval with failure backoff and idle slow-down"""
+
+    def __init__(
+        self,
+        base_interval=600,
+        min_interval=120,
+        max_interval=3600,
+        idle_threshold=900,
+        max_backoff_steps=4,
+        first_retry_delay=30,
+    ):
+        self.base_interval = base_interval  # Normally the update_interval setting
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.idle_threshold = idle_threshold  # Idle seconds before slowing down
+        self.max_backoff_steps = max_backoff_steps
+        self.first_retry_delay = first_retry_delay  # Retry after a single failure
+
+        self.consecutive_failures = 0
+        self.next_refresh_at = None
+        self.last_delay = None
+
+    def record_success(self):
+        """A refresh produced real weather data"""
+        self.consecutive_failures = 0
+
+    def record_failure(self):
+        """A refresh failed (no data or fell back to demo data)"""
+        self.consecutive_failures += 1
+
+    def next_delay(self, volatile=False, idle_seconds=None):
+        """Seconds to wait before the next refresh"""
+        delay = self.base_interval
+        lower = self.min_interval
+
+        if self.consecutive_failures == 1:
+            # Most failures are transient blips: retry soon once, then back off
+            delay = lower = min(self.first_retry_delay, self.base_interval)
+        elif self.consecutive_failures:
+            steps = min(self.consecutive_failures - 1, self.max_backoff_steps)
+            delay = self.base_interval * 2**steps
+        elif volatile:
+            delay = self.base_interval / 3
+
+        if idle_seconds is not None and idle_seconds >= self.idle_threshold:
+            steps = min(
+                int(idle_seconds // self.idle_threshold), self.max_backoff_steps
+            )
+            delay *= 2**steps
+
+        upper = max(self.max_interval, self.base_interval)
+        return max(lower, min(upper, delay))
+
+    def schedule(self, now=None, volatile=False, idle_seconds=None):
+        """Compute and remember the next refresh time; returns the delay"""
+        now = time.time() if now is None else now
+        delay = self.next_delay(volatile=volatile, idle_seconds=idle_seconds)
+        self.last_delay = delay
+        self.next_refresh_at = now + delay
+        return delay
@@ -2,18 +2,27 @@
 Settings manager module for storing and retrieving widget settings.
 """
 
+import copy
 import json
 import os
+import threading
+import time
+
+from api.atomic_file import write_json_atomic
+
+# Bump when the layout of widget_settings.json changes and add a migration step
+SETTINGS_SCHEMA_VERSION = 1
 
 
 class SettingsManager:
     """Handle widget settings persistence"""
 
-    def __init__(self, settings_file="../config/widget_settings.json"):
+    def __init__(self, settings_file="../config/widget_settings.json", flush_delay=1.0):
         # Use config directory relative to core module
         current_dir = os.path.dirname(__file__)
         config_dir = os.path.join(os.path.dirname(current_dir), "config")
         os.makedirs(config_dir, exist_ok=True)
+        self.config_dir = config_dir
 
         if not os.path.isabs(settings_file):
             self.settings_file = os.path.join(
@@ -30,45 +39,185 @@ class SettingsManager:
             "theme": "dark",
         }
 
+        # In-memory settings store with write-behind persistence
+        self.flush_delay = flush_delay  # Seconds to coalesce updates before writing
+        self._settings = None  # Loaded from file on first access
+        self._dirty = False
+        self._lock = threading.RLock()
+        self._flush_timer = None
+        self._flush_deadline = 0.0  # time.monotonic() at which to write
+        self._file_signature = None  # (mtime_ns, inode, size) of the last read/write
+
     def load_settings(self):
+        """
+        Return a copy of the settings. The file is only read on first use;
+        afterwards settings are served from memory.
+        """
+        with self._lock:
+            if self._settings is None:
+                self._settings = self._read_settings_file()
+            return copy.deepcopy(self._settings)
+
+    def _get_file_signature(self):
+        """Cheap identity of the settings file on disk, or None if missing"""
+        try:
+            stat = os.stat(self.settings_file)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_ino, stat.st_size)
+
+    def _read_settings_file(self):
         """Load settings from file, return defaults if file doesn't exist"""
+        self._file_signature = self._get_file_signature()
+        if not self._file_signature or self._file_signature[2] == 0:
+            return self.default_settings.copy()
+
         try:
-            if os.path.exists(self.settings_file):
-                with open(self.settings_file, "r") as f:
-                    settings = json.load(f)
-                    # Merge with defaults to handle missing keys
-                    merged_settings = self.default_settings.copy()
-                    merged_settings.update(settings)
-                    print(f"Loaded settings: {merged_settings}")
-                    return merged_settings
-            else:
-                print("Settings file not found, using defaults")
-                return self.default_settings.copy()
-        except Exception as e:
+            with open(self.settings_file, "r") as f:
+                settings = json.load(f)
+            if not isinstance(settings, dict):
+                raise ValueError("settings file does not contain an object")
+        except OSError as e:
+            # Transient (e.g. a sharing violation while another instance writes):
+            # keep what we have and retry on the next reload_if_changed()
+            print(f"Error reading settings: {e}")
+            self._file_signature = None
+            if self._settings is not None:
+                return self._settings
+            return self.default_settings.copy()
+        except ValueError as e:
+            # Keep the unreadable file for inspection instead of overwriting it
             print(f"Error loading settings: {e}")
+            try:
+                os.replace(self.settings_file, f"{self.settings_file}.corrupt")
+            except OSError:
+                pass
             return self.default_settings.copy()
 
+        settings = self._migrate_settings(settings)
+
+        # Merge with defaults to handle missing keys
+        merged_settings = self.default_settings.copy()
+        merged_settings.update(settings)
+        return merged_settings
+
+    def _migrate_settings(self, settings):
+        """Upgrade settings written by older versions to the current schema"""
+        version = settings.pop("schema_version", 0)
+        if version > SETTINGS_SCHEMA_VERSION:
+            print(
+                f"Settings file uses schema version {version}, "
+                f"newer than supported version {SETTINGS_SCHEMA_VERSION}"
+            )
+        # Version 0 (unversioned) has the same keys as version 1
+        return settings
+
+    def _write_settings_file(self, settings):
+        """
+        Write settings atomically and durably: a crash leaves either the old
+        or the new file, never a truncated one.
+        """
+        data = {"schema_version": SETTINGS_SCHEMA_VERSION}
+        data.update(settings)
+        write_json_atomic(self.settings_file, data, fsync=True, indent=2)
+
+        self._file_signature = self._get_file_signature()
+
     def save_settings(self, settings):
-        """Save settings to file"""
-        try:
-            with open(self.settings_file, "w") as f:
-                json.dump(settings, f, indent=2)
-            print(f"Settings saved: {settings}")
-            return True
-        except Exception as e:
-            print(f"Error saving settings: {e}")
-            return False
+        """Replace all settings and write them to file immediately"""
+        with self._lock:
+            merged_settings = self.default_settings.copy()
+            merged_settings.update(copy.deepcopy(settings))
+            self._settings = merged_settings
+            self._dirty = True
+        return self.flush()
 
     def get_setting(self, key, default=None):
-        """Get a specific setting value"""
-        settings = self.load_settings()
-        return settings.get(key, default)
+        """Get a specific setting value (served from memory)"""
+        with self._lock:
+            if self._settings is None:
+                self._settings = self._read_settings_file()
+            return copy.deepcopy(self._settings.get(key, default))
 
     def update_setting(self, key, value):
-        """Update a specific setting"""
-        settings = self.load_settings()
-        settings[key] = value
-        return self.save_settings(settings)
+        """
+        Update a specific setting. The change is kept in memory and written
+        after flush_delay seconds, so bursts of updates cost a single write.
+        """
+        with self._lock:
+            if self._settings is None:
+                self._settings = self._read_settings_file()
+            if key in self._settings and self._settings[key] == value:
+                return True
+            self._settings[key] = copy.deepcopy(value)
+            self._dirty = True
+            self._schedule_flush()
+        return True
+
+    def _schedule_flush(self):
+        """
+        Push the write-behind deadline back (caller holds the lock).
+        One timer serves a whole burst of updates: it is only started when
+        none is pending and re-arms itself until the deadline has passed.
+        """
+        self._flush_deadline = time.monotonic() + self.flush_delay
+        if self._flush_timer is None:
+            self._start_flush_timer(self.flush_delay)
+
+    def _start_flush_timer(self, delay):
+        self._flush_timer = threading.Timer(delay, self._flush_when_due)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def _flush_when_due(self):
+        """Timer callback: write if the deadline has passed, else wait for it"""
+        with self._lock:
+            if self._flush_timer is not threading.current_thread():
+                return  # Cancelled by an explicit flush
+            remaining = self._flush_deadline - time.monotonic()
+            if remaining > 0:
+                self._start_flush_timer(remaining)
+                return
+        self.flush()
+
+    def flush(self):
+        """Write pending changes to file now; returns False if the write failed"""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._dirty:
+                return True
+
+            try:
+                self._write_settings_file(self._settings)
+                self._dirty = False
+                return True
+            except Exception as e:
+                print(f"Error saving settings: {e}")
+                return False
+
+    def reload_if_changed(self):
+        """
+        Re-read the settings file if another process changed it.
+        Only a stat() call when nothing changed; returns True after a reload.
+        Local changes that are not yet flushed take precedence.
+        """
+        signature = self._get_file_signature()
+        with self._lock:
+            if self._settings is None or signature == self._file_signature:
+                return False
+            if self._dirty:
+                return False
+            self._settings = self._read_settings_file()
+            # A file that exists but could not be read is retried next time
+            return self._file_signature is not None or signature is None
+
+    @property
+    def is_dirty(self):
+        """True when there are changes not yet written to file"""
+        with self._lock:
+            return self._dirty
 
     def reset_settings(self):
         """Reset all settings to defaults"""
@@ -0,0 +1,185 @@
+"""
+Weather history module.
+Keeps a fixed number of recent observations in a ring buffer stored in a
+memory-mapped binary file, so history survives restarts without ever growing.
+"""
+
+import mmap
+import os
+import struct
+import threading
+from collections import namedtuple
+
+# Header: magic, capacity, number of stored records, slot of the next write
+HEADER = struct.Struct("<4sIII")
+HEADER_MAGIC = b"HWH1"
+
+# One observation per record (little-endian, no padding)
+RECORD = struct.Struct("<dddffffhf")
+RECORD_FIELDS = (
+    "timestamp",
+    "lat",
+    "lon",
+    "temp",
+    "humidity",
+    "wind_speed",
+    "precipitation",
+    "weather_code",
+    "comfort",
+)
+
+HistoryRecord = namedtuple("HistoryRecord", RECORD_FIELDS)
+
+# One week of observations at the shortest refresh interval (2 minutes)
+DEFAULT_CAPACITY = 7 * 24 * 30
+
+
+class WeatherHistory:
+    """Fixed-size ring buffer of weather observations backed by an mmap'd file"""
+
+    def __init__(self, history_file, capacity=DEFAULT_CAPACITY):
+        self.history_file = history_file
+        self.capacity = capacity
+        self.size = HEADER.size + capacity * RECORD.size
+
+        self._lock = threading.Lock()
+        self._file = None
+        self._map = None
+        self._open()
+
+    def _open(self):
+        """Map the history file, starting a new one if it is missing or invalid"""
+        try:
+            self._file = open(self.history_file, "r+b")
+        except FileNotFoundError:
+            self._file = open(self.history_file, "w+b")
+
+        valid = False
+        if os.fstat(self._file.fileno()).st_size == self.size:
+            self._map = mmap.mmap(self._file.fileno(), self.size)
+            magic, capacity, count, next_index = HEADER.unpack_from(self._map, 0)
+            valid = (
+                magic == HEADER_MAGIC
+                and capacity == self.capacity
+                and count <= capacity
+                and next_index < capacity
+            )
+            if not valid:
+                self._map.close()
+
+        if not valid:
+            # Size is fixed up front; records are only ever overwritten in place
+            self._file.truncate(self.size)
+            self._map = mmap.mmap(self._file.fileno(), self.size)
+            self._count = 0
+            self._next_index = 0
+            self._write_header()
+        else:
+            self._count = count
+            self._next_index = next_index
+
+    def _write_header(self):
+        HEADER.pack_into(
+            self._map, 0, HEADER_MAGIC, self.capacity, self._count, self._next_index
+        )
+
+    def append(
+        self,
+        timestamp,
+        lat,
+        lon,
+        temp,
+        humidity,
+        wind_speed,
+        precipitation,
+        weather_code,
+        comfort,
+    ):
+        """Store one observation, overwriting the oldest once the buffer is full"""
+        with self._lock:
+            offset = HEADER.size + self._next_index * RECORD.size
+            RECORD.pack_into(
+                self._map,
+                offset,
+                timestamp,
+                lat,
+                lon,
+                temp,
+                humidity,
+                wind_speed,
+                precipitation,
+                weather_code,
+                comfort,
+            )
+            self._next_index = (self._next_index + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+            self._write_header()
+
+    def __len__(self):
+        return self._count
+
+    def _oldest_index(self):
+        return (self._next_index - self._count) % self.capacity
+
+    def segments(self):
+        """
+        Memoryviews over the stored records, oldest first: one view, or two
+        when the buffer has wrapped. No data is copied; release the views
+        before calling close().
+        """
+        with self._lock:
+            records = memoryview(self._map)[HEADER.size :]
+            start = self._oldest_index()
+            end = start + self._count
+            if end <= self.capacity:
+                return [records[start * RECORD.size : end * RECORD.size]]
+            return [
+                records[start * RECORD.size :],
+                records[: (end - self.capacity) * RECORD.size],
+            ]
+
+    def __iter__(self):
+        """Records from oldest to newest"""
+        for segment in self.segments():
+            for values in RECORD.iter_unpack(segment):
+                yield HistoryRecord(*values)
+            segment.release()
+
+    def latest(self):
+        """The most recent record, or None when empty"""
+        with self._lock:
+            if not self._count:
+                return None
+            index = (self._next_index - 1) % self.capacity
+            return HistoryRecord(
+                *RECORD.unpack_from(self._map, HEADER.size + index * RECORD.size)
+            )
+
+    def column(self, name):
+        """All values of one field, oldest first (e.g. for a chart)"""
+        position = RECORD_FIELDS.index(name)
+        return [values[position] for values in iter(self)]
+
+    def clear(self):
+        """Forget all records"""
+        with self._lock:
+            self._count = 0
+            self._next_index = 0
+            self._write_header()
+
+    def flush(self):
+        """Write dirty pages to disk"""
+        with self._lock:
+            if self._map is not None:
+                self._map.flush()
+
+    def close(self):
+        """Flush and unmap the history file"""
+        with self._lock:
+            if self._map is not None:
+                self._map.flush()
+                self._map.close()
+                self._map = None
+            if self._file is not None:
+                self._file.close()
+                self._file = None
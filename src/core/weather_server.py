@@ -0,0 +1,63 @@
+"""
+Weather server module.
+Serves the shared WeatherService as JSON on a local HTTP port so several
+widgets (or scripts) can use one fetch loop.
+"""
+
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+DEFAULT_HOST = "127.0.0.1"  # Local clients only
+DEFAULT_PORT = 8765
+
+
+class WeatherRequestHandler(BaseHTTPRequestHandler):
+    """GET /weather for conditions and comfort, GET /health for liveness"""
+
+    server_version = "HoodieWeatherWidget/1.0"
+
+    def do_GET(self):
+        path = urlsplit(self.path).path.rstrip("/")
+        if path in ("", "/weather"):
+            payload = self.server.weather_service.status()
+            status = 200 if payload.get("success") else 503
+        elif path == "/health":
+            payload = {"success": True}
+            status = 200
+        else:
+            payload = {"success": False, "error": "Not found"}
+            status = 404
+
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Clients poll often; keep the console quiet
+
+
+class WeatherServer(ThreadingHTTPServer):
+    """HTTP server bound to a WeatherService"""
+
+    daemon_threads = True
+
+    def __init__(self, weather_service, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        super().__init__((host, port), WeatherRequestHandler)
+        self.weather_service = weather_service
+
+
+def serve(weather_service, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Run the service's refresh loop and serve it until interrupted"""
+    server = WeatherServer(weather_service, host, port)
+    weather_service.start()
+    print(f"Serving weather on http://{host}:{server.server_port}/weather")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        weather_service.stop()
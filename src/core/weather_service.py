@@ -0,0 +1,315 @@
+"""
+Weather service module.
+One fetch/cache loop that resolves the location, keeps the latest snapshot and
+reports comfort; shared by the Tk widget and the headless daemon.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from api.last_known_weather import snapshot_to_json
+from api.weather_api import WeatherAPI
+from core.forecast_interpolator import ForecastInterpolator
+from core.hoodie_calculator import RECOMMENDATION_KEYS, HoodieComfortCalculator
+from core.refresh_scheduler import RefreshScheduler
+
+# Seconds between checks of the settings file, independent of the refresh delay
+# (the widget's settings watcher uses the same cadence)
+SETTINGS_POLL_INTERVAL = 5
+
+# IP geolocation is city-level: a result this close (degrees) counts as not moved
+SAME_LOCATION_TOLERANCE = 0.05
+
+
+def is_same_location(a, b, tolerance=SAME_LOCATION_TOLERANCE):
+    """True if two (lat, lon) pairs are within tolerance of each other"""
+    return abs(a[0] - b[0]) <= tolerance and abs(a[1] - b[1]) <= tolerance
+
+
+class WeatherService:
+    """Fetch, retain and score weather for the configured location"""
+
+    def __init__(
+        self,
+        weather_api=None,
+        hoodie_calculator=None,
+        forecast_interpolator=None,
+        refresh_scheduler=None,
+        settings_manager=None,
+    ):
+        self.weather_api = weather_api or WeatherAPI()
+        self.hoodie_calculator = hoodie_calculator or HoodieComfortCalculator()
+        self.forecast_interpolator = forecast_interpolator or ForecastInterpolator()
+        self.refresh_scheduler = refresh_scheduler or RefreshScheduler()
+        self.settings_manager = settings_manager  # Optional source of the location
+        self.settings_poll_interval = SETTINGS_POLL_INTERVAL
+
+        self.manual_location = None
+        self.snapshot = None
+        # Where auto-detection put us last time; its weather is fetched speculatively
+        self.last_auto_location = None
+        self._prefetch_pool = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()  # Cuts the loop's wait short
+        self._thread = None
+
+        if self.settings_manager is not None:
+            self.apply_settings(self.settings_manager.load_settings())
+
+    def apply_settings(self, settings):
+        """Take the location and update interval from a settings dict"""
+        self.manual_location = settings.get("manual_location")
+        self.refresh_scheduler.base_interval = settings.get("update_interval", 600)
+
+    def fetch(self, manual_location=None):
+        """
+        Resolve the location and fetch its weather (blocking network I/O).
+        Returns a WeatherSnapshot tagged with the location, or None on failure.
+        """
+        try:
+            # Check if manual location is set
+            if manual_location:
+                lat = manual_location["lat"]
+                lon = manual_location["lon"]
+                city = manual_location["query"]
+                full_location = manual_location["display_name"]
+
+                print(f"Using manual location: {full_location}")
+
+                # Get weather data for manual location
+                weather_result = self.weather_api.get_weather_data(lat, lon)
+                if weather_result.get("success"):
+                    return weather_result.with_location(
+                        city, full_location, lat, lon, is_manual=True
+                    )
+
+                print(
+                    f"Weather API error for manual location: {weather_result.get('error')}"
+                )
+                return None
+
+            # Auto-detect location, fetching the weather for the last detected
+            # location in parallel since the user has usually not moved
+            last_location = self.last_auto_location
+            speculative = None
+            if last_location is not None:
+                speculative = self._prefetch_executor().submit(
+                    self.weather_api.get_weather_data, *last_location
+                )
+
+            location_result = self.weather_api.get_location_from_ip()
+            if not location_result.get("success"):
+                print(f"Location detection failed: {location_result.get('error')}")
+                return None
+
+            lat = location_result["lat"]
+            lon = location_result["lon"]
+            city = location_result["city"]
+            region = location_result.get("region", "")
+            country = location_result.get("country", "")
+
+            # Create full location string
+            location_parts = [city]
+            if region and region != city:
+                location_parts.append(region)
+            if country:
+                location_parts.append(country)
+            full_location = ", ".join(location_parts)
+
+            # Get weather data, reusing the speculative fetch unless we moved
+            if speculative is not None and is_same_location(last_location, (lat, lon)):
+                weather_result = speculative.result()
+            else:
+                weather_result = self.weather_api.get_weather_data(lat, lon)
+            if weather_result.get("success"):
+                self.last_auto_location = (lat, lon)
+                return weather_result.with_location(
+                    city, full_location, lat, lon, is_manual=False
+                )
+
+            print(f"Weather API error: {weather_result.get('error')}")
+            return None
+
+        except Exception as e:
+            print(f"Error fetching location and weather: {e}")
+            return None
+
+    def _prefetch_executor(self):
+        """Worker for speculative weather fetches, created on first use"""
+        with self._lock:
+            if self._prefetch_pool is None:
+                self._prefetch_pool = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="weather-prefetch"
+                )
+            return self._prefetch_pool
+
+    def remember_location(self, snapshot):
+        """Seed the speculative fetch from a snapshot, e.g. the last run's weather"""
+        if snapshot.is_manual or snapshot.lat is None or snapshot.lon is None:
+            return
+        if self.last_auto_location is None:
+            self.last_auto_location = (snapshot.lat, snapshot.lon)
+
+    def interpolate(self, snapshot, now):
+        """
+        Conditions at `now` from the snapshot's retained hourly forecast, keeping
+        its location and observation time. None when the forecast does not
+        cover `now`.
+        """
+        current = self.forecast_interpolator.conditions_at(snapshot.hourly, now)
+        if current is None:
+            return None
+
+        return self.weather_api.parse_weather_data(
+            {"current": current, "hourly": snapshot.hourly}
+        ).replace(
+            city=snapshot.city,
+            full_location=snapshot.full_location,
+            coordinates=snapshot.coordinates,
+            is_manual=snapshot.is_manual,
+            lat=snapshot.lat,
+            lon=snapshot.lon,
+            # Age is measured from the last real observation, not the interpolation
+            observed_at=snapshot.observed_at,
+        )
+
+    def refresh(self):
+        """Fetch now and keep the result; returns the new snapshot or None"""
+        manual_location = self.manual_location
+        snapshot = self.fetch(manual_location)
+        with self._lock:
+            if snapshot is None:
+                self.refresh_scheduler.record_failure()
+            else:
+                self.refresh_scheduler.record_success()
+                # Not kept if the location changed while fetching
+                if self.manual_location == manual_location:
+                    self.snapshot = snapshot
+        return snapshot
+
+    def current(self, now=None):
+        """
+        The latest snapshot, interpolated to `now` when possible. Settings are
+        checked first so a snapshot for a location that was just changed is
+        never served (None until the new location has been fetched).
+        """
+        now = time.time() if now is None else now
+        self.check_settings()
+        with self._lock:
+            snapshot = self.snapshot
+        if snapshot is None:
+            return None
+        return self.interpolate(snapshot, now) or snapshot
+
+    def check_settings(self):
+        """
+        Apply settings changed on disk by the widget or another tool.
+        Returns True when the location changed (the old snapshot is dropped).
+        """
+        if self.settings_manager is None:
+            return False
+        if not self.settings_manager.reload_if_changed():
+            return False
+
+        manual_location = self.manual_location
+        self.apply_settings(self.settings_manager.load_settings())
+        if self.manual_location == manual_location:
+            return False
+        with self._lock:
+            self.snapshot = None  # Forecast is for the old location
+        self._wake.set()  # Fetch the new location now, even if noticed by a reader
+        return True
+
+    def tick(self, now=None):
+        """
+        One step of the refresh loop: reload settings, refetch if the retained
+        forecast can no longer be used, and return the delay until the next step.
+        """
+        now = time.time() if now is None else now
+        self.check_settings()
+
+        with self._lock:
+            snapshot = self.snapshot
+        hourly = snapshot.hourly if snapshot else None
+        observed_at = snapshot.observed_at if snapshot else None
+
+        if self.forecast_interpolator.needs_refresh(hourly, observed_at, now):
+            snapshot = self.refresh()
+            hourly = snapshot.hourly if snapshot else None
+
+        volatile = self.forecast_interpolator.is_volatile(hourly, now)
+        return self.refresh_scheduler.schedule(now, volatile=volatile)
+
+    def status(self, now=None):
+        """Current conditions, comfort and recommendation as a JSON-ready dict"""
+        now = time.time() if now is None else now
+        snapshot = self.current(now)
+        upstream = self.weather_api.get_upstream_status()
+        if snapshot is None:
+            return {
+                "success": False,
+                "error": "No weather data yet",
+                "upstream": upstream,
+            }
+
+        score, recommendation = self.hoodie_calculator.calculate_comfort_level(snapshot)
+        timeline = self.hoodie_calculator.calculate_hoodie_timeline(
+            snapshot.hourly, now
+        )
+        if timeline is not None:
+            timeline = {
+                "times": timeline["times"],
+                "recommendations": [RECOMMENDATION_KEYS[c] for c in timeline["codes"]],
+                "best_hours": timeline["best_hours"],
+                "take_off_at": timeline["take_off_at"],
+                "put_on_at": timeline["put_on_at"],
+            }
+
+        return {
+            "success": True,
+            "weather": snapshot_to_json(snapshot),
+            "comfort": {
+                "score": score,
+                "recommendation": recommendation,
+                "category": self.hoodie_calculator.get_comfort_category(score),
+            },
+            "timeline": timeline,
+            "next_refresh_at": self.refresh_scheduler.next_refresh_at,
+            "upstream": upstream,
+        }
+
+    def start(self):
+        """Run the refresh loop on a background thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._wake.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        # Wake up every settings_poll_interval so a location change is picked
+        # up in seconds even when the next refresh is an hour away
+        due = time.monotonic() + self.tick()
+        while True:
+            wait = min(self.settings_poll_interval, max(0.0, due - time.monotonic()))
+            self._wake.wait(wait)
+            if self._stop.is_set():
+                return
+            self.check_settings()
+            if self._wake.is_set() or time.monotonic() >= due:
+                self._wake.clear()
+                due = time.monotonic() + self.tick()
+
+    def stop(self):
+        """Stop the refresh loop"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self._prefetch_pool is not None:
+            self._prefetch_pool.shutdown(wait=False)
+            self._prefetch_pool = None
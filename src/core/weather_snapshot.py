@@ -0,0 +1,159 @@
+"""
+Weather snapshot module.
+A compact, immutable record of one weather observation that can still be read
+like the nested weather dicts used throughout the widget.
+"""
+
+from collections.abc import Mapping
+
+# Location fields filled in by the widget once it knows where the data is for
+LOCATION_FIELDS = ("city", "full_location", "coordinates", "is_manual")
+
+# Fields exposed under their own name in the dict layout when not None
+OPTIONAL_FIELDS = ("observed_at", "hourly") + LOCATION_FIELDS
+
+
+class WeatherSnapshot(Mapping):
+    """
+    Immutable weather observation with flat attributes (snapshot.temp).
+    Also a read-only Mapping exposing the legacy dict layout
+    (snapshot["main"]["temp"], snapshot.get("rain"), ...).
+    """
+
+    __slots__ = (
+        "temp",
+        "humidity",
+        "wind_speed",
+        "condition",
+        "description",
+        "rain",
+        "snow",
+        "weather_code",
+        "observed_at",
+        "hourly",
+        "is_demo",
+        "city",
+        "full_location",
+        "coordinates",
+        "is_manual",
+        "lat",
+        "lon",
+    )
+
+    def __init__(
+        self,
+        temp,
+        humidity,
+        wind_speed,
+        condition,
+        description,
+        rain=0,
+        snow=0,
+        weather_code=None,
+        observed_at=None,
+        hourly=None,
+        is_demo=False,
+        city=None,
+        full_location=None,
+        coordinates=None,
+        is_manual=None,
+        lat=None,
+        lon=None,
+    ):
+        values = locals()
+        for name in self.__slots__:
+            object.__setattr__(self, name, values[name])
+
+    def __setattr__(self, name, value):
+        raise AttributeError("WeatherSnapshot is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("WeatherSnapshot is immutable")
+
+    def __reduce__(self):
+        return (self.__class__, tuple(getattr(self, name) for name in self.__slots__))
+
+    def replace(self, **changes):
+        """Return a copy with some fields changed"""
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values.update(changes)
+        return self.__class__(**values)
+
+    def with_location(self, city, full_location, lat, lon, is_manual):
+        """Return a copy tagged with where the observation is for"""
+        return self.replace(
+            city=city,
+            full_location=full_location,
+            coordinates=f"{lat:.3f}, {lon:.3f}",
+            is_manual=is_manual,
+            lat=lat,
+            lon=lon,
+        )
+
+    @classmethod
+    def from_dict(cls, weather_data):
+        """Build a snapshot from a legacy nested weather dict"""
+        weather = weather_data["weather"][0]
+        rain = weather_data.get("rain") or {}
+        snow = weather_data.get("snow") or {}
+        location = {name: weather_data.get(name) for name in LOCATION_FIELDS}
+        return cls(
+            temp=weather_data["main"]["temp"],
+            humidity=weather_data["main"]["humidity"],
+            wind_speed=weather_data["wind"]["speed"],
+            condition=weather["main"],
+            description=weather["description"],
+            rain=next(iter(rain.values()), 0),
+            snow=next(iter(snow.values()), 0),
+            observed_at=weather_data.get("observed_at"),
+            hourly=weather_data.get("hourly"),
+            is_demo=weather_data.get("is_demo", False),
+            **location,
+        )
+
+    # Mapping adapter: the legacy keys, built on demand
+
+    def _keys(self):
+        yield from ("main", "wind", "weather", "success")
+        if self.rain:
+            yield "rain"
+        if self.snow:
+            yield "snow"
+        if self.is_demo:
+            yield "is_demo"
+        for name in OPTIONAL_FIELDS:
+            if getattr(self, name) is not None:
+                yield name
+
+    def __getitem__(self, key):
+        if key == "main":
+            return {"temp": self.temp, "humidity": self.humidity}
+        if key == "wind":
+            return {"speed": self.wind_speed}
+        if key == "weather":
+            return [{"main": self.condition, "description": self.description}]
+        if key == "success":
+            return True
+        if key in ("rain", "snow"):
+            amount = getattr(self, key)
+            if amount:
+                return {"1h": amount}
+        elif key == "is_demo":
+            if self.is_demo:
+                return True
+        elif key in OPTIONAL_FIELDS and getattr(self, key) is not None:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return self._keys()
+
+    def __len__(self):
+        return sum(1 for _ in self._keys())
+
+    def __repr__(self):
+        return (
+            f"WeatherSnapshot(temp={self.temp}, humidity={self.humidity}, "
+            f"wind_speed={self.wind_speed}, description={self.description!r}, "
+            f"location={self.full_location!r})"
+        )
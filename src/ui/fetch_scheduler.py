@@ -0,0 +1,72 @@
+"""
+Fetch scheduler module for running network operations off the Tk main thread.
+"""
+
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+
+class FetchScheduler:
+    """Run blocking calls on a worker pool and deliver results on the Tk thread"""
+
+    def __init__(self, root, max_workers=2, poll_interval=100):
+        self.root = root
+        self.poll_interval = poll_interval  # milliseconds
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="weather-fetch"
+        )
+        # Finished futures waiting for their callbacks to run on the Tk thread
+        self._completed = queue.Queue()
+        self._poll_job = None
+        self._running = True
+
+        self._poll_completed()
+
+    def submit(self, func, *args, on_success=None, on_error=None, **kwargs):
+        """
+        Run func(*args, **kwargs) on a worker thread.
+        on_success(result) or on_error(exception) is called later on the Tk thread.
+        """
+        future = self._executor.submit(func, *args, **kwargs)
+        future.add_done_callback(
+            lambda done: self._completed.put((done, on_success, on_error))
+        )
+        return future
+
+    def _poll_completed(self):
+        """Drain finished fetches and run their callbacks (Tk thread only)"""
+        while True:
+            try:
+                future, on_success, on_error = self._completed.get_nowait()
+            except queue.Empty:
+                break
+
+            if future.cancelled():
+                continue
+
+            try:
+                error = future.exception()
+                if error is not None:
+                    if on_error:
+                        on_error(error)
+                    else:
+                        print(f"Background fetch failed: {error}")
+                elif on_success:
+                    on_success(future.result())
+            except Exception as e:
+                print(f"Error in fetch callback: {e}")
+
+        if self._running:
+            self._poll_job = self.root.after(self.poll_interval, self._poll_completed)
+
+    def shutdown(self):
+        """Stop polling and release the worker threads"""
+        self._running = False
+        if self._poll_job is not None:
+            try:
+                self.root.after_cancel(self._poll_job)
+            except Exception:
+                pass
+            self._poll_job = None
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,111 @@
+"""
+Render model module.
+Turns a weather snapshot into the values shown by the widget and works out
+which of them changed since the last render.
+"""
+
+import time
+from datetime import datetime
+
+
+def format_age(minutes):
+    """Short human-readable age, e.g. 5 min or 2 h 05 min"""
+    if minutes < 60:
+        return f"{minutes} min"
+    return f"{minutes // 60} h {minutes % 60:02d} min"
+
+
+def format_upstream_status(upstream):
+    """One line per upstream host that is not healthy, or an all-clear line"""
+    lines = []
+    for host, status in sorted(upstream.items()):
+        if status["state"] == "open":
+            lines.append(f"⚠ {host}: down, retry in {status['retry_in']}s")
+        elif status["state"] == "half_open":
+            lines.append(f"⚠ {host}: recovering")
+    return "\n".join(lines) or "Services: all OK"
+
+
+def build_render_model(
+    snapshot,
+    comfort_level,
+    recommendation,
+    timeline_text="",
+    next_refresh_at=None,
+    stale=False,
+    now=None,
+):
+    """
+    Compute every displayed value once.
+    Returns a dict of display field -> value; "comfort" is the progress bar
+    level, everything else is label text. When stale, the footer shows the age
+    of the data instead of the update time.
+    """
+    now = time.time() if now is None else now
+
+    # Update location
+    full_location = snapshot.full_location or "Unknown"
+    coordinates = snapshot.coordinates or ""
+    is_manual = bool(snapshot.is_manual)
+
+    location_prefix = "📌" if is_manual else "📍"  # Different icon for manual
+    location_text = f"{location_prefix} {full_location}"
+    if is_manual:
+        location_text += " (Manual)"
+
+    # Check for precipitation
+    rain_text = ""
+    if snapshot.rain:
+        rain_text = f" | Rain: {snapshot.rain}mm"
+    elif snapshot.snow:
+        rain_text = f" | Snow: {snapshot.snow}mm"
+
+    details_text = (
+        f"{snapshot.description.title()}\nHumidity: {snapshot.humidity}% | "
+        f"Wind: {snapshot.wind_speed} m/s{rain_text}"
+    )
+
+    # Timestamp with coordinates info
+    if stale:
+        update_text = "Offline"
+        if snapshot.observed_at:
+            age_minutes = max(0, int((now - snapshot.observed_at) // 60))
+            update_text += f" | Data {format_age(age_minutes)} old"
+    else:
+        update_text = f"Updated: {datetime.fromtimestamp(now).strftime('%H:%M')}"
+    if next_refresh_at:
+        next_time = datetime.fromtimestamp(next_refresh_at).strftime("%H:%M")
+        update_text += f" | Next: {next_time}"
+    if coordinates and coordinates != "0.000, 0.000":
+        update_text += f" | {coordinates}"
+
+    return {
+        "location": location_text,
+        "temperature": f"{snapshot.temp:.1f}°C",
+        "details": details_text,
+        "comfort": comfort_level,
+        "recommendation": recommendation,
+        "timeline": timeline_text,
+        "updated": update_text,
+    }
+
+
+class RenderState:
+    """Remember the last rendered model and report what changed"""
+
+    def __init__(self):
+        self.rendered = {}
+
+    def diff(self, model):
+        """Return the fields of model that differ from the last render"""
+        changes = {
+            name: value
+            for name, value in model.items()
+            if name not in self.rendered or self.rendered[name] != value
+        }
+        self.rendered.update(changes)
+        return changes
+
+    def reset(self):
+        """Forget the last render so everything is redrawn next time"""
+        self.rendered = {}
@@ -0,0 +1,329 @@
+"""
+Settings dialog module.
+Builds the widget's settings dialogs; imported on first use so they stay off
+the widget's startup path.
+"""
+
+import tkinter as tk
+
+from ui.ui_components import UIComponents
+
+
+def create_enhanced_settings_popup(parent, weather_widget):
+    """Create a beautiful settings popup with modern styling"""
+    popup = UIComponents.create_modern_popup(parent, "⚙ Widget Settings", "500x400")
+
+    # Main container with padding
+    main_frame = UIComponents.create_styled_frame(popup, bg="bg_secondary")
+    main_frame.pack(fill="both", expand=True, padx=25, pady=25)
+
+    # Header with icon and title
+    header_frame = UIComponents.create_styled_frame(main_frame, bg="bg_secondary")
+    header_frame.pack(fill="x", pady=(0, 20))
+
+    title = UIComponents.create_styled_label(
+        header_frame,
+        text="🧥 Hoodie Weather Settings",
+        font="title",
+        color="text_primary",
+        bg="bg_secondary",
+    )
+    title.pack()
+
+    subtitle = UIComponents.create_styled_label(
+        header_frame,
+        text="Configure your weather widget preferences",
+        font="small",
+        color="text_secondary",
+        bg="bg_secondary",
+    )
+    subtitle.pack(pady=(5, 0))
+
+    # Location Settings Section with modern card-like appearance
+    location_frame = UIComponents.create_styled_frame(main_frame, bg="bg_primary")
+    location_frame.pack(fill="x", pady=(0, 15))
+    location_frame.configure(relief="solid", bd=1)
+
+    # Section header
+    section_header = UIComponents.create_styled_frame(location_frame, bg="bg_primary")
+    section_header.pack(fill="x", padx=15, pady=(15, 10))
+
+    location_title = UIComponents.create_styled_label(
+        section_header,
+        text="📍 Location Settings",
+        font="normal",
+        color="accent_blue",
+        bg="bg_primary",
+    )
+    location_title.pack(anchor="w")
+
+    # Radio buttons for location mode
+    radio_frame = UIComponents.create_styled_frame(location_frame, bg="bg_primary")
+    radio_frame.pack(fill="x", padx=15, pady=(5, 10))
+
+    location_var = tk.StringVar(value="auto")
+
+    auto_radio = tk.Radiobutton(
+        radio_frame,
+        text="🌐 Auto-detect location (IP-based)",
+        variable=location_var,
+        value="auto",
+        bg=UIComponents.COLORS["bg_primary"],
+        fg=UIComponents.COLORS["text_primary"],
+        selectcolor=UIComponents.COLORS["bg_secondary"],
+        activebackground=UIComponents.COLORS["bg_primary"],
+        activeforeground=UIComponents.COLORS["text_primary"],
+        font=UIComponents.FONTS["small"],
+    )
+    auto_radio.pack(anchor="w", pady=2)
+
+    manual_radio = tk.Radiobutton(
+        radio_frame,
+        text="📌 Set location manually",
+        variable=location_var,
+        value="manual",
+        bg=UIComponents.COLORS["bg_primary"],
+        fg=UIComponents.COLORS["text_primary"],
+        selectcolor=UIComponents.COLORS["bg_secondary"],
+        activebackground=UIComponents.COLORS["bg_primary"],
+        activeforeground=UIComponents.COLORS["text_primary"],
+        font=UIComponents.FONTS["small"],
+    )
+    manual_radio.pack(anchor="w", pady=2)
+
+    # Manual location entry
+    entry_frame = UIComponents.create_styled_frame(location_frame, bg="bg_primary")
+    entry_frame.pack(fill="x", padx=15, pady=(5, 15))
+
+    UIComponents.create_styled_label(
+        entry_frame,
+        text="Location (e.g., London, UK):",
+        font="small",
+        color="text_secondary",
+        bg="bg_primary",
+    ).pack(anchor="w", pady=(0, 5))
+
+    location_entry = UIComponents.create_styled_entry(entry_frame)
+    location_entry.pack(fill="x", pady=(0, 10))
+
+    # Test button
+    test_btn = UIComponents.create_styled_button(
+        entry_frame, text="🌍 Test Location", color="accent_orange", style="modern"
+    )
+    test_btn.pack(anchor="w")
+
+    # Current location info section
+    info_frame = UIComponents.create_styled_frame(main_frame, bg="bg_primary")
+    info_frame.pack(fill="x", pady=(0, 20))
+    info_frame.configure(relief="solid", bd=1)
+
+    info_header = UIComponents.create_styled_label(
+        info_frame,
+        text="ℹ Current Location Info",
+        font="normal",
+        color="accent_green",
+        bg="bg_primary",
+    )
+    info_header.pack(padx=15, pady=(15, 5), anchor="w")
+
+    # Get current location info from weather widget
+    current_location = getattr(weather_widget, "weather_data", {}).get(
+        "full_location", "Unknown"
+    )
+    current_coords = getattr(weather_widget, "weather_data", {}).get(
+        "coordinates", "Unknown"
+    )
+
+    current_info_label = UIComponents.create_styled_label(
+        info_frame,
+        text=f"Location: {current_location}\nCoordinates: {current_coords}",
+        font="small",
+        color="text_secondary",
+        bg="bg_primary",
+        justify="left",
+    )
+    current_info_label.pack(padx=15, pady=(0, 15), anchor="w")
+
+    # Bottom buttons with improved spacing
+    button_frame = UIComponents.create_styled_frame(main_frame, bg="bg_secondary")
+    button_frame.pack(fill="x", pady=(10, 0))
+
+    # Left side buttons
+    left_buttons = UIComponents.create_styled_frame(button_frame, bg="bg_secondary")
+    left_buttons.pack(side="left")
+
+    save_btn = UIComponents.create_styled_button(
+        left_buttons, text="💾 Save Settings", color="accent_green", style="modern"
+    )
+    save_btn.pack(side="left", padx=(0, 10))
+
+    # Right side buttons
+    right_buttons = UIComponents.create_styled_frame(button_frame, bg="bg_secondary")
+    right_buttons.pack(side="right")
+
+    reset_btn = UIComponents.create_styled_button(
+        right_buttons, text="🔄 Reset", color="accent_orange", style="modern"
+    )
+    reset_btn.pack(side="right", padx=(10, 0))
+
+    cancel_btn = UIComponents.create_styled_button(
+        right_buttons,
+        text="❌ Cancel",
+        command=popup.destroy,
+        color="text_muted",
+        style="modern",
+    )
+    cancel_btn.pack(side="right")
+
+    return popup, location_var, location_entry
+
+
+def open_settings_dialog(widget):
+    """Open the location settings window for a WeatherWidget"""
+    settings_window = UIComponents.create_popup_window(
+        widget.root, "Weather Widget Settings", "400x800"
+    )
+
+    # Position near the widget
+    x = widget.root.winfo_x() - 100
+    y = widget.root.winfo_y() + 50
+    settings_window.geometry(f"400x500+{x}+{y}")
+
+    # Title
+    UIComponents.create_styled_label(
+        settings_window, text="⚙ Settings", font="title", bg="bg_secondary"
+    ).pack(pady=10)
+
+    # Location section
+    location_frame = UIComponents.create_styled_frame(
+        settings_window, bg="bg_secondary"
+    )
+    location_frame.pack(fill="x", padx=20, pady=10)
+
+    UIComponents.create_styled_label(
+        location_frame,
+        text="📍 Location Settings",
+        font="normal",
+        color="accent_blue",
+        bg="bg_secondary",
+    ).pack(anchor="w")
+
+    # Auto-detect vs Manual radio buttons
+    widget.location_mode = tk.StringVar()
+    widget.location_mode.set("auto" if not widget.manual_location else "manual")
+
+    auto_radio = tk.Radiobutton(
+        location_frame,
+        text="Auto-detect location (IP-based)",
+        variable=widget.location_mode,
+        value="auto",
+        bg=UIComponents.COLORS["bg_secondary"],
+        fg="white",
+        selectcolor=UIComponents.COLORS["bg_primary"],
+        command=widget.on_location_mode_change,
+    )
+    auto_radio.pack(anchor="w", pady=5)
+
+    manual_radio = tk.Radiobutton(
+        location_frame,
+        text="Manual location",
+        variable=widget.location_mode,
+        value="manual",
+        bg=UIComponents.COLORS["bg_secondary"],
+        fg="white",
+        selectcolor=UIComponents.COLORS["bg_primary"],
+        command=widget.on_location_mode_change,
+    )
+    manual_radio.pack(anchor="w", pady=5)
+
+    # Manual location input frame
+    widget.manual_frame = UIComponents.create_styled_frame(
+        location_frame, bg="bg_secondary"
+    )
+    widget.manual_frame.pack(fill="x", pady=10)
+
+    UIComponents.create_styled_label(
+        widget.manual_frame,
+        text="City, Country (e.g., London, UK):",
+        font="small",
+        color="text_secondary",
+        bg="bg_secondary",
+    ).pack(anchor="w")
+
+    widget.location_entry = UIComponents.create_styled_entry(
+        widget.manual_frame, width=30
+    )
+    widget.location_entry.pack(anchor="w", pady=5)
+
+    # Pre-fill with current manual location if set
+    if widget.manual_location:
+        widget.location_entry.insert(0, widget.manual_location.get("query", ""))
+
+    # Test location button
+    test_btn = UIComponents.create_styled_button(
+        widget.manual_frame,
+        text="Test Location",
+        command=widget.test_manual_location,
+        color="accent_orange",
+    )
+    test_btn.pack(anchor="w", pady=5)
+
+    # Current location info
+    info_frame = UIComponents.create_styled_frame(settings_window, bg="bg_secondary")
+    info_frame.pack(fill="x", padx=20, pady=10)
+
+    UIComponents.create_styled_label(
+        info_frame,
+        text="ℹ Current Location Info",
+        font="normal",
+        color="accent_blue",
+        bg="bg_secondary",
+    ).pack(anchor="w")
+
+    current_location = widget.weather_data.get("full_location", "Unknown")
+    current_coords = widget.weather_data.get("coordinates", "Unknown")
+
+    widget.current_info_label = UIComponents.create_styled_label(
+        info_frame,
+        text=f"Location: {current_location}\nCoordinates: {current_coords}",
+        font="small",
+        color="text_secondary",
+        bg="bg_secondary",
+        justify="left",
+        wraplength=250,
+    )
+    widget.current_info_label.pack(anchor="w", pady=5)
+
+    # Buttons frame
+    buttons_frame = UIComponents.create_styled_frame(settings_window, bg="bg_secondary")
+    buttons_frame.pack(fill="x", padx=20, pady=20)
+
+    # Save button
+    UIComponents.create_styled_button(
+        buttons_frame,
+        text="Save Settings",
+        command=lambda: widget.save_settings_and_refresh(settings_window),
+        color="accent_green",
+        font="normal",
+    ).pack(side="left", padx=5)
+
+    # Cancel button
+    UIComponents.create_styled_button(
+        buttons_frame,
+        text="Cancel",
+        command=settings_window.destroy,
+        color="text_muted",
+        font="normal",
+    ).pack(side="left", padx=5)
+
+    # Reset button
+    UIComponents.create_styled_button(
+        buttons_frame,
+        text="Reset to Auto",
+        command=lambda: widget.reset_to_auto(settings_window),
+        color="accent_red",
+        font="normal",
+    ).pack(side="right", padx=5)
+
+    # Update manual frame visibility
+    widget.on_location_mode_change()
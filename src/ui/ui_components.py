@@ -3,25 +3,24 @@ UI components module for the weather widget.
 Contains reusable UI components and styling functions with enhanced modern styling.
 """
 
+import importlib.util
 import tkinter as tk
 from tkinter import ttk
 
-# Try to import modern styling libraries
-try:
-    import ttkbootstrap as ttk_bs
-    from ttkbootstrap.constants import *
-
-    TTKBOOTSTRAP_AVAILABLE = True
-except ImportError:
-    TTKBOOTSTRAP_AVAILABLE = False
+# Modern styling libraries are optional. Only check that they are installed
+# here; ttkbootstrap is imported the first time a styled control needs it.
+TTKBOOTSTRAP_AVAILABLE = importlib.util.find_spec("ttkbootstrap") is not None
+if not TTKBOOTSTRAP_AVAILABLE:
     print("ttkbootstrap not available. Using standard tkinter styling.")
 
-try:
-    import customtkinter as ctk
+CUSTOMTKINTER_AVAILABLE = importlib.util.find_spec("customtkinter") is not None
+
+
+def load_ttkbootstrap():
+    """Import ttkbootstrap on first use"""
+    import ttkbootstrap
 
-    CUSTOMTKINTER_AVAILABLE = True
-except ImportError:
-    CUSTOMTKINTER_AVAILABLE = False
+    return ttkbootstrap
 
 
 class UIComponents:
@@ -85,7 +84,7 @@ class UIComponents:
                 "text_muted": "secondary",
             }
 
-            button = ttk_bs.Button(
+            button = load_ttkbootstrap().Button(
                 parent,
                 text=text,
                 command=command,
@@ -165,7 +164,7 @@ class UIComponents:
     def create_styled_entry(cls, parent, font="normal", **kwargs):
         """Create a styled entry field with modern appearance"""
         if TTKBOOTSTRAP_AVAILABLE:
-            return ttk_bs.Entry(
+            return load_ttkbootstrap().Entry(
                 parent,
                 font=cls.FONTS.get(font, cls.FONTS["normal"]),
                 bootstyle="primary",
@@ -213,16 +212,48 @@ class UIComponents:
 
     @classmethod
     def draw_progress_bar(cls, canvas, level):
-        """Draw a three-section progress bar on the given canvas"""
-        canvas.delete("all")
+        """
+        Draw a three-section progress bar on the given canvas.
+        The bar is created once per canvas size; later calls only move the
+        indicator. Resizes are picked up through <Configure>.
+        """
+        canvas.progress_level = level
+        if not getattr(canvas, "progress_bound", False):
+            # Also covers the first layout, so an unmapped canvas needs no polling
+            canvas.bind(
+                "<Configure>", lambda event: cls._render_progress_bar(canvas), add="+"
+            )
+            canvas.progress_bound = True
+
+        cls._render_progress_bar(canvas)
 
+    @classmethod
+    def _render_progress_bar(cls, canvas):
+        """Rebuild the static items if the size changed, then place the indicator"""
         canvas_width = canvas.winfo_width()
         if canvas_width <= 1:
-            # Canvas not ready, try again later
-            canvas.after(100, lambda: cls.draw_progress_bar(canvas, level))
-            return
+            return  # Canvas not laid out yet; <Configure> will draw it
 
         canvas_height = canvas.winfo_height() or 20
+        size = (canvas_width, canvas_height)
+        if getattr(canvas, "progress_size", None) != size:
+            cls._draw_progress_statics(canvas, canvas_width, canvas_height)
+            canvas.progress_size = size
+
+        indicator_x = canvas.progress_level * canvas_width
+        canvas.coords(
+            "progress_indicator",
+            indicator_x - 6,
+            2,
+            indicator_x + 6,
+            canvas_height - 2,
+        )
+        canvas.coords("progress_highlight", indicator_x - 3, 5, indicator_x + 1, 9)
+
+    @classmethod
+    def _draw_progress_statics(cls, canvas, canvas_width, canvas_height):
+        """Create the background, sections, separators and indicator items"""
+        canvas.delete("all")
 
         # Draw progress bar background
         canvas.create_rectangle(
@@ -267,23 +298,21 @@ class UIComponents:
                     x2, 1, x2, canvas_height - 1, fill=cls.COLORS["bg_primary"], width=1
                 )
 
-        # Draw the indicator
-        indicator_x = level * canvas_width
-
-        # Main indicator circle
+        # Main indicator circle (positioned by _render_progress_bar)
         canvas.create_oval(
-            indicator_x - 6,
-            2,
-            indicator_x + 6,
-            canvas_height - 2,
+            0,
+            0,
+            0,
+            0,
             fill=cls.COLORS["text_primary"],
             outline=cls.COLORS["bg_primary"],
             width=2,
+            tags="progress_indicator",
         )
 
         # Indicator highlight
         canvas.create_oval(
-            indicator_x - 3, 5, indicator_x + 1, 9, fill="#ffffff", outline=""
+            0, 0, 0, 0, fill="#ffffff", outline="", tags="progress_highlight"
         )
 
     @classmethod
@@ -330,7 +359,7 @@ class UIComponents:
     def create_modern_popup(cls, parent, title="Settings", size="900x300"):
         """Create a modern styled popup window with enhanced appearance"""
         if TTKBOOTSTRAP_AVAILABLE:
-            popup = ttk_bs.Toplevel(parent)
+            popup = load_ttkbootstrap().Toplevel(parent)
         else:
             popup = tk.Toplevel(parent)
 
@@ -365,170 +394,9 @@ class UIComponents:
     @classmethod
     def create_enhanced_settings_popup(cls, parent, weather_widget):
         """Create a beautiful settings popup with modern styling"""
-        popup = cls.create_modern_popup(parent, "⚙ Widget Settings", "500x400")
-
-        # Main container with padding
-        main_frame = cls.create_styled_frame(popup, bg="bg_secondary")
-        main_frame.pack(fill="both", expand=True, padx=25, pady=25)
-
-        # Header with icon and title
-        header_frame = cls.create_styled_frame(main_frame, bg="bg_secondary")
-        header_frame.pack(fill="x", pady=(0, 20))
-
-        title = cls.create_styled_label(
-            header_frame,
-            text="🧥 Hoodie Weather Settings",
-            font="title",
-            color="text_primary",
-            bg="bg_secondary",
-        )
-        title.pack()
-
-        subtitle = cls.create_styled_label(
-            header_frame,
-            text="Configure your weather widget preferences",
-            font="small",
-            color="text_secondary",
-            bg="bg_secondary",
-        )
-        subtitle.pack(pady=(5, 0))
-
-        # Location Settings Section with modern card-like appearance
-        location_frame = cls.create_styled_frame(main_frame, bg="bg_primary")
-        location_frame.pack(fill="x", pady=(0, 15))
-        location_frame.configure(relief="solid", bd=1)
-
-        # Section header
-        section_header = cls.create_styled_frame(location_frame, bg="bg_primary")
-        section_header.pack(fill="x", padx=15, pady=(15, 10))
-
-        location_title = cls.create_styled_label(
-            section_header,
-            text="📍 Location Settings",
-            font="normal",
-            color="accent_blue",
-            bg="bg_primary",
-        )
-        location_title.pack(anchor="w")
-
-        # Radio buttons for location mode
-        radio_frame = cls.create_styled_frame(location_frame, bg="bg_primary")
-        radio_frame.pack(fill="x", padx=15, pady=(5, 10))
-
-        location_var = tk.StringVar(value="auto")
-
-        auto_radio = tk.Radiobutton(
-            radio_frame,
-            text="🌐 Auto-detect location (IP-based)",
-            variable=location_var,
-            value="auto",
-            bg=cls.COLORS["bg_primary"],
-            fg=cls.COLORS["text_primary"],
-            selectcolor=cls.COLORS["bg_secondary"],
-            activebackground=cls.COLORS["bg_primary"],
-            activeforeground=cls.COLORS["text_primary"],
-            font=cls.FONTS["small"],
-        )
-        auto_radio.pack(anchor="w", pady=2)
-
-        manual_radio = tk.Radiobutton(
-            radio_frame,
-            text="📌 Set location manually",
-            variable=location_var,
-            value="manual",
-            bg=cls.COLORS["bg_primary"],
-            fg=cls.COLORS["text_primary"],
-            selectcolor=cls.COLORS["bg_secondary"],
-            activebackground=cls.COLORS["bg_primary"],
-            activeforeground=cls.COLORS["text_primary"],
-            font=cls.FONTS["small"],
-        )
-        manual_radio.pack(anchor="w", pady=2)
-
-        # Manual location entry
-        entry_frame = cls.create_styled_frame(location_frame, bg="bg_primary")
-        entry_frame.pack(fill="x", padx=15, pady=(5, 15))
-
-        cls.create_styled_label(
-            entry_frame,
-            text="Location (e.g., London, UK):",
-            font="small",
-            color="text_secondary",
-            bg="bg_primary",
-        ).pack(anchor="w", pady=(0, 5))
-
-        location_entry = cls.create_styled_entry(entry_frame)
-        location_entry.pack(fill="x", pady=(0, 10))
-
-        # Test button
-        test_btn = cls.create_styled_button(
-            entry_frame, text="🌍 Test Location", color="accent_orange", style="modern"
-        )
-        test_btn.pack(anchor="w")
-
-        # Current location info section
-        info_frame = cls.create_styled_frame(main_frame, bg="bg_primary")
-        info_frame.pack(fill="x", pady=(0, 20))
-        info_frame.configure(relief="solid", bd=1)
-
-        info_header = cls.create_styled_label(
-            info_frame,
-            text="ℹ Current Location Info",
-            font="normal",
-            color="accent_green",
-            bg="bg_primary",
-        )
-        info_header.pack(padx=15, pady=(15, 5), anchor="w")
-
-        # Get current location info from weather widget
-        current_location = getattr(weather_widget, "weather_data", {}).get(
-            "full_location", "Unknown"
-        )
-        current_coords = getattr(weather_widget, "weather_data", {}).get(
-            "coordinates", "Unknown"
-        )
-
-        current_info_label = cls.create_styled_label(
-            info_frame,
-            text=f"Location: {current_location}\nCoordinates: {current_coords}",
-            font="small",
-            color="text_secondary",
-            bg="bg_primary",
-            justify="left",
-        )
-        current_info_label.pack(padx=15, pady=(0, 15), anchor="w")
-
-        # Bottom buttons with improved spacing
-        button_frame = cls.create_styled_frame(main_frame, bg="bg_secondary")
-        button_frame.pack(fill="x", pady=(10, 0))
-
-        # Left side buttons
-        left_buttons = cls.create_styled_frame(button_frame, bg="bg_secondary")
-        left_buttons.pack(side="left")
-
-        save_btn = cls.create_styled_button(
-            left_buttons, text="💾 Save Settings", color="accent_green", style="modern"
-        )
-        save_btn.pack(side="left", padx=(0, 10))
-
-        # Right side buttons
-        right_buttons = cls.create_styled_frame(button_frame, bg="bg_secondary")
-        right_buttons.pack(side="right")
-
-        reset_btn = cls.create_styled_button(
-            right_buttons, text="🔄 Reset", color="accent_orange", style="modern"
-        )
-        reset_btn.pack(side="right", padx=(10, 0))
-
-        cancel_btn = cls.create_styled_button(
-            right_buttons,
-            text="❌ Cancel",
-            command=popup.destroy,
-            color="text_muted",
-            style="modern",
-        )
-        cancel_btn.pack(side="right")
+        # The dialog lives in its own module, loaded the first time it is opened
+        from ui.settings_dialog import create_enhanced_settings_popup
 
-        return popup, location_var, location_entry
+        return create_enhanced_settings_popup(parent, weather_widget)
 
     # @classmethod
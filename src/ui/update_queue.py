@@ -0,0 +1,56 @@
+"""
+Update queue module for handing weather snapshots from worker threads to Tk.
+"""
+
+import threading
+from collections import deque
+
+
+class UpdateQueue:
+    """Bounded, coalescing queue of weather snapshots waiting to be displayed"""
+
+    def __init__(self, maxsize=8):
+        self._pending = deque(maxlen=maxsize)
+        self._lock = threading.Lock()
+        self.generation = 0  # Number of the most recently requested fetch
+        self.coalesced = 0  # Snapshots skipped because a newer one arrived
+        self.stale = 0  # Snapshots dropped because a newer fetch was requested
+
+    def next_generation(self):
+        """Number a new fetch; results of earlier fetches become stale"""
+        with self._lock:
+            self.generation += 1
+            return self.generation
+
+    def put(self, snapshot, generation=None):
+        """
+        Queue a snapshot for display (safe to call from any thread).
+        generation is the number the fetch was started with; None is never stale.
+        """
+        with self._lock:
+            if len(self._pending) == self._pending.maxlen:
+                self.coalesced += 1  # Oldest entry is pushed out
+            self._pending.append((generation, snapshot))
+
+    def take_latest(self):
+        """
+        Return the snapshot of the most recently requested fetch and drop the
+        rest, or None. Results of superseded fetches are never returned, even
+        when they finish last.
+        """
+        with self._lock:
+            current = [
+                (index, snapshot)
+                for index, (generation, snapshot) in enumerate(self._pending)
+                if generation is None or generation >= self.generation
+            ]
+            self.stale += len(self._pending) - len(current)
+            self._pending.clear()
+            if not current:
+                return None
+            self.coalesced += len(current) - 1
+            return current[-1][1]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._pending)
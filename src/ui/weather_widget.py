@@ -1,20 +1,31 @@
 import os
 import sys
-import threading
 import time
 import tkinter as tk
 from datetime import datetime
 from tkinter import messagebox, ttk
 
 # Import from other modules in the project
+from api.last_known_weather import LastKnownWeather
+from api.service_client import WeatherServiceClient
 from api.weather_api import WeatherAPI
+from core.forecast_interpolator import ForecastInterpolator
 from core.hoodie_calculator import HoodieComfortCalculator
+from core.refresh_scheduler import RefreshScheduler, get_idle_seconds
 from core.settings_manager import SettingsManager
+from core.weather_history import WeatherHistory
+from core.weather_service import WeatherService
+from ui.fetch_scheduler import FetchScheduler
+from ui.render_model import RenderState, build_render_model, format_upstream_status
 from ui.ui_components import UIComponents
+from ui.update_queue import UpdateQueue
+
+# Milliseconds before asking again when a result is for a previous location
+LOCATION_RETRY_DELAY = 2000
 
 
 class WeatherWidget:
-    def __init__(self):
+    def __init__(self, service_url=None):
         print("Initializing WeatherWidget...")
         self.root = tk.Tk()
         print("Tkinter root created...")
@@ -25,17 +36,39 @@ class WeatherWidget:
         self.manual_location = None  # For manually set location
 
         # Initialize modules
-        self.weather_api = WeatherAPI()
         self.settings_manager = SettingsManager()
+        self.weather_api = WeatherAPI(cache_dir=self.settings_manager.config_dir)
         self.hoodie_calculator = HoodieComfortCalculator()
+        self.forecast_interpolator = ForecastInterpolator()
+        self.refresh_scheduler = RefreshScheduler()
+        self.weather_service = WeatherService(
+            weather_api=self.weather_api,
+            hoodie_calculator=self.hoodie_calculator,
+            forecast_interpolator=self.forecast_interpolator,
+            refresh_scheduler=self.refresh_scheduler,
+        )
+        # Thin-client mode: read weather from a `--serve` daemon instead
+        self.service_client = WeatherServiceClient(service_url) if service_url else None
+        self.weather_history = self.open_weather_history()
+        self.last_known_weather = LastKnownWeather(
+            os.path.join(self.settings_manager.config_dir, "last_weather_cache.json")
+        )
+        self._update_job = None
+        self.serving_stale = False  # Last refresh failed; showing older data
         self.ui = UIComponents()
+        self.fetch_scheduler = FetchScheduler(self.root)
+        self.update_queue = UpdateQueue()
+        self.render_state = RenderState()
 
         print("Loading settings...")
         self.load_settings()
         print("Creating widgets...")
         self.create_widgets()
+        self.show_last_known_weather()
         print("Starting weather updates...")
+        self.drain_weather_updates()
         self.start_weather_updates()
+        self.root.after(5000, self.watch_settings_file)
         print("Widget initialization complete!")
 
     def setup_window(self):
@@ -49,7 +82,7 @@ class WeatherWidget:
         )
 
         # Position window at top-right of screen using the size parameter
-        width, height = map(int, "300x360".split("x"))
+        width, height = map(int, "300x380".split("x"))
         screen_width = self.root.winfo_screenwidth()
         x = screen_width - width - 20  # Width + 20 margin
         y = 20  # 20 pixels from top
@@ -73,6 +106,8 @@ class WeatherWidget:
         x = self.root.winfo_x() + event.x - self.start_x
         y = self.root.winfo_y() + event.y - self.start_y
         self.root.geometry(f"+{x}+{y}")
+        # Written behind: a whole drag gesture results in one settings write
+        self.settings_manager.update_setting("window_position", [x, y])
 
     def create_widgets(self):
         # Create main frame using UIComponents
@@ -85,6 +120,8 @@ class WeatherWidget:
         top_spacer.configure(height=25)
 
         # Settings button (small gear icon next to close button) - positioned in top spacer
+        # The startup chrome uses plain tk buttons so that ttkbootstrap is not
+        # imported before the first frame is painted
         settings_btn = UIComponents.create_styled_button(
             top_spacer,
             text="⚙",
@@ -93,6 +130,7 @@ class WeatherWidget:
             font="tiny",
             width=2,
             height=1,
+            style="classic",
         )
         settings_btn.place(relx=0.7, rely=0.5, anchor="center")
 
@@ -105,6 +143,7 @@ class WeatherWidget:
             font="tiny",
             width=2,
             height=1,
+            style="classic",
         )
         close_btn.place(relx=1.0, rely=0.5, anchor="e")
 
@@ -163,6 +202,17 @@ class WeatherWidget:
         )
         self.recommendation_label.pack()
 
+        # Hoodie timeline for the rest of the day
+        self.timeline_label = UIComponents.create_styled_label(
+            main_frame,
+            text="",
+            font="micro",
+            color="text_secondary",
+            wraplength=250,
+            anchor="center",
+        )
+        self.timeline_label.pack(pady=(5, 0))
+
         # Last updated
         self.updated_label = UIComponents.create_styled_label(
             main_frame,
@@ -179,323 +229,289 @@ class WeatherWidget:
         UIComponents.draw_progress_bar(self.progress_canvas, level)
 
     def get_location_and_weather(self):
-        """Get user's location and weather data using the WeatherAPI module"""
-        try:
-            # Check if manual location is set
-            if self.manual_location:
-                lat = self.manual_location["lat"]
-                lon = self.manual_location["lon"]
-                city = self.manual_location["query"]
-                full_location = self.manual_location["display_name"]
-
-                print(f"Using manual location: {full_location}")
-
-                # Get weather data for manual location
-                weather_result = self.weather_api.get_weather_data(lat, lon)
-                if weather_result.get("success"):
-                    self.weather_data = weather_result
-                    self.weather_data["city"] = city
-                    self.weather_data["full_location"] = full_location
-                    self.weather_data["coordinates"] = f"{lat:.3f}, {lon:.3f}"
-                    self.weather_data["is_manual"] = True
-                    self.update_display()
-                else:
-                    print(
-                        f"Weather API error for manual location: {weather_result.get('error')}"
-                    )
-                    self.use_demo_data()
+        """Refresh location and weather in the background (non-blocking)"""
+        # Numbered so a slow fetch for an old location cannot overwrite this one
+        generation = self.update_queue.next_generation()
+        self.fetch_scheduler.submit(
+            self._fetch_and_queue_weather, self.manual_location, generation
+        )
+
+    def _fetch_and_queue_weather(self, manual_location, generation):
+        """Fetch weather and hand the snapshot to the UI queue (worker thread)"""
+        self.update_queue.put(
+            self.fetch_location_and_weather(manual_location), generation
+        )
 
+    def drain_weather_updates(self):
+        """Render the newest queued snapshot, if any (Tk thread poller)"""
+        latest = self.update_queue.take_latest()
+        if (
+            latest is not None
+            and latest.get("success")
+            and not self.matches_location_setting(latest)
+        ):
+            # E.g. an attached daemon has not fetched a just-changed location
+            # yet: keep the current display and ask again shortly
+            self.root.after(LOCATION_RETRY_DELAY, self.get_location_and_weather)
+            latest = None
+        if latest is not None:
+            if latest.get("success"):
+                self.refresh_scheduler.record_success()
+                self.serving_stale = False
+                self.record_history(latest)
+                self.last_known_weather.save(latest)
             else:
-                # Auto-detect location
-                location_result = self.weather_api.get_location_from_ip()
-                if location_result.get("success"):
-                    lat = location_result["lat"]
-                    lon = location_result["lon"]
-                    city = location_result["city"]
-                    region = location_result.get("region", "")
-                    country = location_result.get("country", "")
-
-                    # Create full location string
-                    location_parts = [city]
-                    if region and region != city:
-                        location_parts.append(region)
-                    if country:
-                        location_parts.append(country)
-                    full_location = ", ".join(location_parts)
-
-                    # Get weather data
-                    weather_result = self.weather_api.get_weather_data(lat, lon)
-                    if weather_result.get("success"):
-                        self.weather_data = weather_result
-                        self.weather_data["city"] = city
-                        self.weather_data["full_location"] = full_location
-                        self.weather_data["coordinates"] = f"{lat:.3f}, {lon:.3f}"
-                        self.weather_data["is_manual"] = False
-                        self.update_display()
-                    else:
-                        print(f"Weather API error: {weather_result.get('error')}")
-                        self.use_demo_data()
-                else:
-                    print(f"Location detection failed: {location_result.get('error')}")
-                    self.use_demo_data()
-
-        except Exception as e:
-            print(f"Error in get_location_and_weather: {e}")
-            self.use_demo_data()
-
-    def use_demo_data(self):
-        """Use demo weather data when API is not available"""
-        demo_data = self.weather_api.generate_demo_data()
-
-        self.weather_data = demo_data
-        self.weather_data["city"] = "Demo Mode"
-        self.weather_data["full_location"] = "Demo Mode"
-        self.weather_data["coordinates"] = "0.000, 0.000"
-        self.weather_data["is_manual"] = False
+                # Keep showing the last real data; retries back off meanwhile
+                self.refresh_scheduler.record_failure()
+                self.serving_stale = True
+                latest = self.fallback_weather_data()
+            # Restart the countdown from this result so backoff applies at once
+            self.schedule_next_update()
+            self.apply_weather_data(latest)
+        self.root.after(100, self.drain_weather_updates)
+
+    def matches_location_setting(self, snapshot):
+        """True if the snapshot is for the location currently configured"""
+        manual = self.manual_location
+        if manual:
+            return bool(snapshot.is_manual) and (snapshot.lat, snapshot.lon) == (
+                manual["lat"],
+                manual["lon"],
+            )
+        return not snapshot.is_manual
+
+    def last_good_weather(self):
+        """The most recent real snapshot for this location, or None"""
+        current = self.weather_data
+        if (
+            current
+            and not current.get("is_demo")
+            and self.matches_location_setting(current)
+        ):
+            return current
+
+        snapshot = self.last_known_weather.load()
+        if snapshot is not None and self.matches_location_setting(snapshot):
+            return snapshot
+        return None
+
+    def fallback_weather_data(self):
+        """
+        What to show when a refresh fails: the last good snapshot (brought up
+        to date from its forecast when possible), or demo data if there is none.
+        """
+        last_good = self.last_good_weather()
+        if last_good is None:
+            return self.build_demo_data()
+        return self.weather_service.interpolate(last_good, time.time()) or last_good
+
+    def show_last_known_weather(self):
+        """
+        Paint the snapshot saved by the previous run before any network request.
+        The regular update tick then interpolates or refetches as needed.
+        """
+        snapshot = self.last_known_weather.load()
+        if snapshot is not None and self.matches_location_setting(snapshot):
+            self.weather_service.remember_location(snapshot)
+            self.apply_weather_data(snapshot)
+
+    def open_weather_history(self):
+        """Open the on-disk observation history (None if it cannot be opened)"""
+        history_file = os.path.join(
+            self.settings_manager.config_dir, "weather_history.bin"
+        )
+        try:
+            return WeatherHistory(history_file)
+        except (OSError, ValueError) as e:
+            print(f"Weather history unavailable: {e}")
+            return None
+
+    def record_history(self, snapshot):
+        """Append a fetched observation to the history (once per observation)"""
+        if self.weather_history is None or snapshot.lat is None:
+            return
+
+        timestamp = snapshot.observed_at or time.time()
+        latest = self.weather_history.latest()
+        if latest is not None and latest.timestamp == timestamp:
+            return  # Same observation served again from the forecast cache
+
+        comfort, _ = self.hoodie_calculator.calculate_comfort_level(snapshot)
+        self.weather_history.append(
+            timestamp,
+            snapshot.lat,
+            snapshot.lon,
+            snapshot.temp,
+            snapshot.humidity,
+            snapshot.wind_speed,
+            snapshot.rain,
+            snapshot.weather_code or 0,
+            comfort,
+        )
 
+    def fetch_location_and_weather(self, manual_location=None):
+        """
+        Get user's location and weather data, from the shared weather daemon
+        when attached to one, otherwise directly through the WeatherService.
+        Runs on a worker thread: performs network I/O only and never touches Tk.
+        Returns the weather snapshot, or an error dict on failure.
+        """
+        if self.service_client is not None:
+            snapshot = self.service_client.get_weather()
+        else:
+            snapshot = self.weather_service.fetch(manual_location)
+        if snapshot is None:
+            return {"success": False, "error": "Weather update failed"}
+        return snapshot
+
+    def apply_weather_data(self, weather_data):
+        """Show freshly fetched weather data (Tk thread only)"""
+        self.weather_data = weather_data
         self.update_display()
 
+    def build_demo_data(self):
+        """Build demo weather data when API is not available"""
+        return self.weather_api.generate_demo_data().with_location(
+            "Demo Mode", "Demo Mode", 0.0, 0.0, is_manual=False
+        )
+
     def calculate_hoodie_comfort(self):
         """Calculate hoodie comfort level using the HoodieComfortCalculator"""
         return self.hoodie_calculator.calculate_comfort_level(self.weather_data)
 
     def update_display(self):
-        """Update the widget display with current weather data"""
-        if not self.weather_data:
+        """Update the widget display, touching only widgets whose content changed"""
+        snapshot = self.weather_data
+        if not snapshot:
             return
 
-        # Update location
-        full_location = self.weather_data.get("full_location", "Unknown")
-        coordinates = self.weather_data.get("coordinates", "")
-        is_manual = self.weather_data.get("is_manual", False)
-
-        location_prefix = (
-            "📍" if not is_manual else "📌"
-        )  # Different icon for manual location
-        location_text = f"{location_prefix} {full_location}"
-        if is_manual:
-            location_text += " (Manual)"
-
-        self.location_label.config(text=location_text)
-
-        # Update temperature
-        temp = self.weather_data["main"]["temp"]
-        self.temp_label.config(text=f"{temp:.1f}°C")
-
-        # Update weather details
-        humidity = self.weather_data["main"]["humidity"]
-        wind_speed = self.weather_data["wind"]["speed"]
-        description = self.weather_data["weather"][0]["description"].title()
-
-        # Check for precipitation
-        rain_text = ""
-        if "rain" in self.weather_data and self.weather_data["rain"]:
-            rain_mm = list(self.weather_data["rain"].values())[0]
-            rain_text = f" | Rain: {rain_mm}mm"
-        elif "snow" in self.weather_data and self.weather_data["snow"]:
-            snow_mm = list(self.weather_data["snow"].values())[0]
-            rain_text = f" | Snow: {snow_mm}mm"
-
-        details_text = (
-            f"{description}\nHumidity: {humidity}% | Wind: {wind_speed} m/s{rain_text}"
-        )
-        self.details_label.config(text=details_text)
-
-        # Update hoodie recommendation
         comfort_level, recommendation = self.calculate_hoodie_comfort()
-        self.draw_progress_bar(comfort_level)
-        self.recommendation_label.config(text=recommendation)
-
-        # Update timestamp with coordinates info
-        current_time = datetime.now().strftime("%H:%M")
-        coordinates = self.weather_data.get("coordinates", "")
-        update_text = f"Updated: {current_time}"
-        if coordinates and coordinates != "0.000, 0.000":
-            update_text += f" | {coordinates}"
-        self.updated_label.config(text=update_text)
+        model = build_render_model(
+            snapshot,
+            comfort_level,
+            recommendation,
+            timeline_text=self.format_hoodie_timeline(),
+            next_refresh_at=self.refresh_scheduler.next_refresh_at,
+            stale=self.serving_stale,
+        )
 
-    def start_weather_updates(self):
-        """Start the weather update thread"""
+        labels = {
+            "location": self.location_label,
+            "temperature": self.temp_label,
+            "details": self.details_label,
+            "recommendation": self.recommendation_label,
+            "timeline": self.timeline_label,
+            "updated": self.updated_label,
+        }
+        for name, value in self.render_state.diff(model).items():
+            if name == "comfort":
+                self.draw_progress_bar(value)
+            else:
+                labels[name].config(text=value)
 
-        def update_weather():
-            while True:
-                self.get_location_and_weather()
-                time.sleep(600)  # Update every 10 minutes
+    def format_hoodie_timeline(self):
+        """Summarize the next 24 hours of hoodie comfort from the retained forecast"""
+        timeline = self.hoodie_calculator.calculate_hoodie_timeline(
+            self.weather_data.get("hourly"), time.time()
+        )
+        if not timeline:
+            return ""
 
-        weather_thread = threading.Thread(target=update_weather, daemon=True)
-        weather_thread.start()
+        def hour(timestamp):
+            return datetime.fromtimestamp(timestamp).strftime("%H:%M")
 
-        # Initial update
-        self.get_location_and_weather()
+        best_text = "Best: " + ", ".join(hour(t) for t in timeline["best_hours"])
+        take_off_at = timeline["take_off_at"]
+        put_on_at = timeline["put_on_at"]
 
-    def load_settings(self):
-        """Load settings using SettingsManager"""
-        settings = self.settings_manager.load_settings()
-        self.manual_location = settings.get("manual_location")
-        print(f"Loaded settings: manual_location = {self.manual_location}")
+        if take_off_at is None:
+            return f"Hoodie weather all day | {best_text}"
+        if take_off_at == timeline["times"][0] and put_on_at is None:
+            return "Too warm for a hoodie all day"
+        if put_on_at is None:
+            return f"Take it off at {hour(take_off_at)} | {best_text}"
+        return f"Off {hour(take_off_at)}–{hour(put_on_at)} | {best_text}"
 
-    def save_settings(self):
-        """Save settings using SettingsManager"""
-        settings = {"manual_location": self.manual_location}
-        success = self.settings_manager.save_settings(settings)
-        if success:
-            print(f"Settings saved: {settings}")
+    def start_weather_updates(self):
+        """
+        Periodic weather tick, paced by the RefreshScheduler. Conditions are
+        interpolated from the retained hourly forecast; the network is only used
+        when the forecast is running out, getting old, or changing quickly.
+        """
+        hourly = self.weather_data.get("hourly")
+        observed_at = self.weather_data.get("observed_at")
+
+        if self.forecast_interpolator.needs_refresh(hourly, observed_at, time.time()):
+            self.get_location_and_weather()
         else:
-            print("Failed to save settings")
+            self.show_forecast_conditions()
 
-    def open_settings(self):
-        """Open the settings window with UIComponents styling"""
-        settings_window = UIComponents.create_popup_window(
-            self.root, "Weather Widget Settings", "400x800"
-        )
-
-        # Position near the widget
-        x = self.root.winfo_x() - 100
-        y = self.root.winfo_y() + 50
-        settings_window.geometry(f"400x500+{x}+{y}")
-
-        # Title
-        UIComponents.create_styled_label(
-            settings_window, text="⚙ Settings", font="title", bg="bg_secondary"
-        ).pack(pady=10)
+        self.schedule_next_update()
 
-        # Location section
-        location_frame = UIComponents.create_styled_frame(
-            settings_window, bg="bg_secondary"
-        )
-        location_frame.pack(fill="x", padx=20, pady=10)
+    def schedule_next_update(self):
+        """(Re)schedule the next weather tick from the adaptive interval"""
+        if self._update_job is not None:
+            self.root.after_cancel(self._update_job)
 
-        UIComponents.create_styled_label(
-            location_frame,
-            text="📍 Location Settings",
-            font="normal",
-            color="accent_blue",
-            bg="bg_secondary",
-        ).pack(anchor="w")
-
-        # Auto-detect vs Manual radio buttons
-        self.location_mode = tk.StringVar()
-        self.location_mode.set("auto" if not self.manual_location else "manual")
-
-        auto_radio = tk.Radiobutton(
-            location_frame,
-            text="Auto-detect location (IP-based)",
-            variable=self.location_mode,
-            value="auto",
-            bg=UIComponents.COLORS["bg_secondary"],
-            fg="white",
-            selectcolor=UIComponents.COLORS["bg_primary"],
-            command=self.on_location_mode_change,
+        now = time.time()
+        volatile = self.forecast_interpolator.is_volatile(
+            self.weather_data.get("hourly"), now
         )
-        auto_radio.pack(anchor="w", pady=5)
-
-        manual_radio = tk.Radiobutton(
-            location_frame,
-            text="Manual location",
-            variable=self.location_mode,
-            value="manual",
-            bg=UIComponents.COLORS["bg_secondary"],
-            fg="white",
-            selectcolor=UIComponents.COLORS["bg_primary"],
-            command=self.on_location_mode_change,
+        delay = self.refresh_scheduler.schedule(
+            now, volatile=volatile, idle_seconds=get_idle_seconds()
         )
-        manual_radio.pack(anchor="w", pady=5)
-
-        # Manual location input frame
-        self.manual_frame = UIComponents.create_styled_frame(
-            location_frame, bg="bg_secondary"
+        self._update_job = self.root.after(
+            int(delay * 1000), self.start_weather_updates
         )
-        self.manual_frame.pack(fill="x", pady=10)
 
-        UIComponents.create_styled_label(
-            self.manual_frame,
-            text="City, Country (e.g., London, UK):",
-            font="small",
-            color="text_secondary",
-            bg="bg_secondary",
-        ).pack(anchor="w")
-
-        self.location_entry = UIComponents.create_styled_entry(
-            self.manual_frame, width=30
-        )
-        self.location_entry.pack(anchor="w", pady=5)
-
-        # Pre-fill with current manual location if set
-        if self.manual_location:
-            self.location_entry.insert(0, self.manual_location.get("query", ""))
-
-        # Test location button
-        test_btn = UIComponents.create_styled_button(
-            self.manual_frame,
-            text="Test Location",
-            command=self.test_manual_location,
-            color="accent_orange",
-        )
-        test_btn.pack(anchor="w", pady=5)
+    def show_forecast_conditions(self):
+        """Display conditions interpolated from the retained hourly forecast"""
+        weather_data = self.weather_service.interpolate(self.weather_data, time.time())
+        if weather_data is None:
+            self.get_location_and_weather()
+            return
 
-        # Current location info
-        info_frame = UIComponents.create_styled_frame(
-            settings_window, bg="bg_secondary"
-        )
-        info_frame.pack(fill="x", padx=20, pady=10)
+        self.apply_weather_data(weather_data)
 
-        UIComponents.create_styled_label(
-            info_frame,
-            text="ℹ Current Location Info",
-            font="normal",
-            color="accent_blue",
-            bg="bg_secondary",
-        ).pack(anchor="w")
+    def load_settings(self):
+        """Load settings using SettingsManager"""
+        settings = self.settings_manager.load_settings()
+        self.manual_location = settings.get("manual_location")
+        self.refresh_scheduler.base_interval = settings.get("update_interval", 600)
 
-        current_location = self.weather_data.get("full_location", "Unknown")
-        current_coords = self.weather_data.get("coordinates", "Unknown")
+        window_position = settings.get("window_position")
+        if window_position:
+            x, y = window_position
+            self.root.geometry(f"+{x}+{y}")
+        print(f"Loaded settings: manual_location = {self.manual_location}")
 
-        self.current_info_label = UIComponents.create_styled_label(
-            info_frame,
-            text=f"Location: {current_location}\nCoordinates: {current_coords}",
-            font="small",
-            color="text_secondary",
-            bg="bg_secondary",
-            justify="left",
-            wraplength=250,
-        )
-        self.current_info_label.pack(anchor="w", pady=5)
+    def watch_settings_file(self):
+        """Pick up settings changed on disk by another instance or tool"""
+        if self.settings_manager.reload_if_changed():
+            settings = self.settings_manager.load_settings()
+            self.refresh_scheduler.base_interval = settings.get("update_interval", 600)
 
-        # Buttons frame
-        buttons_frame = UIComponents.create_styled_frame(
-            settings_window, bg="bg_secondary"
-        )
-        buttons_frame.pack(fill="x", padx=20, pady=20)
+            manual_location = settings.get("manual_location")
+            if manual_location != self.manual_location:
+                self.manual_location = manual_location
+                self.get_location_and_weather()
 
-        # Save button
-        UIComponents.create_styled_button(
-            buttons_frame,
-            text="Save Settings",
-            command=lambda: self.save_settings_and_refresh(settings_window),
-            color="accent_green",
-            font="normal",
-        ).pack(side="left", padx=5)
+        self.root.after(5000, self.watch_settings_file)
 
-        # Cancel button
-        UIComponents.create_styled_button(
-            buttons_frame,
-            text="Cancel",
-            command=settings_window.destroy,
-            color="text_muted",
-            font="normal",
-        ).pack(side="left", padx=5)
+    def save_settings(self):
+        """Save settings using SettingsManager"""
+        self.settings_manager.update_setting("manual_location", self.manual_location)
+        if self.settings_manager.flush():
+            print(f"Settings saved: manual_location = {self.manual_location}")
+        else:
+            print("Failed to save settings")
 
-        # Reset button
-        UIComponents.create_styled_button(
-            buttons_frame,
-            text="Reset to Auto",
-            command=lambda: self.reset_to_auto(settings_window),
-            color="accent_red",
-            font="normal",
-        ).pack(side="right", padx=5)
+    def open_settings(self):
+        """Open the settings window with UIComponents styling"""
+        # The dialog lives in its own module, loaded the first time it is opened
+        from ui.settings_dialog import open_settings_dialog
 
-        # Update manual frame visibility
-        self.on_location_mode_change()
+        open_settings_dialog(self)
 
     def on_location_mode_change(self):
         """Handle location mode radio button changes"""
@@ -515,17 +531,34 @@ class WeatherWidget:
             tk.messagebox.showwarning("Invalid Input", "Please enter a location")
             return
 
-        # Use WeatherAPI for geocoding
+        self.fetch_scheduler.submit(
+            self._fetch_location_test,
+            location_query,
+            on_success=lambda result: self._show_location_test_result(
+                location_query, *result
+            ),
+        )
+
+    def _fetch_location_test(self, location_query):
+        """Geocode the query and fetch its weather (worker thread)"""
         geocode_result = self.weather_api.geocode_location(location_query)
+        if not geocode_result.get("success"):
+            return geocode_result, None
+
+        weather_result = self.weather_api.get_weather_data(
+            geocode_result["lat"], geocode_result["lon"]
+        )
+        return geocode_result, weather_result
 
+    def _show_location_test_result(
+        self, location_query, geocode_result, weather_result
+    ):
+        """Report the outcome of a location test (Tk thread)"""
         if geocode_result.get("success"):
             lat = geocode_result["lat"]
             lon = geocode_result["lon"]
             display_name = geocode_result["display_name"]
 
-            # Test weather data for this location
-            weather_result = self.weather_api.get_weather_data(lat, lon)
-
             if weather_result.get("success"):
                 temp = weather_result["main"]["temp"]
                 result_msg = f"✓ Location found!\n\nName: {display_name}\nCoordinates: {lat:.3f}, {lon:.3f}\nCurrent Temperature: {temp}°C"
@@ -552,28 +585,42 @@ class WeatherWidget:
                 )
                 return
 
-            # Geocode the location using WeatherAPI
-            geocode_result = self.weather_api.geocode_location(location_query)
+            # Geocode the location in the background, then apply
+            self.fetch_scheduler.submit(
+                self.weather_api.geocode_location,
+                location_query,
+                on_success=lambda result: self._apply_manual_location(
+                    settings_window, location_query, result
+                ),
+            )
+            return
 
-            if geocode_result.get("success"):
-                self.manual_location = {
-                    "query": location_query,
-                    "lat": geocode_result["lat"],
-                    "lon": geocode_result["lon"],
-                    "display_name": geocode_result["display_name"],
-                }
-            else:
-                error_msg = geocode_result.get("error", "Unknown error")
-                tk.messagebox.showerror(
-                    "Error",
-                    f"Could not find location: {location_query}\n\nError: {error_msg}",
-                )
-                return
-        else:
-            self.manual_location = None
+        self.manual_location = None
+        self._finish_settings_change(settings_window)
 
+    def _apply_manual_location(self, settings_window, location_query, geocode_result):
+        """Store a geocoded manual location and refresh (Tk thread)"""
+        if not geocode_result.get("success"):
+            error_msg = geocode_result.get("error", "Unknown error")
+            tk.messagebox.showerror(
+                "Error",
+                f"Could not find location: {location_query}\n\nError: {error_msg}",
+            )
+            return
+
+        self.manual_location = {
+            "query": location_query,
+            "lat": geocode_result["lat"],
+            "lon": geocode_result["lon"],
+            "display_name": geocode_result["display_name"],
+        }
+        self._finish_settings_change(settings_window)
+
+    def _finish_settings_change(self, settings_window):
+        """Persist settings, close the dialog and refresh weather data"""
         self.save_settings()
-        settings_window.destroy()
+        if settings_window.winfo_exists():
+            settings_window.destroy()
 
         # Refresh weather data immediately
         self.get_location_and_weather()
@@ -594,15 +641,23 @@ class WeatherWidget:
         full_location = self.weather_data.get("full_location", "Unknown")
         is_manual = self.weather_data.get("is_manual", False)
 
+        # Health of the upstream services (fetching happens in the daemon when attached)
+        upstream_text = ""
+        if self.service_client is None:
+            upstream_text = format_upstream_status(
+                self.weather_api.get_upstream_status()
+            )
+        height = 230 + 20 * len(upstream_text.splitlines())
+
         # Create a popup using UIComponents
         popup = UIComponents.create_popup_window(
-            self.root, "Location Details", "350x230"
+            self.root, "Location Details", f"350x{height}"
         )
 
         # Position near the widget
         x = self.root.winfo_x() + 10
         y = self.root.winfo_y() + 100
-        popup.geometry(f"350x230+{x}+{y}")
+        popup.geometry(f"350x{height}+{x}+{y}")
 
         # Content
         UIComponents.create_styled_label(
@@ -635,6 +690,17 @@ class WeatherWidget:
             bg="bg_secondary",
         ).pack(pady=2)
 
+        if upstream_text:
+            UIComponents.create_styled_label(
+                popup,
+                text=upstream_text,
+                font="tiny",
+                color="text_muted",
+                bg="bg_secondary",
+                justify="left",
+                wraplength=320,
+            ).pack(pady=2)
+
         # Close button
         UIComponents.create_styled_button(
             popup, text="Close", command=popup.destroy, color="accent_red", font="tiny"
@@ -658,6 +724,11 @@ class WeatherWidget:
     def run(self):
         print("Starting main event loop...")
         self.root.mainloop()
+        self.fetch_scheduler.shutdown()
+        self.weather_service.stop()
+        self.settings_manager.flush()
+        if self.weather_history is not None:
+            self.weather_history.close()
         print("Main event loop ended.")
 
 
@@ -0,0 +1,173 @@
+import asyncio
+import http.server
+import json
+import os
+import sys
+import threading
+import time
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import api.async_weather_api as async_weather_api
+from api.async_weather_api import AsyncWeatherAPI
+from api.weather_api import WeatherAPI
+
+FORECAST = {
+    "current": {
+        "time": 1700000000,
+        "temperature_2m": 12.0,
+        "relative_humidity_2m": 60,
+        "precipitation": 0.0,
+        "weather_code": 3,
+        "wind_speed_10m": 7.2,
+    }
+}
+
+
+class _SlowForecastHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    delay = 0.0
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+    received = threading.Event()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        cls.received.set()
+        time.sleep(cls.delay)
+        with cls.lock:
+            cls.in_flight -= 1
+
+        body = json.dumps(FORECAST).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve_forecast(monkeypatch, delay):
+    handler = type("Handler", (_SlowForecastHandler,), {"delay": delay})
+    handler.received = threading.Event()
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(
+        async_weather_api,
+        "FORECAST_URL",
+        f"http://127.0.0.1:{server.server_port}/v1/forecast",
+    )
+    return server, handler
+
+
+def _run(coroutine_function):
+    """Run an AsyncWeatherAPI coroutine with a fresh client and close it"""
+
+    async def main():
+        client = AsyncWeatherAPI(WeatherAPI(use_gazetteer=False))
+        try:
+            return await coroutine_function(client)
+        finally:
+            await client.close()
+
+    return asyncio.run(main())
+
+
+def test_locations_are_fetched_concurrently(monkeypatch):
+    """All requests of a gather are in flight at the same time."""
+    server, handler = _serve_forecast(monkeypatch, delay=0.2)
+    locations = [(50.0 + i, 0.0) for i in range(4)]
+    try:
+        results = _run(lambda client: client.get_weather_for_locations(locations))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert [result.get("success") for result in results] == [True] * 4
+    assert handler.max_in_flight == 4
+
+
+def test_per_call_timeout_returns_an_error(monkeypatch):
+    """A request slower than its deadline is reported as timed out."""
+    server, _ = _serve_forecast(monkeypatch, delay=1.0)
+    try:
+        result = _run(lambda client: client.get_weather_data(50.0, 0.0, timeout=0.1))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert result == {"success": False, "error": "Request timed out"}
+
+
+def test_cancelling_the_caller_abandons_the_request(monkeypatch):
+    """Cancellation propagates to the caller instead of becoming an error dict."""
+    server, handler = _serve_forecast(monkeypatch, delay=1.0)
+
+    async def cancel_while_in_flight(client):
+        task = asyncio.create_task(client.get_weather_data(50.0, 0.0))
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, handler.received.wait, 5)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            return "cancelled"
+        return "finished"
+
+    try:
+        assert _run(cancel_while_in_flight) == "cancelled"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_cancelled_trial_request_does_not_wedge_the_breaker(monkeypatch):
+    """Cancelling the half-open trial lets the next request try again."""
+    server, handler = _serve_forecast(monkeypatch, delay=0.5)
+    host = f"127.0.0.1:{server.server_port}"
+
+    async def cancel_trial_then_retry(client):
+        guard = client.weather_api.upstream_guard
+        guard.cooldown = 0  # Open circuits are half-open at once
+        for _ in range(guard.failure_threshold):
+            guard.record_result(host, False)
+
+        task = asyncio.create_task(client.get_weather_data(50.0, 0.0))
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, handler.received.wait, 5)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        return await client.get_weather_data(51.0, 0.0)
+
+    try:
+        result = _run(cancel_trial_then_retry)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert result.get("success")
+
+
+def test_falls_back_to_sync_sessions_without_aiohttp(monkeypatch):
+    """Without aiohttp requests run on the pooled sync sessions in an executor."""
+    server, handler = _serve_forecast(monkeypatch, delay=0.1)
+    monkeypatch.setattr(async_weather_api, "AIOHTTP_AVAILABLE", False)
+    locations = [(50.0 + i, 0.0) for i in range(3)]
+    try:
+        results = _run(lambda client: client.get_weather_for_locations(locations))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert [result.temp for result in results] == [12.0] * 3
+    assert handler.max_in_flight == 3
@@ -0,0 +1,110 @@
+import os
+import random
+import sys
+
+import pytest
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import core.comfort_lookup as comfort_lookup
+import core.hoodie_calculator as hoodie_calculator
+from core.comfort_lookup import ComfortLookupEngine
+from core.hoodie_calculator import HoodieComfortCalculator
+
+
+def _weather(temp, humidity, wind, rain=0, snow=0):
+    weather_data = {
+        "main": {"temp": temp, "humidity": humidity},
+        "wind": {"speed": wind},
+    }
+    if rain > 0:
+        weather_data["rain"] = {"1h": rain}
+    if snow > 0:
+        weather_data["snow"] = {"1h": snow}
+    return weather_data
+
+
+def test_lookup_matches_calculator_at_every_threshold():
+    """Table answers equal the branching code, including on the bounds."""
+    engine = ComfortLookupEngine(validate=True)
+    calculator = HoodieComfortCalculator()
+
+    assert len(engine.scores) == 270
+    for temp in [-10.1, -10, -5, -0.1, 0, 9.9, 10, 15, 19.9, 20, 22, 28, 35, 40]:
+        for humidity in [75, 75.1, 85, 86]:
+            for wind in [5, 5.1, 10, 10.1]:
+                for rain, snow in [(0, 0), (0.2, 0), (0, 0.5), (0.2, 0.5)]:
+                    weather_data = _weather(temp, humidity, wind, rain, snow)
+                    assert engine.calculate_comfort_level(
+                        weather_data
+                    ) == calculator.calculate_comfort_level(weather_data)
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_batch_lookup_is_cross_checked(monkeypatch, use_numpy):
+    """Validation mode accepts batches scored through the table."""
+    import core.comfort_lookup as lookup_module
+    import core.hoodie_calculator as calculator_module
+
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(calculator_module, "NUMPY_AVAILABLE", False)
+        monkeypatch.setattr(lookup_module, "NUMPY_AVAILABLE", False)
+
+    rng = random.Random(3)
+    rows = [
+        (
+            round(rng.uniform(-20, 40), 1),
+            rng.randint(0, 100),
+            round(rng.uniform(0, 20), 1),
+            rng.choice([0, 0, 0.4]),
+            rng.choice([0, 0, 0, 1.2]),
+        )
+        for _ in range(2000)
+    ]
+    scores, codes = ComfortLookupEngine(validate=True).calculate_comfort_batch(
+        *zip(*rows)
+    )
+    assert len(scores) == len(codes) == len(rows)
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_null_forecast_hours_match_calculator(monkeypatch, use_numpy):
+    """NaN inputs land in the same bins as the calculator's comparisons."""
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(hoodie_calculator, "NUMPY_AVAILABLE", False)
+        monkeypatch.setattr(comfort_lookup, "NUMPY_AVAILABLE", False)
+
+    nan = float("nan")
+    rows = [(nan, 50, 3, 0, 0), (12.0, nan, nan, 0, 0), (-12.0, 90, nan, 0, 0.5)]
+    engine = ComfortLookupEngine(validate=True)
+    scores, codes = engine.calculate_comfort_batch(*zip(*rows))
+
+    calculator = HoodieComfortCalculator()
+    for row, score, code in zip(rows, scores, codes):
+        expected = calculator.calculate_comfort_level(_weather(*row))
+        assert (float(score), calculator.recommendation_text(int(code))) == expected
+        assert engine.calculate_comfort_level(_weather(*row)) == expected
+
+
+def test_batch_validation_catches_a_wrong_bound(monkeypatch):
+    """Batch validation does not share the bound constants it is checking."""
+    monkeypatch.setattr(comfort_lookup, "WIND_BOUNDS", (3, 10))
+    monkeypatch.setattr(hoodie_calculator, "WIND_BOUNDS", (3, 10))
+    engine = ComfortLookupEngine(validate=True)
+
+    with pytest.raises(ValueError):
+        engine.calculate_comfort_batch([12.0], [50], [4.0])
+
+
+def test_validation_reports_mismatches():
+    """A table that disagrees with the calculator is caught."""
+    engine = ComfortLookupEngine(validate=True)
+    engine.scores[engine.index(12, 50, 2)] = 0.99
+
+    with pytest.raises(ValueError):
+        engine.calculate_comfort_level(_weather(12, 50, 2))
@@ -0,0 +1,104 @@
+import os
+import sys
+import threading
+
+import pytest
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from ui.fetch_scheduler import FetchScheduler
+
+
+class _FakeRoot:
+    """Records after() jobs instead of running a Tk event loop."""
+
+    def __init__(self):
+        self.jobs = {}
+        self.cancelled = []
+        self._next_id = 0
+
+    def after(self, delay, callback):
+        self._next_id += 1
+        job = f"after#{self._next_id}"
+        self.jobs[job] = callback
+        return job
+
+    def after_cancel(self, job):
+        self.cancelled.append(job)
+        self.jobs.pop(job, None)
+
+    def run_pending(self):
+        """Run the callbacks scheduled so far, like one pass of the event loop."""
+        jobs, self.jobs = self.jobs, {}
+        for callback in jobs.values():
+            callback()
+
+
+def _thread_name():
+    return threading.current_thread().name
+
+
+def test_results_are_delivered_on_the_polling_thread():
+    """Work runs on a worker; on_success runs from the root.after poller."""
+    root = _FakeRoot()
+    scheduler = FetchScheduler(root)
+    delivered = []
+
+    future = scheduler.submit(_thread_name, on_success=delivered.append)
+    future.result(timeout=5)
+    assert delivered == []  # Nothing runs until the poller fires
+
+    root.run_pending()
+    assert len(delivered) == 1 and delivered[0].startswith("weather-fetch")
+    assert len(root.jobs) == 1  # The poller re-armed itself
+    scheduler.shutdown()
+
+
+def test_errors_go_to_on_error():
+    """An exception in the worker is handed to on_error, not on_success."""
+    root = _FakeRoot()
+    scheduler = FetchScheduler(root)
+    successes, errors = [], []
+
+    def fail():
+        raise ValueError("no network")
+
+    scheduler.submit(fail, on_success=successes.append, on_error=errors.append)
+    scheduler._executor.shutdown(wait=True)
+    root.run_pending()
+
+    assert successes == []
+    assert [str(error) for error in errors] == ["no network"]
+    scheduler.shutdown()
+
+
+def test_cancelled_pending_job_runs_no_callbacks():
+    """A job cancelled before a worker picked it up never reports back."""
+    root = _FakeRoot()
+    scheduler = FetchScheduler(root, max_workers=1)
+    release = threading.Event()
+    delivered = []
+
+    scheduler.submit(release.wait, 5)  # Occupies the only worker
+    pending = scheduler.submit(_thread_name, on_success=delivered.append)
+    assert pending.cancel()
+
+    release.set()
+    scheduler._executor.shutdown(wait=True)
+    root.run_pending()
+    assert delivered == []
+    scheduler.shutdown()
+
+
+def test_shutdown_stops_polling():
+    """After shutdown the poller is cancelled and does not re-arm."""
+    root = _FakeRoot()
+    scheduler = FetchScheduler(root)
+    poll_job = next(iter(root.jobs))
+
+    scheduler.shutdown()
+    assert root.cancelled == [poll_job]
+    assert root.jobs == {}
+    with pytest.raises(RuntimeError):
+        scheduler.submit(_thread_name)  # Worker pool is released
@@ -0,0 +1,45 @@
+import os
+import sys
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.forecast_interpolator import ForecastInterpolator
+
+HOUR = 3600
+
+
+def _hourly(temps, precip=None, start=0):
+    count = len(temps)
+    return {
+        "time": [start + i * HOUR for i in range(count)],
+        "temperature_2m": temps,
+        "relative_humidity_2m": [60] * count,
+        "wind_speed_10m": [10.0] * count,
+        "precipitation": precip or [0.0] * count,
+        "weather_code": [3] * count,
+    }
+
+
+def test_conditions_are_interpolated_between_hours():
+    """Temperature is linear between forecast hours; rain comes from the next hour."""
+    hourly = _hourly([10.0, 14.0, 14.0], precip=[0.0, 1.2, 0.0])
+    current = ForecastInterpolator().conditions_at(hourly, HOUR // 4)
+
+    assert current["temperature_2m"] == 11.0
+    assert current["precipitation"] == 1.2
+    assert ForecastInterpolator().conditions_at(hourly, 5 * HOUR) is None
+
+
+def test_refresh_only_when_window_expires_or_conditions_change():
+    """Steady forecasts are reused; short windows and volatile weather refetch."""
+    interpolator = ForecastInterpolator()
+    steady = _hourly([12.0] * 24)
+
+    assert not interpolator.needs_refresh(steady, observed_at=0, now=HOUR)
+    assert interpolator.needs_refresh(steady, observed_at=0, now=22 * HOUR)
+    assert interpolator.needs_refresh(None, observed_at=None, now=0)
+
+    warming = _hourly([5.0 + 4 * i for i in range(24)])
+    assert not interpolator.needs_refresh(warming, observed_at=0, now=10 * 60)
+    assert interpolator.needs_refresh(warming, observed_at=0, now=20 * 60)
@@ -0,0 +1,100 @@
+import os
+import random
+import sys
+
+import pytest
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.hoodie_calculator import HoodieComfortCalculator
+
+
+def _sample_rows(count=5000, seed=7):
+    """Random rows plus every threshold value and its neighbours."""
+    rng = random.Random(seed)
+    edges = [-10, -5, 0, 5, 10, 15, 20, 22, 28, 35, 75, 85]
+    rows = []
+    for i in range(count):
+        temp = (
+            rng.choice(edges) + rng.choice([-0.1, 0, 0.1])
+            if i % 3 == 0
+            else (round(rng.uniform(-20, 40), 1))
+        )
+        humidity = rng.choice([74, 75, 76, 85, 86, rng.randint(0, 100)])
+        wind = rng.choice([4.9, 5, 5.1, 10, 10.1, round(rng.uniform(0, 20), 1)])
+        rain = rng.choice([0, 0, 0.4])
+        snow = rng.choice([0, 0, 0, 1.2])
+        rows.append((temp, humidity, wind, rain, snow))
+    # Null forecast hours arrive as NaN
+    nan = float("nan")
+    rows += [(nan, 50, 3, 0, 0), (12.0, nan, nan, 0, 0), (nan, nan, nan, 0.4, 0)]
+    return rows
+
+
+def _scalar(calculator, temp, humidity, wind, rain, snow):
+    weather_data = {
+        "main": {"temp": temp, "humidity": humidity},
+        "wind": {"speed": wind},
+    }
+    if rain > 0:
+        weather_data["rain"] = {"1h": rain}
+    if snow > 0:
+        weather_data["snow"] = {"1h": snow}
+    return calculator.calculate_comfort_level(weather_data)
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_batch_scoring_matches_scalar_path(monkeypatch, use_numpy):
+    """Batch scores are bit-identical to calculate_comfort_level, row by row."""
+    import core.hoodie_calculator as calculator_module
+
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(calculator_module, "NUMPY_AVAILABLE", False)
+
+    calculator = HoodieComfortCalculator()
+    rows = _sample_rows()
+    columns = list(zip(*rows))
+    scores, codes = calculator.calculate_comfort_batch(*columns)
+
+    for row, score, code in zip(rows, scores, codes):
+        expected_score, expected_text = _scalar(calculator, *row)
+        assert float(score).hex() == expected_score.hex()
+        assert calculator.recommendation_text(int(code)) == expected_text
+
+
+def test_hoodie_timeline_from_hourly_forecast():
+    """The day is scored in one pass, with best hours and take-off times."""
+    from api.hourly_forecast import HourlyForecast
+
+    hour = 3600
+    temps = [8, 9, 12, 18, 25, 29, 27, 21, 14, 10]
+    hourly = HourlyForecast.from_open_meteo(
+        {
+            "time": [i * hour for i in range(len(temps))],
+            "temperature_2m": temps,
+            "relative_humidity_2m": [50] * len(temps),
+            "precipitation": [0.0] * len(temps),
+            "weather_code": [0] * len(temps),
+            "wind_speed_10m": [3.6] * len(temps),
+        }
+    )
+
+    calculator = HoodieComfortCalculator()
+    timeline = calculator.calculate_hoodie_timeline(hourly, now=hour + 60)
+
+    assert timeline["times"][0] == hour
+    assert timeline["take_off_at"] == 4 * hour
+    assert timeline["put_on_at"] == 7 * hour
+    assert timeline["best_hours"] == [hour, 2 * hour, 8 * hour]
+    assert calculator.calculate_hoodie_timeline(hourly, now=20 * hour) is None
+
+
+def test_small_batches_use_the_scalar_path():
+    """A day of forecast is scored without NumPy, keeping it off the first paint."""
+    calculator = HoodieComfortCalculator()
+    scores, codes = calculator.calculate_comfort_batch([12.0] * 24, [50] * 24, [2] * 24)
+
+    assert isinstance(scores, list) and isinstance(codes, list)
@@ -0,0 +1,27 @@
+import os
+import sys
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.refresh_scheduler import RefreshScheduler
+
+
+def test_interval_adapts_to_failures_volatility_and_idle():
+    """The configured interval is the baseline for every adjustment."""
+    scheduler = RefreshScheduler(base_interval=600)
+    assert scheduler.next_delay() == 600
+    assert scheduler.next_delay(volatile=True) == 200
+    assert scheduler.next_delay(idle_seconds=1800) == 2400
+
+    scheduler.record_failure()
+    assert scheduler.next_delay() == 30  # A single failure is retried soon
+    scheduler.record_failure()
+    assert scheduler.next_delay() == 1200
+    scheduler.record_failure()
+    scheduler.record_failure()
+    assert scheduler.next_delay() == 3600  # Capped at max_interval
+
+    scheduler.record_success()
+    assert scheduler.schedule(now=1000) == 600
+    assert scheduler.next_refresh_at == 1600
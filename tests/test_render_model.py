@@ -0,0 +1,49 @@
+import os
+import sys
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.weather_snapshot import WeatherSnapshot
+from ui.render_model import RenderState, build_render_model
+
+
+def _snapshot(temp=12.0):
+    return WeatherSnapshot(temp, 60, 3.5, "Overcast", "overcast").with_location(
+        "Leeds", "Leeds, England", 53.8, -1.55, is_manual=True
+    )
+
+
+def test_render_model_formats_display_strings():
+    """Labels are formatted once from the snapshot."""
+    model = build_render_model(_snapshot(), 0.2, "Great for a hoodie! 😊")
+
+    assert model["location"] == "📌 Leeds, England (Manual)"
+    assert model["temperature"] == "12.0°C"
+    assert model["details"] == "Overcast\nHumidity: 60% | Wind: 3.5 m/s"
+    assert model["updated"].endswith("| 53.800, -1.550")
+
+
+def test_render_state_reports_only_changes():
+    """An identical snapshot touches nothing; a new temperature one label."""
+    state = RenderState()
+    first = build_render_model(_snapshot(), 0.2, "Great for a hoodie! 😊")
+    assert state.diff(first) == first
+
+    assert state.diff(dict(first)) == {}
+
+    warmer = dict(first, temperature="14.0°C")
+    assert state.diff(warmer) == {"temperature": "14.0°C"}
+
+    state.reset()
+    assert state.diff(warmer) == warmer
+
+
+def test_stale_data_shows_its_age():
+    """After a failed refresh the footer reports how old the data is."""
+    snapshot = _snapshot().replace(observed_at=1_000_000)
+    model = build_render_model(
+        snapshot, 0.2, "Great for a hoodie! 😊", stale=True, now=1_000_000 + 95 * 60
+    )
+
+    assert model["updated"].startswith("Offline | Data 1 h 35 min old")
@@ -0,0 +1,126 @@
+import json
+import os
+import sys
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.settings_manager import SettingsManager
+
+
+def test_updates_are_coalesced_into_one_write(tmp_path, monkeypatch):
+    """A burst of updates is served from memory and written once on flush."""
+    settings_file = str(tmp_path / "widget_settings.json")
+    manager = SettingsManager(settings_file, flush_delay=60)
+    writes = []
+    original_write = manager._write_settings_file
+    monkeypatch.setattr(
+        manager,
+        "_write_settings_file",
+        lambda settings: writes.append(1) or original_write(settings),
+    )
+
+    for x in range(50):
+        manager.update_setting("window_position", [x, 20])
+    assert manager.get_setting("window_position") == [49, 20]
+    assert manager.is_dirty and writes == []
+
+    assert manager.flush()
+    assert len(writes) == 1
+    with open(settings_file) as f:
+        assert json.load(f)["window_position"] == [49, 20]
+
+    reloaded = SettingsManager(settings_file)
+    assert reloaded.get_setting("window_position") == [49, 20]
+    assert reloaded.get_setting("update_interval") == 600
+
+
+def test_burst_of_updates_uses_one_timer(tmp_path, monkeypatch):
+    """Dragging the window does not start a timer thread per motion event."""
+    settings_file = str(tmp_path / "widget_settings.json")
+    manager = SettingsManager(settings_file, flush_delay=60)
+    timers = []
+    start_timer = manager._start_flush_timer
+    monkeypatch.setattr(
+        manager,
+        "_start_flush_timer",
+        lambda delay: timers.append(delay) or start_timer(delay),
+    )
+
+    for x in range(200):
+        manager.update_setting("window_position", [x, 20])
+    assert timers == [60]
+    assert manager.flush()
+    assert manager.get_setting("window_position") == [199, 20]
+
+
+def test_write_behind_timer_writes_after_the_last_update(tmp_path):
+    """The pending write happens once the burst has been quiet for flush_delay."""
+    settings_file = str(tmp_path / "widget_settings.json")
+    manager = SettingsManager(settings_file, flush_delay=0.05)
+    manager.update_setting("window_position", [1, 2])
+    manager.update_setting("window_position", [3, 4])
+
+    timer = manager._flush_timer
+    while timer is not None:  # The timer re-arms itself until the deadline
+        timer.join(timeout=5)
+        timer = manager._flush_timer
+    assert not manager.is_dirty
+    with open(settings_file) as f:
+        assert json.load(f)["window_position"] == [3, 4]
+
+
+def test_read_errors_keep_settings_and_file(tmp_path, monkeypatch):
+    """A transient read error neither discards settings nor quarantines the file."""
+    settings_file = str(tmp_path / "widget_settings.json")
+    manager = SettingsManager(settings_file)
+    assert manager.save_settings({"update_interval": 300})
+
+    other = SettingsManager(settings_file)
+    other.save_settings({"update_interval": 900})
+
+    def locked(*args, **kwargs):
+        raise PermissionError("file is being used by another process")
+
+    monkeypatch.setattr("builtins.open", locked)
+    assert not manager.reload_if_changed()
+    assert manager.get_setting("update_interval") == 300
+    monkeypatch.undo()
+
+    assert os.listdir(tmp_path) == ["widget_settings.json"]
+    assert manager.reload_if_changed()  # Retried once the file is readable
+    assert manager.get_setting("update_interval") == 900
+
+
+def test_corrupt_file_is_quarantined(tmp_path):
+    """Invalid JSON is moved aside and defaults are used."""
+    settings_file = str(tmp_path / "widget_settings.json")
+    with open(settings_file, "w") as f:
+        f.write("{not json")
+
+    manager = SettingsManager(settings_file)
+    assert manager.get_setting("update_interval") == 600
+    assert os.listdir(tmp_path) == ["widget_settings.json.corrupt"]
+
+
+def test_atomic_versioned_writes_and_change_detection(tmp_path):
+    """Writes are versioned and replace the file; external edits are reloaded."""
+    settings_file = str(tmp_path / "widget_settings.json")
+    manager = SettingsManager(settings_file)
+    assert manager.save_settings({"update_interval": 300})
+
+    with open(settings_file) as f:
+        stored = json.load(f)
+    assert stored["schema_version"] == 1
+    assert stored["update_interval"] == 300
+    assert os.listdir(tmp_path) == ["widget_settings.json"]  # No temp files left
+
+    assert not manager.reload_if_changed()
+
+    other = SettingsManager(settings_file)
+    other.update_setting("update_interval", 900)
+    other.flush()
+
+    assert manager.reload_if_changed()
+    assert manager.get_setting("update_interval") == 900
+    assert "schema_version" not in manager.load_settings()
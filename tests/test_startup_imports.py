@@ -0,0 +1,74 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+NO_DISPLAY = 3
+
+# Builds the widget over a saved snapshot with a full day of forecast (so the
+# hoodie timeline is scored) and without network refreshes, then reports which
+# deferred modules were loaded by the first paint
+FIRST_PAINT_SCRIPT = f"""
+import sys
+import time
+import tkinter as tk
+
+sys.path.insert(0, {SRC_PATH!r})
+
+try:
+    tk.Tk().destroy()
+except tk.TclError:
+    sys.exit({NO_DISPLAY})
+
+from api.hourly_forecast import HourlyForecast
+from api.last_known_weather import LastKnownWeather
+from core.weather_snapshot import WeatherSnapshot
+from ui.fetch_scheduler import FetchScheduler
+from ui.weather_widget import WeatherWidget
+
+start = int(time.time()) // 3600 * 3600
+hours = 48
+hourly = HourlyForecast.from_open_meteo(
+    {{
+        "time": [start + i * 3600 for i in range(hours)],
+        "temperature_2m": [10 + i % 15 for i in range(hours)],
+        "relative_humidity_2m": [60] * hours,
+        "precipitation": [0.0] * hours,
+        "weather_code": [0] * hours,
+        "wind_speed_10m": [7.2] * hours,
+    }}
+)
+snapshot = WeatherSnapshot(
+    12, 60, 2.0, "Clear", "clear sky", observed_at=time.time(), hourly=hourly
+).with_location("Testville", "Testville", 1.0, 2.0, is_manual=False)
+
+LastKnownWeather.load = lambda self: snapshot
+WeatherWidget.matches_location_setting = lambda self, snapshot: True
+FetchScheduler.submit = lambda self, func, *args, **kwargs: None
+
+widget = WeatherWidget()
+widget.root.update_idletasks()
+assert widget.timeline_label.cget("text"), "timeline was not painted"
+deferred = {{"numpy", "requests", "ttkbootstrap", "ui.settings_dialog"}}
+loaded = deferred & set(sys.modules)
+print("deferred:" + ",".join(sorted(loaded)))
+widget.root.destroy()
+"""
+
+
+def test_first_paint_does_not_import_deferred_modules():
+    """Painting the saved snapshot and its timeline loads no heavy modules."""
+    result = subprocess.run(
+        [sys.executable, "-c", FIRST_PAINT_SCRIPT],
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    if result.returncode == NO_DISPLAY:
+        pytest.skip("Tk cannot open a display")
+
+    assert result.returncode == 0, result.stderr
+    assert "deferred:\n" in result.stdout, result.stdout
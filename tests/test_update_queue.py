@@ -0,0 +1,78 @@
+import os
+import sys
+from types import SimpleNamespace
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.weather_snapshot import WeatherSnapshot
+from ui.update_queue import UpdateQueue
+from ui.weather_widget import WeatherWidget
+
+
+def _snapshot(city, is_manual=False):
+    return WeatherSnapshot(12.0, 60, 3.5, "Overcast", "overcast").with_location(
+        city, city, 53.8, -1.55, is_manual=is_manual
+    )
+
+
+def test_take_latest_coalesces_pending_snapshots():
+    """Only the newest snapshot is handed out; the rest are counted as coalesced."""
+    queue = UpdateQueue()
+    for city in ("Leeds", "York", "Hull"):
+        queue.put(_snapshot(city))
+
+    assert queue.take_latest().city == "Hull"
+    assert queue.coalesced == 2
+    assert queue.take_latest() is None
+
+
+def test_superseded_fetch_is_dropped_even_if_it_finishes_last():
+    """A slow result for an earlier request never replaces the latest request."""
+    queue = UpdateQueue()
+    auto = queue.next_generation()
+    manual = queue.next_generation()
+
+    queue.put(_snapshot("Paris", is_manual=True), manual)
+    queue.put(_snapshot("Leeds"), auto)  # Slow auto-location fetch arrives late
+
+    assert queue.take_latest().city == "Paris"
+    assert queue.stale == 1
+
+    queue.put(_snapshot("Leeds"), auto)
+    assert queue.take_latest() is None
+
+
+def test_drain_renders_only_the_requested_location():
+    """The drain shows, records and saves the current request's snapshot only."""
+    shown, saved = [], []
+    widget = SimpleNamespace(
+        update_queue=UpdateQueue(),
+        refresh_scheduler=SimpleNamespace(
+            record_success=lambda: None, record_failure=lambda: None
+        ),
+        serving_stale=True,
+        record_history=lambda snapshot: None,
+        last_known_weather=SimpleNamespace(save=saved.append),
+        schedule_next_update=lambda: None,
+        apply_weather_data=shown.append,
+        root=SimpleNamespace(after=lambda delay, callback: None),
+        manual_location={"lat": 53.8, "lon": -1.55},
+    )
+    widget.matches_location_setting = WeatherWidget.matches_location_setting.__get__(
+        widget
+    )
+    drain = widget.drain_weather_updates = WeatherWidget.drain_weather_updates.__get__(
+        widget
+    )
+
+    auto = widget.update_queue.next_generation()
+    manual = widget.update_queue.next_generation()
+    widget.update_queue.put(_snapshot("Paris", is_manual=True), manual)
+    widget.update_queue.put(_snapshot("Leeds"), auto)
+    drain()
+    drain()
+
+    assert [snapshot.city for snapshot in shown] == ["Paris"]
+    assert [snapshot.city for snapshot in saved] == ["Paris"]
+    assert widget.serving_stale is False
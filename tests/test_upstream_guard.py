@@ -0,0 +1,94 @@
+import os
+import sys
+
+import pytest
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from api.upstream_guard import CircuitBreaker, TokenBucket, UpstreamUnavailable
+from api.weather_api import GEOCODE_URL, WeatherAPI
+from ui.render_model import format_upstream_status
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class _FailingSession:
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        raise OSError("connection timed out")
+
+
+def test_token_bucket_refuses_waits_longer_than_allowed():
+    """A drained bucket reports the wait, or refuses beyond max_wait"""
+    clock = _Clock()
+    bucket = TokenBucket(rate=1.0, capacity=2, clock=clock)
+
+    assert bucket.reserve(0) == 0
+    assert bucket.reserve(0) == 0
+    assert bucket.reserve(0.5) is None
+    assert bucket.reserve(1.0) == pytest.approx(1.0)
+
+    clock.now += 3
+    assert bucket.reserve(0) == 0
+
+
+def test_circuit_breaker_opens_then_allows_one_trial():
+    """Consecutive failures open the circuit until the cool-down ends"""
+    clock = _Clock()
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=30, clock=clock)
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert breaker.retry_in() == 30
+
+    clock.now += 30
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()  # Only one trial at a time
+
+    breaker.record_failure()  # Failed trial reopens immediately
+    assert breaker.state == "open"
+
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.failures == 0
+
+
+def test_weather_api_fails_fast_while_host_is_down():
+    """After repeated errors requests are refused without touching the network"""
+    api = WeatherAPI(use_gazetteer=False)
+    api.upstream_guard.rate_limits = {}
+    session = _FailingSession()
+    api._sessions["nominatim.openstreetmap.org"] = session
+
+    for _ in range(3):
+        with pytest.raises(OSError):
+            api._get(GEOCODE_URL)
+    with pytest.raises(UpstreamUnavailable):
+        api._get(GEOCODE_URL)
+    assert session.calls == 3
+
+    result = api.geocode_location("Nowhere", use_cache=False)
+    assert not result["success"]
+    assert session.calls == 3
+
+    status = api.get_upstream_status()["nominatim.openstreetmap.org"]
+    assert status["state"] == "open"
+    assert status["failures"] == 3
+    assert "down, retry in" in format_upstream_status(api.get_upstream_status())
+    assert format_upstream_status({}) == "Services: all OK"
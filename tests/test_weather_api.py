@@ -0,0 +1,312 @@
+import http.server
+import json
+import os
+import sys
+import threading
+import time
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from api.forecast_cache import ForecastCache
+from api.weather_api import WeatherAPI
+
+
+class _JSONHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'{"status": "fail"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _start_server():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _JSONHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_sessions_are_shared_per_host():
+    """Each upstream host gets exactly one pooled session."""
+    api = WeatherAPI()
+    first = api._session_for("https://api.open-meteo.com/v1/forecast")
+    second = api._session_for("https://api.open-meteo.com/v1/other")
+    other = api._session_for("https://nominatim.openstreetmap.org/search")
+
+    assert first is second
+    assert first is not other
+    api.close()
+
+
+def test_retries_skip_timeouts_and_rate_limited_hosts():
+    """Hung requests are never re-sent; throttled hosts get no status retries."""
+    api = WeatherAPI()
+    forecast = api._session_for("https://api.open-meteo.com/v1/forecast")
+    geocode = api._session_for("https://nominatim.openstreetmap.org/search")
+
+    forecast_retry = forecast.get_adapter("https://").max_retries
+    geocode_retry = geocode.get_adapter("https://").max_retries
+    assert forecast_retry.read == 0 and geocode_retry.read == 0
+    assert 429 not in forecast_retry.status_forcelist
+    assert forecast_retry.status == api.max_retries
+    assert geocode_retry.status == 0
+    api.close()
+
+
+def test_keep_alive_connections_are_reused():
+    """Repeated requests to one host reuse a single pooled connection."""
+    server = _start_server()
+    url = f"http://127.0.0.1:{server.server_port}/json/"
+    api = WeatherAPI()
+    try:
+        for _ in range(3):
+            api._get(url).json()
+
+        stats = api.get_connection_stats()[f"127.0.0.1:{server.server_port}"]
+        assert stats["requests"] == 3
+        assert stats["new_connections"] == 1
+        assert stats["reused_connections"] == 2
+    finally:
+        api.close()
+        server.shutdown()
+
+
+SAMPLE_FORECAST = {
+    "current": {
+        "temperature_2m": 12.5,
+        "relative_humidity_2m": 70,
+        "precipitation": 0.4,
+        "weather_code": 61,
+        "wind_speed_10m": 18.0,
+    }
+}
+
+
+class _FakeResponse:
+    status_code = 200
+
+    def json(self):
+        return SAMPLE_FORECAST
+
+
+def test_concurrent_cache_saves_do_not_tear_the_file(tmp_path):
+    """Workers saving the same cache at once each use their own temp file."""
+    cache_file = str(tmp_path / "forecast_cache.json")
+    cache = ForecastCache(cache_file)
+    errors = []
+
+    def save_many(worker):
+        for i in range(50):
+            cache.put(f"{worker}-{i}", SAMPLE_FORECAST)
+            try:
+                cache.save()
+            except Exception as e:
+                errors.append(e)
+
+    workers = [threading.Thread(target=save_many, args=(n,)) for n in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert not errors
+    with open(cache_file) as f:
+        assert len(json.load(f)) == len(cache)
+    assert os.listdir(tmp_path) == ["forecast_cache.json"]
+
+
+def test_forecast_cache_ignores_valid_json_of_the_wrong_shape(tmp_path):
+    """A cache file holding a list or odd entries loads as an empty cache."""
+    cache_file = tmp_path / "forecast_cache.json"
+    for content in ("[1, 2]", '"text"', '{"key": 5}'):
+        cache_file.write_text(content)
+        assert len(ForecastCache(str(cache_file))) == 0
+
+
+def test_forecast_cache_serves_repeat_lookups(tmp_path, monkeypatch):
+    """Repeated and post-restart forecast lookups are served without network."""
+    calls = []
+    api = WeatherAPI(cache_dir=str(tmp_path))
+    monkeypatch.setattr(
+        api, "_get", lambda url, **kw: calls.append(url) or _FakeResponse()
+    )
+
+    first = api.get_weather_data(51.5074, -0.1278)
+    second = api.get_weather_data(51.5071, -0.1281)  # Same rounded coordinates
+    assert first == second
+    assert first["main"]["temp"] == 12.5
+    assert first["rain"] == {"1h": 0.4}
+    assert len(calls) == 1
+
+    restarted = WeatherAPI(cache_dir=str(tmp_path))
+    monkeypatch.setattr(restarted, "_get", lambda url, **kw: calls.append(url))
+    assert restarted.get_weather_data(51.5074, -0.1278) == first
+    assert len(calls) == 1
+
+
+def test_geocode_uses_gazetteer_then_cache(tmp_path, monkeypatch):
+    """Known cities resolve offline; other queries hit nominatim only once."""
+    calls = []
+
+    class _NominatimResponse:
+        status_code = 200
+
+        def json(self):
+            return [{"lat": "50.7374", "lon": "-3.5351", "display_name": "Exeter"}]
+
+    api = WeatherAPI(cache_dir=str(tmp_path))
+    monkeypatch.setattr(
+        api, "_get", lambda url, **kw: calls.append(url) or _NominatimResponse()
+    )
+
+    london = api.geocode_location("  london ,UK ")
+    assert london["success"] and london["display_name"].startswith("London")
+    assert api.geocode_location("Sao Paulo")["display_name"].startswith("São Paulo")
+    assert calls == []
+
+    assert api.geocode_location("Exeter, UK")["lat"] == 50.7374
+    assert api.geocode_location("exeter,  uk")["lat"] == 50.7374
+    assert len(calls) == 1
+
+
+def test_ip_location_cached_until_network_changes(tmp_path, monkeypatch):
+    """IP geolocation is reused on the same network and refetched on a new one."""
+    import api.weather_api as weather_api_module
+
+    calls = []
+
+    class _IPResponse:
+        def json(self):
+            return {"status": "success", "lat": 1.0, "lon": 2.0, "city": "Testville"}
+
+    network = {"fingerprint": "home"}
+    monkeypatch.setattr(
+        weather_api_module, "get_network_fingerprint", lambda: network["fingerprint"]
+    )
+    api = WeatherAPI(cache_dir=str(tmp_path))
+    monkeypatch.setattr(
+        api, "_get", lambda url, **kw: calls.append(url) or _IPResponse()
+    )
+
+    assert api.get_location_from_ip()["city"] == "Testville"
+    assert api.get_location_from_ip()["city"] == "Testville"
+    assert len(calls) == 1
+
+    network["fingerprint"] = "office"
+    api.get_location_from_ip()
+    assert len(calls) == 2
+
+
+def test_location_without_gateway_is_cached_briefly(monkeypatch):
+    """A fingerprint built from the local address alone expires after IP_ONLY_TTL."""
+    import api.location_cache as location_cache
+
+    monkeypatch.setattr(location_cache, "get_local_ip", lambda: "192.168.1.20")
+    monkeypatch.setattr(location_cache, "get_default_gateway", lambda: None)
+    fingerprint = location_cache.get_network_fingerprint()
+    assert fingerprint.startswith(location_cache.IP_ONLY_PREFIX)
+
+    cache = location_cache.LocationCache()
+    cache.put(fingerprint, {"city": "Testville"}, now=0)
+    assert cache.get(fingerprint, now=location_cache.IP_ONLY_TTL - 1) is not None
+    assert cache.get(fingerprint, now=location_cache.IP_ONLY_TTL) is None
+
+    monkeypatch.setattr(location_cache, "get_default_gateway", lambda: "192.168.1.1")
+    full = location_cache.get_network_fingerprint()
+    cache.put(full, {"city": "Testville"}, now=0)
+    assert cache.get(full, now=location_cache.IP_ONLY_TTL) is not None
+
+
+def test_macos_route_output_is_parsed():
+    """The gateway line of `route -n get default` is extracted."""
+    from api.location_cache import parse_route_get_gateway
+
+    output = (
+        "   route to: default\n"
+        "destination: default\n"
+        "       mask: default\n"
+        "    gateway: 10.0.0.1\n"
+        "  interface: en0\n"
+    )
+    assert parse_route_get_gateway(output) == "10.0.0.1"
+    assert (
+        parse_route_get_gateway("route: writing to routing socket: not in table")
+        is None
+    )
+
+
+def test_batch_weather_uses_one_request_per_chunk(monkeypatch):
+    """Batch lookups group uncached locations into multi-location requests."""
+    calls = []
+
+    class _BatchResponse:
+        status_code = 200
+
+        def __init__(self, count):
+            self.count = count
+
+        def json(self):
+            return [SAMPLE_FORECAST] * self.count
+
+    def fake_get(url, params=None, **kw):
+        count = len(params["latitude"].split(","))
+        calls.append(count)
+        return _BatchResponse(count)
+
+    api = WeatherAPI()
+    monkeypatch.setattr(api, "_get", fake_get)
+
+    locations = [(10.0 + i, 20.0 + i) for i in range(5)]
+    results = api.get_weather_data_batch(locations, chunk_size=2)
+    assert calls == [2, 2, 1]
+    assert all(result["main"]["temp"] == 12.5 for result in results)
+
+    # Everything is cached now; a repeat batch makes no requests
+    assert len(api.get_weather_data_batch(locations, chunk_size=2)) == 5
+    assert calls == [2, 2, 1]
+
+
+def test_concurrent_identical_fetches_share_one_request(monkeypatch):
+    """Callers asking for the same coordinates at once join one round trip."""
+    calls = []
+    release = threading.Event()
+
+    class _Response:
+        status_code = 200
+
+        def json(self):
+            return SAMPLE_FORECAST
+
+    def slow_get(url, params=None, **kw):
+        calls.append(url)
+        release.wait(5)
+        return _Response()
+
+    api = WeatherAPI()
+    monkeypatch.setattr(api, "_get", slow_get)
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(api.get_weather_data(51.5, -0.12))
+        )
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    while api.in_flight.shared < 3:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert [result["main"]["temp"] for result in results] == [12.5] * 4
+    assert api.in_flight.in_flight() == 0
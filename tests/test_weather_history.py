@@ -0,0 +1,47 @@
+import os
+import sys
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.weather_history import HEADER, RECORD, WeatherHistory
+
+
+def _append(history, timestamp, temp):
+    history.append(timestamp, 51.5, -0.12, temp, 70, 3.5, 0.0, 3, 0.2)
+
+
+def test_ring_buffer_wraps_and_persists(tmp_path):
+    """Oldest records are overwritten and the buffer survives reopening."""
+    history_file = str(tmp_path / "weather_history.bin")
+    history = WeatherHistory(history_file, capacity=4)
+    for i in range(6):
+        _append(history, 1000 + i, 10.0 + i)
+
+    assert len(history) == 4
+    assert [record.timestamp for record in history] == [1002, 1003, 1004, 1005]
+    assert len(history.segments()) == 2  # Wrapped around the end of the file
+    history.close()
+
+    assert os.path.getsize(history_file) == HEADER.size + 4 * RECORD.size
+
+    reopened = WeatherHistory(history_file, capacity=4)
+    assert reopened.column("temp") == [12.0, 13.0, 14.0, 15.0]
+    assert reopened.latest().weather_code == 3
+    reopened.close()
+
+
+def test_invalid_file_starts_fresh(tmp_path):
+    """A file with another capacity or garbage contents is reset."""
+    history_file = str(tmp_path / "weather_history.bin")
+    with open(history_file, "wb") as f:
+        f.write(b"not a history file")
+
+    history = WeatherHistory(history_file, capacity=8)
+    assert len(history) == 0 and history.latest() is None
+    _append(history, 1000, 12.5)
+    history.close()
+
+    resized = WeatherHistory(history_file, capacity=16)
+    assert len(resized) == 0
+    resized.close()
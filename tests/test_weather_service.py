@@ -0,0 +1,221 @@
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from api.service_client import WeatherServiceClient
+from api.weather_api import WeatherAPI
+from core.settings_manager import SettingsManager
+from core.weather_server import WeatherServer
+from core.weather_service import WeatherService
+from ui.update_queue import UpdateQueue
+from ui.weather_widget import LOCATION_RETRY_DELAY, WeatherWidget
+
+HOUR = 3600
+NOW = 1700000000
+
+
+class _FakeWeatherAPI(WeatherAPI):
+    """Real parsing, canned network answers."""
+
+    def __init__(self):
+        super().__init__(use_gazetteer=False)
+        self.weather_calls = 0
+        self.weather_requests = []
+        self.location = (53.8, -1.55)
+        self.rendezvous = None  # Barrier both requests must reach together
+
+    def _meet(self):
+        if self.rendezvous is not None:
+            self.rendezvous.wait()
+
+    def get_location_from_ip(self, use_cache=True):
+        self._meet()
+        return {
+            "lat": self.location[0],
+            "lon": self.location[1],
+            "city": "Leeds",
+            "region": "England",
+            "country": "United Kingdom",
+            "success": True,
+        }
+
+    def get_weather_data(self, lat, lon, use_cache=True):
+        self._meet()
+        self.weather_calls += 1
+        self.weather_requests.append((lat, lon))
+        times = [NOW - HOUR + i * HOUR for i in range(24)]
+        return self.parse_weather_data(
+            {
+                "current": {
+                    "time": NOW,
+                    "temperature_2m": 12.0,
+                    "relative_humidity_2m": 60,
+                    "precipitation": 0.0,
+                    "weather_code": 3,
+                    "wind_speed_10m": 7.2,
+                },
+                "hourly": {
+                    "time": times,
+                    "temperature_2m": [12.0] * 24,
+                    "relative_humidity_2m": [60] * 24,
+                    "precipitation": [0.0] * 24,
+                    "weather_code": [3] * 24,
+                    "wind_speed_10m": [7.2] * 24,
+                },
+            }
+        )
+
+
+def test_service_fetches_once_and_serves_from_forecast():
+    """The loop fetches when it has nothing, then answers from the forecast."""
+    api = _FakeWeatherAPI()
+    service = WeatherService(weather_api=api)
+
+    assert service.status(NOW)["success"] is False
+    service.tick(NOW)
+    service.tick(NOW + 300)
+    assert api.weather_calls == 1
+
+    status = service.status(NOW + 600)
+    assert status["weather"]["full_location"] == "Leeds, England, United Kingdom"
+    assert status["weather"]["observed_at"] == NOW
+    assert status["comfort"]["recommendation"] == "Perfect hoodie weather! 👍"
+
+
+def test_weather_is_fetched_speculatively_alongside_ip_location():
+    """Weather for the last location overlaps geolocation and is kept if unmoved."""
+    api = _FakeWeatherAPI()
+    service = WeatherService(weather_api=api)
+    assert service.fetch() is not None
+    assert api.weather_calls == 1
+
+    # Sequential requests would leave the barrier waiting alone and break it
+    api.rendezvous = threading.Barrier(2, timeout=5)
+    api.location = (53.81, -1.56)  # IP jitter within the same city
+    snapshot = service.fetch()
+    assert snapshot is not None and snapshot.lat == 53.81
+    assert api.weather_calls == 2
+    assert not api.rendezvous.broken
+
+    api.rendezvous = None
+    api.location = (51.5, -0.13)  # Moved: the speculative result is discarded
+    snapshot = service.fetch()
+    assert snapshot.city == "Leeds" and snapshot.lat == 51.5
+    assert (51.5, -0.13) in api.weather_requests
+    service.stop()
+
+
+def test_running_loop_picks_up_a_new_location_quickly(tmp_path):
+    """A location saved by an attached widget is served long before the next refresh."""
+    settings_file = str(tmp_path / "widget_settings.json")
+    service = WeatherService(
+        weather_api=_FakeWeatherAPI(), settings_manager=SettingsManager(settings_file)
+    )
+    service.settings_poll_interval = 0.05
+    service.start()
+    try:
+        widget_settings = SettingsManager(settings_file)
+        widget_settings.update_setting(
+            "manual_location",
+            {
+                "query": "Paris",
+                "display_name": "Paris, France",
+                "lat": 48.85,
+                "lon": 2.35,
+            },
+        )
+        widget_settings.flush()
+
+        deadline = time.monotonic() + 5
+        snapshot = service.current()
+        while (snapshot is None or snapshot.city != "Paris") and (
+            time.monotonic() < deadline
+        ):
+            time.sleep(0.02)
+            snapshot = service.current()
+        assert snapshot.city == "Paris" and snapshot.is_manual
+    finally:
+        service.stop()
+
+
+def test_widget_client_reads_daemon_over_http():
+    """A thin client gets the daemon's snapshot as a WeatherSnapshot."""
+    service = WeatherService(weather_api=_FakeWeatherAPI())
+    service.tick(NOW)
+    server = WeatherServer(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    try:
+        client = WeatherServiceClient(f"http://127.0.0.1:{server.server_port}")
+        snapshot = client.get_weather()
+        assert snapshot.city == "Leeds" and snapshot.temp == 12.0
+        assert len(snapshot.hourly) == 24
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_attached_widget_never_shows_the_previous_location(tmp_path):
+    """After a location change the daemon answers 503 and the drain skips old data."""
+    settings_file = str(tmp_path / "widget_settings.json")
+    service = WeatherService(
+        weather_api=_FakeWeatherAPI(), settings_manager=SettingsManager(settings_file)
+    )
+    service.tick(NOW)
+    server = WeatherServer(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    shown, retries = [], []
+    paris = {
+        "query": "Paris",
+        "display_name": "Paris, France",
+        "lat": 48.85,
+        "lon": 2.35,
+    }
+    widget = SimpleNamespace(
+        service_client=WeatherServiceClient(f"http://127.0.0.1:{server.server_port}"),
+        manual_location=paris,
+        update_queue=UpdateQueue(),
+        refresh_scheduler=SimpleNamespace(
+            record_success=lambda: None, record_failure=lambda: None
+        ),
+        record_history=lambda snapshot: None,
+        last_known_weather=SimpleNamespace(save=lambda snapshot: None),
+        schedule_next_update=lambda: None,
+        apply_weather_data=shown.append,
+        get_location_and_weather=lambda: None,
+        root=SimpleNamespace(after=lambda delay, callback: retries.append(delay)),
+    )
+    for name in (
+        "fetch_location_and_weather",
+        "matches_location_setting",
+        "drain_weather_updates",
+    ):
+        setattr(widget, name, getattr(WeatherWidget, name).__get__(widget))
+
+    try:
+        # Leeds was fetched before the widget saved Paris and attached
+        old_snapshot = widget.service_client.get_weather()
+        widget_settings = SettingsManager(settings_file)
+        widget_settings.update_setting("manual_location", paris)
+        widget_settings.flush()
+
+        assert widget.fetch_location_and_weather(paris).get("success") is False
+
+        # A Leeds answer that was already in flight is not shown either
+        widget.update_queue.put(old_snapshot)
+        widget.drain_weather_updates()
+        assert shown == [] and LOCATION_RETRY_DELAY in retries
+
+        service.tick(NOW)
+        widget.update_queue.put(widget.fetch_location_and_weather(paris))
+        widget.drain_weather_updates()
+        assert [snapshot.city for snapshot in shown] == ["Paris"]
+    finally:
+        server.shutdown()
+        server.server_close()
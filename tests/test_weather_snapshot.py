@@ -0,0 +1,81 @@
+import os
+import sys
+
+import pytest
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.hoodie_calculator import HoodieComfortCalculator
+from core.weather_snapshot import WeatherSnapshot
+
+LEGACY = {
+    "main": {"temp": 12.5, "humidity": 80},
+    "wind": {"speed": 6.1},
+    "weather": [{"main": "Slight Rain", "description": "slight rain"}],
+    "success": True,
+    "rain": {"1h": 0.4},
+    "observed_at": 1700000000,
+    "city": "Leeds",
+    "full_location": "Leeds, England, United Kingdom",
+    "coordinates": "53.801, -1.549",
+    "is_manual": False,
+}
+
+
+def test_snapshot_reads_like_the_legacy_dict():
+    """The Mapping adapter round-trips the nested dict layout."""
+    snapshot = WeatherSnapshot.from_dict(LEGACY)
+
+    assert snapshot == LEGACY
+    assert snapshot.temp == 12.5 and snapshot.rain == 0.4
+    assert snapshot.get("snow") is None and "is_demo" not in snapshot
+
+
+def test_snapshot_is_immutable_and_copied_on_change():
+    """Location tagging returns a new snapshot and leaves the original alone."""
+    snapshot = WeatherSnapshot(10.0, 50, 2.0, "Clear Sky", "clear sky")
+
+    with pytest.raises(AttributeError):
+        snapshot.temp = 11.0
+    with pytest.raises(TypeError):
+        snapshot["city"] = "Leeds"
+
+    tagged = snapshot.with_location("Leeds", "Leeds, UK", 53.8008, -1.5491, True)
+    assert tagged["city"] == "Leeds" and tagged.is_manual
+    assert tagged["coordinates"] == "53.801, -1.549"
+    assert snapshot.city is None and "city" not in snapshot
+    assert not hasattr(snapshot, "__dict__")
+
+
+def test_calculator_fast_path_matches_dict_path():
+    """Snapshots score exactly like the equivalent dict."""
+    calculator = HoodieComfortCalculator()
+    snapshot = WeatherSnapshot.from_dict(LEGACY)
+
+    assert calculator.calculate_comfort_level(
+        snapshot
+    ) == calculator.calculate_comfort_level(LEGACY)
+
+
+def test_last_known_weather_round_trip(tmp_path):
+    """The saved snapshot, including its hourly forecast, loads back unchanged."""
+    from api.hourly_forecast import HourlyForecast
+    from api.last_known_weather import LastKnownWeather
+
+    hourly = HourlyForecast.from_open_meteo(
+        {
+            "time": [0, 3600],
+            "temperature_2m": [11.0, 12.5],
+            "relative_humidity_2m": [70, 72],
+            "precipitation": [0.0, 0.3],
+            "weather_code": [3, 61],
+            "wind_speed_10m": [9.0, 11.5],
+        }
+    )
+    snapshot = WeatherSnapshot.from_dict(dict(LEGACY, hourly=hourly))
+    store = LastKnownWeather(str(tmp_path / "last_weather_cache.json"))
+
+    assert store.load() is None
+    store.save(snapshot)
+    assert store.load() == snapshot
@@ -3,21 +3,127 @@ Weather Widget Application - Main Entry Point
 Desktop weather widget with hoodie comfort recommendations.
 """
 
+import argparse
+import importlib
 import os
 import sys
+import time
+
+STARTED_AT = time.perf_counter()
 
 # Add the src directory to Python path
 src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "src"))
 sys.path.insert(0, src_path)
 
+# Imported one by one when profiling, so each line shows its own cost
+STARTUP_MODULES = (
+    "tkinter",
+    "ui.ui_components",
+    "api.weather_api",
+    "core.hoodie_calculator",
+    "ui.weather_widget",
+)
+
+# Modules that should not be loaded before the first frame is shown
+DEFERRED_MODULES = ("requests", "numpy", "ttkbootstrap", "ui.settings_dialog")
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Hoodie Weather Widget")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="print import times and time to first paint",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="run headless and serve weather and comfort as JSON on localhost",
+    )
+    parser.add_argument(
+        "--host", default="127.0.0.1", help="address for --serve (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--port", type=int, default=8765, help="port for --serve (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--attach",
+        nargs="?",
+        const="http://127.0.0.1:8765",
+        metavar="URL",
+        help="show weather from a running --serve daemon instead of polling",
+    )
+    return parser.parse_args(argv)
+
+
+def run_daemon(host, port):
+    """Run one shared fetch/cache loop and serve it over HTTP (no Tk)"""
+    from api.weather_api import WeatherAPI
+    from core.settings_manager import SettingsManager
+    from core.weather_server import serve
+    from core.weather_service import WeatherService
+
+    settings_manager = SettingsManager()
+    service = WeatherService(
+        weather_api=WeatherAPI(cache_dir=settings_manager.config_dir),
+        settings_manager=settings_manager,
+    )
+    serve(service, host, port)
+
+
+def import_timed(module_names):
+    """Import modules in order; returns [(name, seconds)] of the extra time each took"""
+    timings = []
+    for name in module_names:
+        started = time.perf_counter()
+        importlib.import_module(name)
+        timings.append((name, time.perf_counter() - started))
+    return timings
+
 
-def main():
+def print_startup_profile(import_timings, constructed_at, painted_at):
+    """Print the import-time and time-to-first-paint breakdown"""
+    print()
+    print("Startup profile")
+    print("---------------")
+    for name, seconds in import_timings:
+        print(f"  import {name:<24} {seconds * 1000:8.1f} ms")
+    imports_total = sum(seconds for _, seconds in import_timings)
+    print(f"  {'imports total':<31} {imports_total * 1000:8.1f} ms")
+    print(
+        f"  {'widget constructed':<31} {(constructed_at - STARTED_AT) * 1000:8.1f} ms"
+    )
+    print(f"  {'first paint':<31} {(painted_at - STARTED_AT) * 1000:8.1f} ms")
+
+    loaded = [name for name in DEFERRED_MODULES if name in sys.modules]
+    print(
+        f"  deferred modules loaded before first paint: {', '.join(loaded) or 'none'}"
+    )
+    print()
+
+
+def main(argv=None):
     """Main entry point for the weather widget application"""
+    args = parse_args(argv)
+
+    if args.serve:
+        print("Starting Weather Widget daemon...")
+        try:
+            run_daemon(args.host, args.port)
+        except KeyboardInterrupt:
+            print("\nDaemon stopped by user.")
+        except OSError as e:
+            print(f"[ERROR] Could not serve on {args.host}:{args.port}: {e}")
+            sys.exit(1)
+        return
+
     print("Starting Weather Widget Application...")
     print("Loading modules from structured folders...")
 
     try:
-        from src.ui.weather_widget import WeatherWidget
+        import_timings = import_timed(STARTUP_MODULES) if args.profile_startup else []
+        from ui.weather_widget import WeatherWidget
 
         print("[GOOD] UI Module loaded")
         print("[GOOD] API Module loaded")
@@ -26,7 +132,20 @@ def main():
         print()
 
         # Create and run the widget
-        widget = WeatherWidget()
+        widget = WeatherWidget(service_url=args.attach)
+
+        if args.profile_startup:
+            constructed_at = time.perf_counter()
+
+            def report_first_paint():
+                widget.root.update_idletasks()
+                print_startup_profile(
+                    import_timings, constructed_at, time.perf_counter()
+                )
+
+            # Idle callbacks run after the pending geometry and redraw work
+            widget.root.after_idle(report_first_paint)
+
         widget.run()
 
     except ImportError as e: